@@ -0,0 +1,72 @@
+"""Benchmark the JSON codecs on realistic recv/send payloads.
+
+Decodes a recv batch of long LLM-style messages into ``Message`` objects and
+encodes the matching replies, once per installed codec.
+
+Run it with:
+    python benchmarks/codec.py --messages 500 --length 2000
+"""
+
+import argparse
+import random
+import string
+import timeit
+
+from hashgrid import Message
+from hashgrid.codec import JSONCodec, get_codec
+from hashgrid.resources import _message_to_dict
+
+
+def make_payload(codec: JSONCodec, num_messages: int, length: int) -> bytes:
+    """Build a recv response body with ``num_messages`` long messages."""
+    rng = random.Random(0)
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10)))
+        for _ in range(1000)
+    ]
+    items = []
+    for i in range(num_messages):
+        text = ""
+        while len(text) < length:
+            text += rng.choice(words) + " "
+        items.append(
+            {
+                "peer_id": f"peer-{i:06d}",
+                "round": rng.randint(1, 1000),
+                "message": text[:length] + " é中\U0001f600",
+                "score": rng.random() if i % 2 else None,
+            }
+        )
+    return codec.dumps(items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--length", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = make_payload(JSONCodec(), args.messages, args.length)
+    print(f"payload: {args.messages} messages, {len(payload) / 1024:.0f} KiB")
+
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            print(f"{name:8s} not installed")
+            continue
+        messages = codec.loads_list(payload, Message)
+        replies = [_message_to_dict(msg) for msg in messages]
+        decode = timeit.timeit(
+            lambda: codec.loads_list(payload, Message), number=args.repeat
+        )
+        encode = timeit.timeit(lambda: codec.dumps(replies), number=args.repeat)
+        print(
+            f"{name:8s} decode={decode / args.repeat * 1000:8.2f}ms  "
+            f"encode={encode / args.repeat * 1000:8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Check the cold import time of ``hashgrid`` against a budget.
+
+Runs fresh interpreters and reports the median import time of the package
+(from ``python -X importtime``), of ``from hashgrid import Message`` (what a
+handler module needs) and of ``from hashgrid import Hashgrid``, both in total
+and for the SDK alone, with httpx and asyncio already imported. Exits with
+status 1 if ``from hashgrid import Hashgrid`` exceeds ``--budget``
+milliseconds, so it can gate CI.
+
+Run it with:
+    python benchmarks/import_time.py --budget 150
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+BUDGETED = "from hashgrid import Hashgrid"
+
+# Label -> (setup, statement); only the statement is timed.
+STATEMENTS = {
+    "import hashgrid": ("", "import hashgrid"),
+    "from hashgrid import Message": ("", "from hashgrid import Message"),
+    BUDGETED: ("", BUDGETED),
+    "  without httpx and asyncio": ("import asyncio, httpx", BUDGETED),
+}
+
+# Times the statement alone inside a fresh interpreter, after startup.
+_TIMER = (
+    "import time; {setup}; started = time.perf_counter(); {statement}; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def _run(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True
+    )
+
+
+def package_import_time() -> float:
+    """Cumulative time of the ``hashgrid`` line of ``-X importtime``, in ms."""
+    result = _run("-X", "importtime", "-c", "import hashgrid")
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == "hashgrid":
+            return int(parts[1]) / 1000
+    raise RuntimeError("hashgrid not found in -X importtime output")
+
+
+def import_time(statement: str, setup: str = "") -> float:
+    """Time of ``statement`` in a fresh interpreter after ``setup``, in ms.
+
+    ``import hashgrid`` is read from ``-X importtime``. Other statements
+    import submodules lazily through ``importlib``, which ``-X importtime``
+    does not report, so they are timed inside the interpreter instead.
+    """
+    if statement == "import hashgrid" and not setup:
+        return package_import_time()
+    result = _run("-c", _TIMER.format(setup=setup or "pass", statement=statement))
+    return float(result.stdout) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=150.0, help="milliseconds")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    times = {}
+    for label, (setup, statement) in STATEMENTS.items():
+        times[label] = statistics.median(
+            import_time(statement, setup) for _ in range(args.runs)
+        )
+        print(f"{label:32s} {times[label]:8.1f}ms")
+
+    if times[BUDGETED] > args.budget:
+        print(f"{BUDGETED} exceeds the {args.budget:.1f}ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Measure the memory cost of retaining Message objects.
+
+Builds ``--count`` messages exchanged with ``--peers`` distinct peers, the way
+an agent keeping a full message history would, and reports the bytes retained
+per message (excluding the message text, which is shared).
+
+Run it with:
+    python benchmarks/message_memory.py --count 1000000
+"""
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+from hashgrid import Message
+
+
+@dataclass
+class PlainMessage:
+    """Message without slots or interning, as a baseline."""
+
+    peer_id: str
+    round: int
+    message: str = ""
+    score: Optional[float] = None
+
+
+def measure(factory, count: int, peers: int) -> float:
+    """Return the bytes retained per message created by ``factory``."""
+    text = "hello grid"
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # Build peer IDs per message as a decoder would, instead of reusing objects.
+    retained = [
+        factory(peer_id=f"peer-{i % peers:08d}", round=i, message=text, score=0.5)
+        for i in range(count)
+    ]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(retained) == count
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--peers", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{args.count:,} messages from {args.peers:,} peers")
+    for name, factory in (("dataclass", PlainMessage), ("Message", Message)):
+        per_message = measure(factory, args.count, args.peers)
+        print(f"{name:10s} {per_message:7.1f} bytes/message")
+
+
+if __name__ == "__main__":
+    main()
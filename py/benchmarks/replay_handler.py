@@ -0,0 +1,69 @@
+"""Benchmark a handler against recorded grid traffic.
+
+Replays a log written by ``hashgrid.replay.RecordingTransport`` and runs
+``Grid.process_tick`` with the handler on every recorded tick, reporting the
+time spent per tick. By default ticks are replayed back to back
+(``--speed 0``); ``--speed 1`` follows the recorded pace and recorded
+request latencies.
+
+Run it with:
+    python benchmarks/replay_handler.py traffic.jsonl.gz --handler mymodule:reply
+"""
+
+import argparse
+import asyncio
+import importlib
+import statistics
+import time
+
+from hashgrid import Hashgrid
+from hashgrid.replay import ReplayTransport
+from hashgrid.testing import echo_handler
+
+
+def load_handler(spec: str):
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+async def run(path: str, handler, speed: float, concurrency: int) -> None:
+    replay = ReplayTransport(path, speed=speed or None)
+    grid = await Hashgrid.connect(base_url="http://replay", transport=replay)
+    durations = []
+    messages = 0
+    try:
+        async for _ in grid.listen(poll_interval=1.0, min_poll_interval=0.0):
+            started = time.perf_counter()
+            results = await grid.process_tick(handler, concurrency=concurrency)
+            durations.append(time.perf_counter() - started)
+            messages += sum(len(result.messages) for result in results)
+            if replay.finished:
+                break
+    finally:
+        await grid._client.__aexit__(None, None, None)
+
+    total = sum(durations)
+    print(
+        f"ticks={len(durations)}  messages={messages}  "
+        f"replies={replay.successful_replies}/{replay.replies}  total={total:.3f}s"
+    )
+    if durations:
+        print(
+            f"per tick: mean={statistics.mean(durations) * 1000:.1f}ms  "
+            f"max={max(durations) * 1000:.1f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log")
+    parser.add_argument("--handler", help="module:function, defaults to echo")
+    parser.add_argument("--speed", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    handler = load_handler(args.handler) if args.handler else echo_handler
+    asyncio.run(run(args.log, handler, args.speed, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark per-tick wall time of Grid.process_tick against a fake server.
+
+Every request to the fake grid takes ``--latency`` seconds, so the
+sequential loop used by the examples costs roughly ``2 * nodes * latency``
+per tick while ``process_tick`` divides that by the concurrency, and
+``process_tick(batch=True)`` needs two requests in total.
+
+Run it with:
+    python benchmarks/tick_fanout.py --nodes 10 100 500 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import time
+
+from hashgrid import Hashgrid, Grid
+from hashgrid.testing import FakeGrid, echo_handler
+
+
+async def sequential_tick(grid: Grid) -> None:
+    async for node in grid.nodes():
+        messages = await node.recv()
+        if messages:
+            await node.send(echo_handler(node, messages))
+
+
+async def run(num_nodes: int, latency: float, concurrency: int) -> None:
+    fake = FakeGrid(peers_per_node=1, latency=latency)
+    fake.add_nodes(num_nodes)
+    grid = await Hashgrid.connect(base_url="http://bench", transport=fake.transport())
+    try:
+        fake.advance()
+        started = time.perf_counter()
+        await sequential_tick(grid)
+        sequential = time.perf_counter() - started
+
+        fake.advance()
+        started = time.perf_counter()
+        await grid.process_tick(echo_handler, concurrency=concurrency)
+        concurrent = time.perf_counter() - started
+
+        fake.advance()
+        started = time.perf_counter()
+        await grid.process_tick(echo_handler, concurrency=concurrency, batch=True)
+        batched = time.perf_counter() - started
+    finally:
+        await grid._client.__aexit__(None, None, None)
+
+    print(
+        f"nodes={num_nodes:5d}  sequential={sequential:8.3f}s  "
+        f"process_tick={concurrent:8.3f}s  batch={batched:8.3f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    for num_nodes in args.nodes:
+        asyncio.run(run(num_nodes, args.latency, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -21,22 +21,20 @@ async def main():
         api_key=os.getenv("HASHGRID_API_KEY")
         or getpass("Enter your Hashgrid API key: ")
     )
-    # Listen for ticks and process messages
+    def reverse(node, messages):
+        return [
+            Message(
+                peer_id=msg.peer_id,
+                round=msg.round,
+                message=msg.message[::-1],  # Reverse the message string
+                score=0.9,
+            )
+            for msg in messages
+        ]
+
+    # Listen for ticks and process all nodes concurrently
     async for tick in grid.listen():
-        async for node in grid.nodes():
-            messages = await node.recv()
-            if not messages:
-                continue
-            replies = [
-                Message(
-                    peer_id=msg.peer_id,
-                    round=msg.round,
-                    message=msg.message[::-1],  # Reverse the message string
-                    score=0.9,
-                )
-                for msg in messages
-            ]
-            await node.send(replies)
+        await grid.process_tick(reverse, concurrency=10)
 
 
 if __name__ == "__main__":
@@ -8,7 +8,7 @@ import asyncio
 import logging
 import os
 from getpass import getpass
-from hashgrid import Hashgrid, Message
+from hashgrid import Hashgrid, Message, ReplyCache
 import httpx
 
 # Set logging level for hashgrid
@@ -16,25 +16,24 @@ logging.basicConfig(level=logging.WARN)
 logging.getLogger("hashgrid").setLevel(logging.INFO)
 
 
-async def get_country_info(country_name: str) -> str:
+async def get_country_info(client: httpx.AsyncClient, country_name: str) -> str:
     """Fetch country information using REST Countries API."""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://restcountries.com/v3.1/name/{country_name}",
-                timeout=10.0,
-            )
-            if response.status_code == 200:
-                data = response.json()
-                if data and len(data) > 0:
-                    country = data[0]
-                    name = country.get("name", {}).get("common", country_name)
-                    capital = ", ".join(country.get("capital", ["N/A"]))
-                    population = country.get("population", 0)
-                    region = country.get("region", "N/A")
-                    return f"{name}: Capital: {capital}, Population: {population:,}, Region: {region}"
-                return f"Country '{country_name}' not found"
-            return f"Could not fetch information for '{country_name}'"
+        response = await client.get(
+            f"https://restcountries.com/v3.1/name/{country_name}",
+            timeout=10.0,
+        )
+        if response.status_code == 200:
+            data = response.json()
+            if data and len(data) > 0:
+                country = data[0]
+                name = country.get("name", {}).get("common", country_name)
+                capital = ", ".join(country.get("capital", ["N/A"]))
+                population = country.get("population", 0)
+                region = country.get("region", "N/A")
+                return f"{name}: Capital: {capital}, Population: {population:,}, Region: {region}"
+            return f"Country '{country_name}' not found"
+        return f"Could not fetch information for '{country_name}'"
     except Exception as e:
         return f"I could not fetch country information. Please provide a country name (e.g., France, Japan, Brazil)."
 
@@ -47,11 +46,7 @@ async def main():
     )
 
     # Find or create country-provider node
-    country_node = None
-    async for node in grid.nodes():
-        if node.name == "country-provider":
-            country_node = node
-            break
+    country_node = await grid.get_node_by_name("country-provider")
 
     if not country_node:
         country_node = await grid.create_node(
@@ -60,26 +55,38 @@ async def main():
             capacity=10,
         )
 
-    # Listen for ticks and process messages
-    async for tick in grid.listen():
-        messages = await country_node.recv()
-        if not messages:
-            continue
-
-        replies = []
-        for msg in messages:
-            country_name = msg.message.strip() or "France"
-            info = await get_country_info(country_name)
-            replies.append(
-                Message(
-                    peer_id=msg.peer_id,
-                    round=msg.round,
-                    message=info,
-                    score=0.9,
+    # Share one connection pool for all REST Countries requests
+    async with httpx.AsyncClient() as http:
+
+        async def reply(node, messages):
+            replies = []
+            for msg in messages:
+                country_name = msg.message.strip() or "France"
+                info = await get_country_info(http, country_name)
+                replies.append(
+                    Message(
+                        peer_id=msg.peer_id,
+                        round=msg.round,
+                        message=info,
+                        score=0.9,
+                    )
                 )
-            )
+            return replies
 
-        await country_node.send(replies)
+        # Look up each country once per hour, however many peers ask for it
+        cache = ReplyCache(maxsize=500, ttl=3600)
+        cached_reply = cache.wrap(reply)
+
+        # Listen for ticks and process messages
+        async for tick in grid.listen():
+            messages = await country_node.recv()
+            if not messages:
+                continue
+
+            await country_node.send(await cached_reply(country_node, messages))
+            logging.getLogger("hashgrid").info(
+                f"Cache hit rate: {cache.stats.hit_rate:.0%}"
+            )
 
 
 if __name__ == "__main__":
@@ -1,7 +1,8 @@
 """Agent that keeps memory of conversations.
 
 This example demonstrates an agent that maintains conversation history
-using a simple dictionary to remember previous interactions with peers.
+per edge in a SQLite database, so it remembers previous interactions with
+peers across restarts.
 """
 
 import asyncio
@@ -9,7 +10,7 @@ import logging
 import os
 from getpass import getpass
 from hashgrid import Hashgrid, Message
-from collections import defaultdict
+from hashgrid.memory import SQLiteEdgeMemory
 
 # Set logging level for hashgrid
 logging.basicConfig(level=logging.WARN)
@@ -23,9 +24,10 @@ async def main():
         or getpass("Enter your Hashgrid API key: ")
     )
 
-    # Memory: dictionary to store conversation history per peer
-    # Format: {(node_id, peer_id): [list of messages]}
-    memory = defaultdict(list)
+    # Memory: conversation history per (node_id, peer_id) edge, keeping the
+    # last 100 messages of each edge. Use InMemoryEdgeMemory for a bounded
+    # in-process store instead.
+    memory = SQLiteEdgeMemory("memory.db", max_messages_per_edge=100)
 
     # Listen for ticks and process messages
     async for tick in grid.listen():
@@ -36,15 +38,15 @@ async def main():
 
             replies = []
             for msg in messages:
-                history = memory[node.node_id, msg.peer_id]
-                history.append(msg.message)
+                memory.append(node.node_id, msg.peer_id, msg.message)
+                history = memory.history(node.node_id, msg.peer_id)
                 if len(history) == 1:
                     # First message - greet them
                     reply_text = f"Hello! You said: {msg.message}"
                 else:
                     # Subsequent messages - reference conversation
                     reply_text = f"I remember we've talked {len(history)} times. Last you said: {msg.message}"
-                history.append(reply_text)
+                memory.append(node.node_id, msg.peer_id, reply_text)
 
                 replies.append(
                     Message(
@@ -57,6 +59,9 @@ async def main():
 
             await node.send(replies)
 
+        # Write this tick's messages in one transaction
+        memory.flush()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -4,23 +4,127 @@ Hashgrid Client - Python SDK
 
 __version__ = "0.1.0"
 
-from .client import Hashgrid
+from typing import TYPE_CHECKING
+import importlib
+
 from .exceptions import (
     HashgridError,
     HashgridAPIError,
     HashgridAuthenticationError,
     HashgridNotFoundError,
     HashgridValidationError,
+    HashgridCircuitOpenError,
 )
-from .resources import Grid, User, Quota, Node, Edge, Message, Status
+
+# Everything else is imported on first access, so that ``import hashgrid``
+# does not pay for httpx and asyncio until they are needed.
+_LAZY = {
+    "Hashgrid": "client",
+    "TickPipeline": "pipeline",
+    "SyncHashgrid": "sync",
+    "SyncGrid": "sync",
+    "SyncNode": "sync",
+    "Metrics": "metrics",
+    "RequestEvent": "metrics",
+    "Tracer": "tracing",
+    "RetryPolicy": "retry",
+    "CircuitBreaker": "retry",
+    "RequestStats": "retry",
+    "RateLimiter": "ratelimit",
+    "TokenBucket": "ratelimit",
+    "Outbox": "outbox",
+    "ReplyCache": "cache",
+    "CacheStats": "cache",
+    "NodeSpec": "reconcile",
+    "ReconcilePlan": "reconcile",
+    "ReconcileResult": "reconcile",
+    "EdgeStore": "edges",
+    "HashRing": "sharding",
+    "StaticShard": "sharding",
+    "ShardCoordinator": "sharding",
+    "Grid": "resources",
+    "User": "resources",
+    "Quota": "resources",
+    "Node": "resources",
+    "Edge": "resources",
+    "Message": "resources",
+    "Status": "resources",
+    "TickResult": "resources",
+    "TickClock": "resources",
+    "NodeRegistry": "resources",
+    "executor_handler": "resources",
+}
+
+if TYPE_CHECKING:
+    from .client import Hashgrid
+    from .pipeline import TickPipeline
+    from .sync import SyncHashgrid, SyncGrid, SyncNode
+    from .metrics import Metrics, RequestEvent
+    from .tracing import Tracer
+    from .retry import RetryPolicy, CircuitBreaker, RequestStats
+    from .ratelimit import RateLimiter, TokenBucket
+    from .outbox import Outbox
+    from .cache import ReplyCache, CacheStats
+    from .reconcile import NodeSpec, ReconcilePlan, ReconcileResult
+    from .edges import EdgeStore
+    from .sharding import HashRing, StaticShard, ShardCoordinator
+    from .resources import (
+        Grid,
+        User,
+        Quota,
+        Node,
+        Edge,
+        Message,
+        Status,
+        TickResult,
+        TickClock,
+        NodeRegistry,
+        executor_handler,
+    )
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = [
     "Hashgrid",
+    "SyncHashgrid",
+    "SyncGrid",
+    "SyncNode",
     "HashgridError",
     "HashgridAPIError",
     "HashgridAuthenticationError",
     "HashgridNotFoundError",
     "HashgridValidationError",
+    "HashgridCircuitOpenError",
+    "Metrics",
+    "RequestEvent",
+    "Tracer",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "RequestStats",
+    "RateLimiter",
+    "TokenBucket",
+    "Outbox",
+    "ReplyCache",
+    "CacheStats",
+    "NodeSpec",
+    "ReconcilePlan",
+    "ReconcileResult",
+    "EdgeStore",
+    "HashRing",
+    "StaticShard",
+    "ShardCoordinator",
     "Grid",
     "User",
     "Quota",
@@ -28,4 +132,9 @@ __all__ = [
     "Edge",
     "Message",
     "Status",
+    "TickResult",
+    "TickPipeline",
+    "TickClock",
+    "NodeRegistry",
+    "executor_handler",
 ]
@@ -0,0 +1,203 @@
+"""Reply caching for handlers that see the same messages repeatedly."""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+import asyncio
+import time
+
+from .resources import Handler, Message, _call_handler
+
+if TYPE_CHECKING:
+    from .resources import Node
+
+# Cached reply text and score.
+_Reply = Tuple[str, Optional[float]]
+
+
+def normalize(text: str) -> str:
+    """Default cache key: case-folded text with whitespace collapsed."""
+    return " ".join(text.split()).casefold()
+
+
+@dataclass
+class CacheStats:
+    """Counters of a ``ReplyCache``."""
+
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of messages answered without calling the handler."""
+        total = self.hits + self.coalesced + self.misses
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+
+class ReplyCache:
+    """Memoizes handler replies by normalized message text.
+
+    ``wrap(handler)`` returns a handler that answers messages whose text was
+    seen before from the cache and calls ``handler`` once per distinct text
+    for the rest. Replies are matched to messages by (peer_id, round), so
+    the wrapped handler must reply to each message individually. When several
+    nodes ask for the same text at the same time, only one handler call is
+    made and the others wait for it.
+
+    Entries expire after ``ttl`` seconds and the least recently used entries
+    are evicted beyond ``maxsize``. With ``per_node`` each node has its own
+    entries.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        per_node: bool = False,
+        key: Callable[[str], str] = normalize,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.per_node = per_node
+        self.key = key
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[_Reply, float]]" = (
+            OrderedDict()
+        )
+        self._inflight: Dict[Tuple[str, str], "asyncio.Future[Optional[_Reply]]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+    def get(self, node_id: str, text: str) -> Optional[_Reply]:
+        """Return the cached (message, score) for ``text``, if any."""
+        return self._get(self._key(node_id, text))
+
+    def set(
+        self, node_id: str, text: str, message: str, score: Optional[float] = None
+    ) -> None:
+        """Cache a reply for ``text``."""
+        self._set(self._key(node_id, text), (message, score))
+
+    def wrap(self, handler: Handler) -> Handler:
+        """Return ``handler`` with caching, e.g. ``grid.process_tick(cache.wrap(h))``.
+
+        Can also be used as a decorator.
+        """
+
+        async def cached(node: "Node", messages: List[Message]) -> List[Message]:
+            return await self._handle(handler, node, messages)
+
+        return cached
+
+    def _key(self, node_id: str, text: str) -> Tuple[str, str]:
+        return (node_id if self.per_node else "", self.key(text))
+
+    def _get(self, key: Tuple[str, str]) -> Optional[_Reply]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        reply, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.stats.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return reply
+
+    def _set(self, key: Tuple[str, str], reply: _Reply) -> None:
+        expires_at = float("inf")
+        if self.ttl is not None:
+            expires_at = time.monotonic() + self.ttl
+        self._entries[key] = (reply, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def _handle(
+        self, handler: Handler, node: "Node", messages: List[Message]
+    ) -> List[Message]:
+        replies: Dict[int, _Reply] = {}
+        # Messages this call computes, by key, and messages waiting on them.
+        leaders: Dict[Tuple[str, str], Message] = {}
+        followers: List[Tuple[int, Tuple[str, str]]] = []
+        waiting: List[Tuple[int, "asyncio.Future[Optional[_Reply]]"]] = []
+        for i, msg in enumerate(messages):
+            key = self._key(node.node_id, msg.message)
+            cached = self._get(key)
+            if cached is not None:
+                self.stats.hits += 1
+                replies[i] = cached
+            elif key in leaders:
+                self.stats.coalesced += 1
+                followers.append((i, key))
+            elif key in self._inflight:
+                self.stats.coalesced += 1
+                waiting.append((i, self._inflight[key]))
+            else:
+                self.stats.misses += 1
+                leaders[key] = msg
+                followers.append((i, key))
+                self._inflight[key] = asyncio.get_running_loop().create_future()
+
+        computed: Dict[Tuple[str, str], _Reply] = {}
+        try:
+            if leaders:
+                computed = await self._compute(handler, node, leaders)
+        finally:
+            for key in leaders:
+                future = self._inflight.pop(key)
+                future.set_result(computed.get(key))
+        for i, key in followers:
+            if key in computed:
+                replies[i] = computed[key]
+
+        retry = []
+        for i, future in waiting:
+            reply = await asyncio.shield(future)
+            if reply is None:
+                retry.append(i)
+            else:
+                replies[i] = reply
+        if retry:
+            # The other caller got no reply for these; ask the handler directly.
+            index = {(messages[i].peer_id, messages[i].round): i for i in retry}
+            for reply in await _call_handler(
+                handler, node, [messages[i] for i in retry]
+            ):
+                i = index.get((reply.peer_id, reply.round))
+                if i is not None:
+                    replies[i] = (reply.message, reply.score)
+
+        return [
+            Message(
+                peer_id=msg.peer_id,
+                round=msg.round,
+                message=replies[i][0],
+                score=replies[i][1],
+            )
+            for i, msg in enumerate(messages)
+            if i in replies
+        ]
+
+    async def _compute(
+        self, handler: Handler, node: "Node", leaders: Dict[Tuple[str, str], Message]
+    ) -> Dict[Tuple[str, str], _Reply]:
+        keys = {(msg.peer_id, msg.round): key for key, msg in leaders.items()}
+        computed = {}
+        for reply in await _call_handler(handler, node, list(leaders.values())):
+            key = keys.get((reply.peer_id, reply.round))
+            if key is not None:
+                computed[key] = (reply.message, reply.score)
+                self._set(key, computed[key])
+        return computed
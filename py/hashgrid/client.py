@@ -1,8 +1,18 @@
 """Main Hashgrid client class."""
 
-import json
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+import time
+from typing import (
+    TYPE_CHECKING,
+    Optional,
+    Dict,
+    Any,
+    AsyncIterator,
+    Callable,
+    List,
+    Type,
+)
 from urllib.parse import urljoin
 
 import httpx
@@ -14,8 +24,21 @@ from .exceptions import (
     HashgridAuthenticationError,
     HashgridNotFoundError,
     HashgridValidationError,
+    HashgridCircuitOpenError,
 )
+from .codec import JSONCodec, get_codec
+from .metrics import Metrics, RequestEvent, node_id_for
 from .resources import Grid
+from .retry import RetryPolicy, CircuitBreaker, RequestStats
+
+if TYPE_CHECKING:
+    # Optional features, imported only when used.
+    from .compression import GzipCompressor
+    from .ratelimit import RateLimiter
+    from .tracing import Tracer
+
+
+HOOK_EVENTS = ("request_start", "request_end", "retry")
 
 
 class Hashgrid:
@@ -26,15 +49,71 @@ class Hashgrid:
         api_key: Optional[str] = None,
         base_url: str = "https://dna.hashgrid.ai",
         timeout: int = 30,
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        keepalive_expiry: Optional[float] = 5.0,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        codec: Optional[JSONCodec] = None,
+        hooks: Optional[Dict[str, List[Callable[[RequestEvent], None]]]] = None,
+        metrics: Optional[Metrics] = None,
+        compression: Optional[str] = None,
+        compression_min_size: int = 1024,
+        max_send_bytes: Optional[int] = 1_000_000,
+        max_send_items: Optional[int] = None,
+        send_concurrency: int = 4,
+        rate_limiter: Optional["RateLimiter"] = None,
+        tracer: Optional["Tracer"] = None,
     ):
         self.api_key = api_key
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.transport = transport
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        self.codec = codec or get_codec()
+        self.compressor: Optional["GzipCompressor"] = None
+        if compression is not None:
+            from .compression import get_compressor
+
+            self.compressor = get_compressor(compression)
+        self.compression_min_size = compression_min_size
+        self.max_send_bytes = max_send_bytes
+        self.max_send_items = max_send_items
+        self.send_concurrency = send_concurrency
+        self.rate_limiter = rate_limiter
+        self.stats = RequestStats()
+        self.metrics = metrics
+        self.tracer = tracer
+        self._hooks: Dict[str, List[Callable[[RequestEvent], None]]] = {
+            event: [] for event in HOOK_EVENTS
+        }
+        for event, callbacks in (hooks or {}).items():
+            for callback in callbacks:
+                self.add_hook(event, callback)
+        if metrics is not None:
+            metrics.register(self)
+        if tracer is not None:
+            tracer.register(self)
+        self._compression_supported: Optional[bool] = None
         self._client: Optional[httpx.AsyncClient] = None
 
     async def __aenter__(self):
         """Async context manager entry."""
-        self._client = httpx.AsyncClient(timeout=self.timeout)
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=self.http2,
+            transport=self.transport,
+        )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -42,6 +121,23 @@ class Hashgrid:
         if self._client:
             await self._client.aclose()
 
+    def add_hook(self, event: str, callback: Callable[[RequestEvent], None]) -> None:
+        """Call ``callback(RequestEvent)`` on ``request_start``, ``request_end``
+        or ``retry``. Callbacks run inline and should be fast."""
+        if event not in self._hooks:
+            raise ValueError(
+                f"Unknown event '{event}', expected one of {', '.join(HOOK_EVENTS)}"
+            )
+        self._hooks[event].append(callback)
+
+    def _emit(self, event: str, payload: RequestEvent) -> None:
+        """Call the hooks registered for ``event``."""
+        for callback in self._hooks[event]:
+            try:
+                callback(payload)
+            except Exception as e:
+                logger.warning(f"Error in {event} hook {callback!r}: {e}")
+
     def _get_headers(self) -> Dict[str, str]:
         """Get headers for API requests."""
         headers = {
@@ -58,29 +154,233 @@ class Hashgrid:
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         json_data: Optional[Dict[str, Any]] = None,
-    ) -> Dict[str, Any]:
-        """Make an HTTP request to the API."""
+        idempotent: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        model: Optional[Type] = None,
+        keyed: bool = False,
+    ) -> Any:
+        """Make an HTTP request to the API.
+
+        Failed attempts are retried according to ``retry_policy``. Pass
+        ``idempotent=True`` to allow retrying a non-idempotent method, and
+        ``model`` to decode a JSON array response into a list of ``model``
+        (with ``keyed``, an object of such arrays into a dict of lists).
+        """
+        response = await self._send(
+            method,
+            endpoint,
+            params=params,
+            json_data=json_data,
+            idempotent=idempotent,
+            timeout=timeout,
+        )
+        return await self._handle_response(response, model=model, keyed=keyed)
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_data: Optional[Dict[str, Any]] = None,
+        idempotent: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        """Send a request with retries and return the raw response."""
         if not self._client:
             raise HashgridAPIError(
                 "Client not initialized. Use async context manager or await connect()"
             )
 
         url = urljoin(self.base_url, endpoint.lstrip("/"))
-        headers = self._get_headers()
+        headers = {**self._get_headers(), **(headers or {})}
+        content = self.codec.dumps(json_data) if json_data is not None else None
+        uncompressed = content
+        if (
+            content
+            and self.compressor is not None
+            and self._compression_supported is not False
+            and len(content) >= self.compression_min_size
+        ):
+            content = self.compressor.compress(content)
+            headers["Content-Encoding"] = self.compressor.encoding
+        attempt = 0
 
-        try:
-            response = await self._client.request(
+        while True:
+            limiter = self.rate_limiter
+            if limiter is not None:
+                await limiter.acquire(node_id_for(endpoint))
+            breaker = self.circuit_breaker
+            if breaker is not None and not breaker.allow_request():
+                self.stats.rejected += 1
+                raise HashgridCircuitOpenError(
+                    f"Circuit breaker is open, retry in {breaker.retry_in:.1f}s"
+                )
+
+            self.stats.requests += 1
+            event = RequestEvent(
                 method=method,
-                url=url,
+                path=endpoint,
+                attempt=attempt,
+                request_bytes=len(content) if content else 0,
+            )
+            self._emit("request_start", event)
+            started = time.perf_counter()
+            try:
+                response = await self._client.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    content=content,
+                    timeout=self.timeout if timeout is None else timeout,
+                )
+            except httpx.RequestError as e:
+                event.latency = time.perf_counter() - started
+                event.error = e
+                self._emit("request_end", event)
+                if breaker is not None:
+                    breaker.record_failure()
+                if not self.retry_policy.should_retry(
+                    method, attempt, error=e, idempotent=idempotent
+                ):
+                    self.stats.failures += 1
+                    raise HashgridAPIError(f"Request failed: {str(e)}")
+                await self._backoff(event, type(e).__name__)
+                attempt += 1
+                continue
+            except BaseException:
+                # Cancelled or failed unexpectedly: free a half-open trial.
+                if breaker is not None:
+                    breaker.release()
+                raise
+
+            event.latency = time.perf_counter() - started
+            event.status_code = response.status_code
+            event.response_bytes = len(response.content)
+            self._emit("request_end", event)
+            logger.debug(
+                f"{method} {endpoint} -> {response.status_code} "
+                f"in {event.latency * 1000:.1f}ms"
+            )
+
+            if breaker is not None:
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            if limiter is not None:
+                limiter.observe(response.status_code, response.headers)
+            if response.status_code == 415 and content is not uncompressed:
+                logger.info(
+                    f"Server rejected {self.compressor.encoding} request bodies, "
+                    "sending uncompressed"
+                )
+                self._compression_supported = False
+                content = uncompressed
+                headers.pop("Content-Encoding")
+                continue
+            if "Content-Encoding" in headers and not response.is_error:
+                self._compression_supported = True
+            if response.is_error and self.retry_policy.should_retry(
+                method, attempt, status_code=response.status_code, idempotent=idempotent
+            ):
+                await self._backoff(event, str(response.status_code), response)
+                attempt += 1
+                continue
+            if response.is_error:
+                self.stats.failures += 1
+            return response
+
+    async def _backoff(
+        self,
+        event: RequestEvent,
+        reason: str,
+        response: Optional[httpx.Response] = None,
+    ) -> None:
+        """Wait before retrying a failed request."""
+        delay = self.retry_policy.get_delay(event.attempt, response)
+        self.stats.retries += 1
+        self.stats.retries_by_reason[reason] = (
+            self.stats.retries_by_reason.get(reason, 0) + 1
+        )
+        event.retry_delay = delay
+        self._emit("retry", event)
+        logger.warning(
+            f"{event.method} {event.path} failed ({reason}), "
+            f"retrying in {delay:.2f}s (attempt {event.attempt + 1})"
+        )
+        await asyncio.sleep(delay)
+
+    async def _stream(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream server-sent events from the API, yielding each event's data.
+
+        Raises ``HashgridAPIError`` with status code 406 if the server answers
+        with something other than an event stream.
+        """
+        if not self._client:
+            raise HashgridAPIError(
+                "Client not initialized. Use async context manager or await connect()"
+            )
+
+        breaker = self.circuit_breaker
+        if breaker is not None and not breaker.allow_request():
+            self.stats.rejected += 1
+            raise HashgridCircuitOpenError(
+                f"Circuit breaker is open, retry in {breaker.retry_in:.1f}s"
+            )
+
+        url = urljoin(self.base_url, endpoint.lstrip("/"))
+        headers = {**self._get_headers(), "Accept": "text/event-stream"}
+        self.stats.requests += 1
+        try:
+            async with self._client.stream(
+                "GET",
+                url,
                 headers=headers,
                 params=params,
-                json=json_data,
-            )
-            return await self._handle_response(response)
+                timeout=httpx.Timeout(self.timeout, read=None),
+            ) as response:
+                if breaker is not None:
+                    if response.status_code >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                content_type = response.headers.get("Content-Type", "")
+                if response.is_error:
+                    await response.aread()
+                    await self._handle_response(response)
+                if not content_type.startswith("text/event-stream"):
+                    raise HashgridAPIError(
+                        "Server does not support event streams",
+                        status_code=406,
+                        response=response,
+                    )
+                data_lines = []
+                async for line in response.aiter_lines():
+                    if line.startswith("data:"):
+                        data_lines.append(line[5:].lstrip())
+                    elif not line and data_lines:
+                        yield self.codec.loads("\n".join(data_lines).encode())
+                        data_lines = []
         except httpx.RequestError as e:
-            raise HashgridAPIError(f"Request failed: {str(e)}")
+            if breaker is not None:
+                breaker.record_failure()
+            self.stats.failures += 1
+            raise HashgridAPIError(f"Stream failed: {str(e)}")
+        except BaseException:
+            if breaker is not None:
+                breaker.release()
+            raise
 
-    async def _handle_response(self, response: httpx.Response) -> Dict[str, Any]:
+    async def _handle_response(
+        self,
+        response: httpx.Response,
+        model: Optional[Type] = None,
+        keyed: bool = False,
+    ) -> Any:
         """Handle API response and raise appropriate exceptions."""
         try:
             response.raise_for_status()
@@ -113,11 +413,21 @@ class Hashgrid:
                 )
 
         if not response.content:
-            return {}
+            return [] if model is not None and not keyed else {}
 
+        if model is not None:
+            decode = self.codec.loads_lists if keyed else self.codec.loads_list
+            try:
+                return decode(response.content, model)
+            except (ValueError, TypeError) as e:
+                raise HashgridAPIError(
+                    f"Invalid {model.__name__} list in response: {e}",
+                    status_code=response.status_code,
+                    response=response,
+                ) from e
         try:
-            return response.json()
-        except json.JSONDecodeError:
+            return self.codec.loads(response.content)
+        except ValueError:
             return {"content": response.text}
 
     @classmethod
@@ -126,12 +436,24 @@ class Hashgrid:
         api_key: Optional[str] = None,
         base_url: str = "https://dna.hashgrid.ai",
         timeout: int = 30,
+        name: Optional[str] = None,
+        tick: Optional[int] = None,
+        **kwargs: Any,
     ) -> Grid:
-        """Connect to a Hashgrid grid and return a Grid."""
+        """Connect to a Hashgrid grid and return a Grid.
+
+        Extra keyword arguments (connection pool limits, ``http2``,
+        ``transport``) are passed to the ``Hashgrid`` constructor. If the
+        grid ``name`` is known, the initial ``GET /api/v1`` is skipped; the
+        tick is then ``tick`` (or 0) until ``listen()`` observes it.
+        """
         logger.info(f"Connecting to grid at {base_url}")
-        client = cls(api_key=api_key, base_url=base_url, timeout=timeout)
+        client = cls(api_key=api_key, base_url=base_url, timeout=timeout, **kwargs)
         await client.__aenter__()
-        data = await client._request("GET", "/api/v1")
-        grid = Grid(name=data["name"], tick=data["tick"], client=client)
+        if name is not None:
+            grid = Grid(name=name, tick=tick or 0, client=client)
+        else:
+            data = await client._request("GET", "/api/v1")
+            grid = Grid(name=data["name"], tick=data["tick"], client=client)
         logger.info(f"Connected to grid '{grid.name}' at tick {grid.tick}")
         return grid
@@ -0,0 +1,146 @@
+"""JSON codecs used to encode requests and decode responses.
+
+``get_codec()`` picks the fastest installed backend: msgspec, then orjson,
+then the standard library ``json`` module.
+"""
+
+from dataclasses import fields
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Type, TypeVar
+import json
+
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=None)
+def _field_names(model: type) -> FrozenSet[str]:
+    return frozenset(f.name for f in fields(model))
+
+
+def _build_list(items: Any, model: Type[T]) -> List[T]:
+    """Build ``model`` instances from decoded JSON objects.
+
+    Unknown keys are ignored, as msgspec does, so fields added to the API do
+    not break older clients. Raises ``TypeError`` on other shapes.
+    """
+    if not isinstance(items, list):
+        raise TypeError(f"Expected an array, got {type(items).__name__}")
+    names = _field_names(model)
+    result = []
+    for item in items:
+        if not isinstance(item, dict):
+            raise TypeError(f"Expected an object, got {type(item).__name__}")
+        if not item.keys() <= names:
+            item = {key: value for key, value in item.items() if key in names}
+        result.append(model(**item))
+    return result
+
+
+class JSONCodec:
+    """Standard library JSON codec."""
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode ``obj`` to JSON bytes."""
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        """Decode JSON bytes. Raises ``ValueError`` on invalid input."""
+        return json.loads(data)
+
+    def loads_list(self, data: bytes, model: Type[T]) -> List[T]:
+        """Decode a JSON array of objects into a list of ``model`` instances.
+
+        Unknown keys are ignored; values are passed to ``model`` unchecked.
+        """
+        return _build_list(self.loads(data), model)
+
+    def loads_lists(self, data: bytes, model: Type[T]) -> Dict[str, List[T]]:
+        """Decode a JSON object of arrays like ``loads_list``, keyed as in ``data``."""
+        obj = self.loads(data)
+        if not isinstance(obj, dict):
+            raise TypeError(f"Expected an object, got {type(obj).__name__}")
+        return {key: _build_list(items, model) for key, items in obj.items()}
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec backed by orjson."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """JSON codec backed by msgspec, decoding straight into typed models."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._msgspec = msgspec
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._decoders: Dict[Any, Any] = {}
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: bytes) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    def loads_list(self, data: bytes, model: Type[T]) -> List[T]:
+        return self._decode(data, List[model])
+
+    def loads_lists(self, data: bytes, model: Type[T]) -> Dict[str, List[T]]:
+        return self._decode(data, Dict[str, List[model]])
+
+    def _decode(self, data: bytes, type_: Any) -> Any:
+        decoder = self._decoders.get(type_)
+        if decoder is None:
+            # Unknown fields are ignored, as in JSONCodec. Types are checked,
+            # which the other codecs do not do; non-strict mode still accepts
+            # values such as "3" for an int instead of failing on them.
+            decoder = self._msgspec.json.Decoder(type_, strict=False)
+            self._decoders[type_] = decoder
+        try:
+            return decoder.decode(data)
+        except self._msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+
+_CODECS: Dict[str, Callable[[], JSONCodec]] = {
+    "msgspec": MsgspecCodec,
+    "orjson": OrjsonCodec,
+    "json": JSONCodec,
+}
+
+
+def get_codec(name: Optional[str] = None) -> JSONCodec:
+    """Return a codec by name, or the fastest installed one if ``name`` is None."""
+    if name is not None:
+        if name not in _CODECS:
+            raise ValueError(
+                f"Unknown codec '{name}', expected one of {', '.join(_CODECS)}"
+            )
+        return _CODECS[name]()
+    for factory in _CODECS.values():
+        try:
+            return factory()
+        except ImportError:
+            continue
+    return JSONCodec()
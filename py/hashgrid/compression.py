@@ -0,0 +1,59 @@
+"""Request body compression.
+
+``get_compressor()`` returns a gzip (standard library) or zstd (requires the
+``zstandard`` package) compressor by name.
+"""
+
+import gzip
+from typing import Callable, Dict
+
+
+class GzipCompressor:
+    """gzip request body compression."""
+
+    encoding = "gzip"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a request body."""
+        return gzip.compress(data, compresslevel=self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress a request body."""
+        return gzip.decompress(data)
+
+
+class ZstdCompressor(GzipCompressor):
+    """zstd request body compression backed by zstandard."""
+
+    encoding = "zstd"
+
+    def __init__(self, level: int = 3):
+        import zstandard
+
+        self.level = level
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decompressor.decompress(data)
+
+
+_COMPRESSORS: Dict[str, Callable[[], GzipCompressor]] = {
+    "gzip": GzipCompressor,
+    "zstd": ZstdCompressor,
+}
+
+
+def get_compressor(name: str) -> GzipCompressor:
+    """Return a compressor by name: ``gzip`` or ``zstd``."""
+    if name not in _COMPRESSORS:
+        raise ValueError(
+            f"Unknown compression '{name}', expected one of {', '.join(_COMPRESSORS)}"
+        )
+    return _COMPRESSORS[name]()
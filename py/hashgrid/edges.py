@@ -0,0 +1,370 @@
+"""Columnar edge score store with vectorized queries (requires numpy)."""
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+import json
+import logging
+import os
+
+from .exceptions import HashgridError
+from .resources import Edge, _gather_bounded
+
+if TYPE_CHECKING:
+    from .resources import Grid
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = (
+    ("node", "int32"),
+    ("peer", "int32"),
+    ("round", "int64"),
+    ("score", "float64"),
+)
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise HashgridError(
+            "EdgeStore requires numpy, install it with: pip install hashgrid[numpy]"
+        ) from None
+    return numpy
+
+
+class EdgeStore:
+    """Edge scores in growable numpy columns.
+
+    Each edge is stored as (node, peer, round, score) with node and peer IDs
+    dictionary-encoded as integers and missing scores as NaN, so queries over
+    millions of edges run as a few vectorized passes. With ``path`` the
+    columns are memory-mapped ``.npy`` files in that directory and the store
+    is reopened from them; otherwise it lives in memory.
+
+    ``sync(grid)`` fetches new and updated edges of every node with
+    ``Node.edges()``. Queries skip edges without a score.
+    """
+
+    def __init__(self, path: Optional[str] = None, capacity: int = 1 << 16):
+        self._np = _numpy()
+        self.path = path
+        self.size = 0
+        self.node_ids: List[str] = []
+        self.peer_ids: List[str] = []
+        self._node_codes: Dict[str, int] = {}
+        self._peer_codes: Dict[str, int] = {}
+        # Highest round fetched per node, for incremental sync.
+        self.last_rounds: Dict[str, int] = {}
+        self._columns: Dict[str, Any] = {}
+        if path is not None and os.path.exists(os.path.join(path, "meta.json")):
+            self._load()
+        else:
+            if path is not None:
+                os.makedirs(path, exist_ok=True)
+            self._allocate(max(capacity, 1))
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._columns["node"])
+
+    def column(self, name: str):
+        """Return a view of a column: ``node``, ``peer``, ``round`` or ``score``."""
+        return self._columns[name][: self.size]
+
+    def append(self, edges: Iterable[Edge]) -> int:
+        """Append edges and return how many were added."""
+        edges = list(edges)
+        if not edges:
+            return 0
+        np = self._np
+        count = len(edges)
+        nodes = np.fromiter(
+            (self._code(e.node_id, True) for e in edges), "int32", count
+        )
+        peers = np.fromiter(
+            (self._code(e.peer_id, False) for e in edges), "int32", count
+        )
+        rounds = np.fromiter((e.round for e in edges), "int64", count)
+        scores = np.fromiter(
+            (np.nan if e.score is None else e.score for e in edges), "float64", count
+        )
+        self.extend(nodes, peers, rounds, scores)
+        for edge in edges:
+            if edge.round > self.last_rounds.get(edge.node_id, -1):
+                self.last_rounds[edge.node_id] = edge.round
+        return len(edges)
+
+    def extend(self, nodes, peers, rounds, scores) -> None:
+        """Append already encoded columns (node and peer codes must exist)."""
+        count = len(nodes)
+        if self.size + count > self.capacity:
+            capacity = self.capacity
+            while capacity < self.size + count:
+                capacity *= 2
+            self._allocate(capacity)
+        end = self.size + count
+        for (name, _), values in zip(_COLUMNS, (nodes, peers, rounds, scores)):
+            self._columns[name][self.size : end] = values
+        self.size = end
+
+    async def sync(self, grid: "Grid", concurrency: int = 10, overlap: int = 2) -> int:
+        """Fetch new and updated edges for every node and return how many were added.
+
+        The last ``overlap`` rounds already synced for a node are fetched
+        again, so edges that arrive late and scores filled in after an edge
+        was first fetched are picked up. Edges already stored are matched on
+        (node, peer, round) and get the fetched score instead of being added
+        twice. Changes to older rounds are not seen.
+        """
+        if overlap < 0:
+            raise ValueError("overlap must not be negative")
+        nodes = [node async for node in grid.nodes()]
+        after = {
+            node.node_id: self.last_rounds[node.node_id] - overlap
+            for node in nodes
+            if node.node_id in self.last_rounds
+        }
+        batches = await _gather_bounded(
+            concurrency,
+            [node.edges(after_round=after.get(node.node_id)) for node in nodes],
+        )
+        added, updated = self._merge([e for edges in batches for e in edges], after)
+        logger.info(
+            f"Synced {added} new and {updated} updated edge(s) for "
+            f"{len(nodes)} node(s)"
+        )
+        self.flush()
+        return added
+
+    def _merge(self, edges: List[Edge], after: Dict[str, int]) -> Tuple[int, int]:
+        """Update stored edges from ``edges`` and append the rest."""
+        np = self._np
+        rows = self._rows_after(after)
+        scores = self._columns["score"]
+        new = []
+        for edge in edges:
+            key = (
+                self._node_codes.get(edge.node_id),
+                self._peer_codes.get(edge.peer_id),
+                edge.round,
+            )
+            row = rows.get(key)
+            if row is None:
+                new.append(edge)
+            else:
+                scores[row] = np.nan if edge.score is None else edge.score
+        return self.append(new), len(edges) - len(new)
+
+    def _rows_after(self, after: Dict[str, int]) -> Dict[Tuple[int, int, int], int]:
+        """Row index by (node, peer, round) of edges newer than ``after[node]``."""
+        np = self._np
+        if not after or not self.size:
+            return {}
+        thresholds = np.full(len(self.node_ids), np.iinfo("int64").max)
+        for node_id, round in after.items():
+            thresholds[self._node_codes[node_id]] = round
+        nodes = self.column("node")
+        rounds = self.column("round")
+        rows = np.nonzero(rounds > thresholds[nodes])[0]
+        keys = zip(
+            nodes[rows].tolist(),
+            self.column("peer")[rows].tolist(),
+            rounds[rows].tolist(),
+        )
+        return dict(zip(keys, rows.tolist()))
+
+    def flush(self) -> None:
+        """Write memory-mapped columns and the ID tables to disk."""
+        if self.path is None:
+            return
+        for column in self._columns.values():
+            column.flush()
+        meta = {
+            "size": self.size,
+            "node_ids": self.node_ids,
+            "peer_ids": self.peer_ids,
+            "last_rounds": self.last_rounds,
+        }
+        tmp = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.path, "meta.json"))
+
+    def close(self) -> None:
+        """Flush to disk."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def mean_scores(
+        self, node_id: Optional[str] = None, half_life: Optional[float] = None
+    ) -> Dict[str, float]:
+        """Mean score per peer, over all nodes or for ``node_id``.
+
+        With ``half_life`` (in rounds) the mean is weighted by
+        ``0.5 ** (age / half_life)``, where age counts from the latest round.
+        Peers without any score are left out.
+        """
+        np = self._np
+        mask = self._mask(node_id)
+        peers = self.column("peer")[mask]
+        scores = self.column("score")[mask]
+        weights = self._weights(self.column("round")[mask], half_life)
+        totals = np.bincount(peers, weights * scores, len(self.peer_ids))
+        counts = np.bincount(peers, weights, len(self.peer_ids))
+        present = np.nonzero(counts)[0]
+        means = totals[present] / counts[present]
+        return {self.peer_ids[p]: float(m) for p, m in zip(present, means)}
+
+    def top_peers(
+        self,
+        k: int = 10,
+        node_id: Optional[str] = None,
+        half_life: Optional[float] = None,
+    ) -> Dict[str, List[Tuple[str, float]]]:
+        """The ``k`` best peers by (decayed) mean score for every node.
+
+        Returns ``{node_id: [(peer_id, score), ...]}``, best first; with
+        ``node_id`` only that node is included.
+        """
+        np = self._np
+        mask = self._mask(node_id)
+        num_peers = max(len(self.peer_ids), 1)
+        nodes = self.column("node")[mask].astype("int64")
+        pairs = nodes * num_peers + self.column("peer")[mask]
+        scores = self.column("score")[mask]
+        weights = self._weights(self.column("round")[mask], half_life)
+        span = len(self.node_ids) * num_peers
+        dense = span <= max(4 * len(pairs), 1 << 20)
+        if dense:
+            # Small (node, peer) grid: count pairs directly instead of sorting.
+            keys, inverse = np.arange(span), pairs
+        else:
+            keys, inverse = np.unique(pairs, return_inverse=True)
+        totals = np.bincount(inverse, weights * scores, len(keys))
+        counts = np.bincount(inverse, weights, len(keys))
+        scored = counts > 0
+        keys, means = keys[scored], totals[scored] / counts[scored]
+
+        result: Dict[str, List[Tuple[str, float]]] = {}
+        if dense:
+            # Partial sort of each node's row of the (node, peer) grid.
+            grid = np.full(span, -np.inf)
+            grid[keys] = means
+            grid = grid.reshape(-1, num_peers)
+            rows = np.unique(keys // num_peers)
+            k = min(k, num_peers)
+            top = np.argpartition(-grid[rows], k - 1, axis=1)[:, :k]
+            values = np.take_along_axis(grid[rows], top, axis=1)
+            order = np.argsort(-values, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            values = np.take_along_axis(values, order, axis=1)
+            for node, row_peers, row_values in zip(rows, top, values):
+                result[self.node_ids[node]] = [
+                    (self.peer_ids[peer], float(value))
+                    for peer, value in zip(row_peers, row_values)
+                    if value != -np.inf
+                ]
+            return result
+
+        # Sort by node, then by score descending, and keep the first k per node.
+        nodes, peers = keys // num_peers, keys % num_peers
+        order = np.lexsort((-means, nodes))
+        nodes, peers, means = nodes[order], peers[order], means[order]
+        starts = np.r_[0, np.nonzero(np.diff(nodes))[0] + 1]
+        sizes = np.diff(np.r_[starts, len(nodes)])
+        rank = np.arange(len(nodes)) - np.repeat(starts, sizes)
+        keep = rank < k
+        for node, peer, mean in zip(nodes[keep], peers[keep], means[keep]):
+            result.setdefault(self.node_ids[node], []).append(
+                (self.peer_ids[peer], float(mean))
+            )
+        return result
+
+    def trend(
+        self, node_id: Optional[str] = None, peer_id: Optional[str] = None
+    ) -> Tuple[Any, Any]:
+        """Mean score per round as ``(rounds, means)`` arrays, oldest first."""
+        np = self._np
+        mask = self._mask(node_id, peer_id)
+        rounds = self.column("round")[mask]
+        scores = self.column("score")[mask]
+        unique, inverse = np.unique(rounds, return_inverse=True)
+        totals = np.bincount(inverse, scores, len(unique))
+        counts = np.bincount(inverse, minlength=len(unique))
+        return unique, totals / counts
+
+    def _code(self, value: str, node: bool) -> int:
+        if node:
+            codes, ids = self._node_codes, self.node_ids
+        else:
+            codes, ids = self._peer_codes, self.peer_ids
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(ids)
+            ids.append(value)
+        return code
+
+    def _mask(self, node_id: Optional[str] = None, peer_id: Optional[str] = None):
+        np = self._np
+        # Queries only look at scored edges.
+        mask = ~np.isnan(self.column("score"))
+        for value, codes, name in (
+            (node_id, self._node_codes, "node"),
+            (peer_id, self._peer_codes, "peer"),
+        ):
+            if value is not None:
+                code = codes.get(value, -1)
+                mask &= self.column(name) == code
+        return mask
+
+    def _weights(self, rounds, half_life: Optional[float]):
+        np = self._np
+        if half_life is None or not len(rounds):
+            return np.ones(len(rounds))
+        return 0.5 ** ((rounds.max() - rounds) / half_life)
+
+    def _allocate(self, capacity: int) -> None:
+        np = self._np
+        columns = {}
+        for name, dtype in _COLUMNS:
+            if self.path is None:
+                column = np.empty(capacity, dtype)
+            else:
+                file = os.path.join(self.path, f"{name}.npy")
+                tmp = f"{file}.tmp.npy"
+                column = np.lib.format.open_memmap(tmp, "w+", dtype, (capacity,))
+            if name in self._columns:
+                column[: self.size] = self._columns[name][: self.size]
+            if self.path is not None:
+                column.flush()
+                del column
+                if name in self._columns:
+                    del self._columns[name]
+                os.replace(tmp, file)
+                column = np.lib.format.open_memmap(file, "r+")
+            columns[name] = column
+        self._columns = columns
+
+    def _load(self) -> None:
+        np = self._np
+        with open(os.path.join(self.path, "meta.json")) as f:
+            meta = json.load(f)
+        self.size = meta["size"]
+        self.node_ids = meta["node_ids"]
+        self.peer_ids = meta["peer_ids"]
+        self.last_rounds = meta["last_rounds"]
+        self._node_codes = {value: i for i, value in enumerate(self.node_ids)}
+        self._peer_codes = {value: i for i, value in enumerate(self.peer_ids)}
+        self._columns = {
+            name: np.lib.format.open_memmap(
+                os.path.join(self.path, f"{name}.npy"), "r+"
+            )
+            for name, _ in _COLUMNS
+        }
@@ -29,3 +29,7 @@ class HashgridValidationError(HashgridAPIError):
     """Exception raised for validation errors."""
     pass
 
+
+class HashgridCircuitOpenError(HashgridAPIError):
+    """Exception raised when the circuit breaker rejects a request."""
+    pass
@@ -0,0 +1,248 @@
+"""Conversation memory per edge, keyed by (node_id, peer_id)."""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+EdgeKey = Tuple[str, str]
+
+
+class EdgeMemory(ABC):
+    """Stores the message history of each edge."""
+
+    @abstractmethod
+    def append(self, node_id: str, peer_id: str, message: str) -> None:
+        """Append a message to the edge's history."""
+
+    @abstractmethod
+    def history(self, node_id: str, peer_id: str) -> List[str]:
+        """Return the edge's messages, oldest first."""
+
+    @abstractmethod
+    def clear(self, node_id: str, peer_id: str) -> None:
+        """Forget the edge's history."""
+
+    def flush(self) -> None:
+        """Persist buffered writes. Call once per tick."""
+
+    def close(self) -> None:
+        """Flush and release resources."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class _EdgeHistory:
+    """Messages of one edge with their sizes and timestamps."""
+
+    __slots__ = ("entries", "size")
+
+    def __init__(self):
+        self.entries: Deque[Tuple[str, int, float]] = deque()
+        self.size = 0
+
+    def popleft(self) -> int:
+        _, size, _ = self.entries.popleft()
+        self.size -= size
+        return size
+
+
+class InMemoryEdgeMemory(EdgeMemory):
+    """In-process memory with LRU eviction, TTL and byte budgets.
+
+    Each edge keeps at most ``max_messages_per_edge`` messages and
+    ``max_bytes_per_edge`` bytes (UTF-8), dropping its oldest messages first.
+    When all edges together exceed ``max_bytes``, the least recently used
+    edges are evicted. Messages older than ``ttl`` seconds are forgotten.
+    """
+
+    def __init__(
+        self,
+        max_messages_per_edge: Optional[int] = None,
+        max_bytes_per_edge: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        self.max_messages_per_edge = max_messages_per_edge
+        self.max_bytes_per_edge = max_bytes_per_edge
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.evictions = 0
+        self._edges: "OrderedDict[EdgeKey, _EdgeHistory]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._edges)
+
+    def append(self, node_id: str, peer_id: str, message: str) -> None:
+        key = (node_id, peer_id)
+        edge = self._edges.get(key)
+        if edge is None:
+            edge = self._edges[key] = _EdgeHistory()
+        else:
+            self._edges.move_to_end(key)
+
+        size = len(message.encode("utf-8"))
+        edge.entries.append((message, size, time.monotonic()))
+        edge.size += size
+        self.size += size
+
+        while edge.entries and (
+            (
+                self.max_messages_per_edge is not None
+                and len(edge.entries) > self.max_messages_per_edge
+            )
+            or (
+                self.max_bytes_per_edge is not None
+                and edge.size > self.max_bytes_per_edge
+            )
+        ):
+            self.size -= edge.popleft()
+        self._evict()
+
+    def history(self, node_id: str, peer_id: str) -> List[str]:
+        key = (node_id, peer_id)
+        edge = self._edges.get(key)
+        if edge is None:
+            return []
+        self._edges.move_to_end(key)
+        self._expire(key, edge)
+        return [message for message, _, _ in edge.entries]
+
+    def clear(self, node_id: str, peer_id: str) -> None:
+        edge = self._edges.pop((node_id, peer_id), None)
+        if edge is not None:
+            self.size -= edge.size
+
+    def _expire(self, key: EdgeKey, edge: _EdgeHistory) -> None:
+        """Drop messages older than ``ttl`` from ``edge``."""
+        if self.ttl is None:
+            return
+        cutoff = time.monotonic() - self.ttl
+        while edge.entries and edge.entries[0][2] < cutoff:
+            self.size -= edge.popleft()
+        if not edge.entries:
+            del self._edges[key]
+
+    def _evict(self) -> None:
+        """Evict expired and least recently used edges."""
+        while self._edges:
+            key, edge = next(iter(self._edges.items()))
+            self._expire(key, edge)
+            if key in self._edges and (
+                self.max_bytes is None or self.size <= self.max_bytes
+            ):
+                return
+            if key in self._edges:
+                del self._edges[key]
+                self.size -= edge.size
+                self.evictions += 1
+
+
+class SQLiteEdgeMemory(EdgeMemory):
+    """Persistent memory in a SQLite database.
+
+    Appends are buffered and written in one transaction by ``flush()``, so
+    call it once per tick. Each edge keeps at most ``max_messages_per_edge``
+    messages. It can be shared by handlers running on several threads, e.g.
+    with ``executor_handler`` and a ``ThreadPoolExecutor``.
+    """
+
+    def __init__(self, path: str, max_messages_per_edge: Optional[int] = None):
+        self.path = path
+        self.max_messages_per_edge = max_messages_per_edge
+        self._pending: List[Tuple[str, str, str, float]] = []
+        # Used from the event loop and handler threads; ``_lock`` keeps calls
+        # from overlapping.
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS edge_memory ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "node_id TEXT NOT NULL, "
+            "peer_id TEXT NOT NULL, "
+            "message TEXT NOT NULL, "
+            "created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS edge_memory_edge "
+            "ON edge_memory (node_id, peer_id, id)"
+        )
+        self._conn.commit()
+
+    def append(self, node_id: str, peer_id: str, message: str) -> None:
+        with self._lock:
+            self._pending.append((node_id, peer_id, message, time.time()))
+
+    def history(self, node_id: str, peer_id: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT message FROM edge_memory WHERE node_id = ? AND peer_id = ? "
+                "ORDER BY id",
+                (node_id, peer_id),
+            ).fetchall()
+            messages = [row[0] for row in rows]
+            messages.extend(
+                message
+                for pending_node, pending_peer, message, _ in self._pending
+                if pending_node == node_id and pending_peer == peer_id
+            )
+        if self.max_messages_per_edge is not None:
+            messages = messages[-self.max_messages_per_edge :]
+        return messages
+
+    def clear(self, node_id: str, peer_id: str) -> None:
+        with self._lock, self._conn:
+            self._pending = [
+                entry for entry in self._pending if entry[:2] != (node_id, peer_id)
+            ]
+            self._conn.execute(
+                "DELETE FROM edge_memory WHERE node_id = ? AND peer_id = ?",
+                (node_id, peer_id),
+            )
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            self._write(pending)
+        logger.debug(f"Flushed {len(pending)} message(s) to {self.path}")
+
+    def _write(self, pending: List[Tuple[str, str, str, float]]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO edge_memory (node_id, peer_id, message, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                pending,
+            )
+            if self.max_messages_per_edge is not None:
+                edges: Dict[EdgeKey, None] = dict.fromkeys(
+                    (node_id, peer_id) for node_id, peer_id, _, _ in pending
+                )
+                self._conn.executemany(
+                    "DELETE FROM edge_memory WHERE node_id = ? AND peer_id = ? "
+                    "AND id <= (SELECT id FROM edge_memory "
+                    "WHERE node_id = ? AND peer_id = ? "
+                    "ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    [
+                        (node_id, peer_id, node_id, peer_id, self.max_messages_per_edge)
+                        for node_id, peer_id in edges
+                    ],
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._conn.close()
@@ -0,0 +1,290 @@
+"""Request events and per-operation latency metrics."""
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import time
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+@dataclass
+class RequestEvent:
+    """A single request attempt, passed to ``Hashgrid`` event hooks."""
+
+    method: str
+    path: str
+    attempt: int = 0
+    status_code: Optional[int] = None
+    error: Optional[BaseException] = None
+    request_bytes: int = 0
+    response_bytes: int = 0
+    latency: float = 0.0
+    retry_delay: Optional[float] = None
+
+    @property
+    def operation(self) -> str:
+        """Endpoint family: ``/api/v1``, ``/node``, ``/recv`` or ``/send``."""
+        return operation_for(self.path)
+
+    @property
+    def node_id(self) -> Optional[str]:
+        """Node ID for per-node endpoints, if any."""
+        return node_id_for(self.path)
+
+
+def operation_for(path: str) -> str:
+    """Map a request path to its endpoint family."""
+    path = "/" + path.strip("/")
+    if path.endswith("/recv"):
+        return "/recv"
+    if path.endswith("/send"):
+        return "/send"
+    if path.startswith("/api/v1/node"):
+        return "/node"
+    return path
+
+
+def node_id_for(path: str) -> Optional[str]:
+    """Node ID of a per-node request path, if any."""
+    parts = path.strip("/").split("/")
+    if len(parts) >= 4 and parts[:3] == ["api", "v1", "node"]:
+        if len(parts) > 4 or parts[3] not in ("recv", "send"):
+            return parts[3]
+    return None
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed bucket bounds."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the ``q`` quantile (0..1) by interpolating within buckets."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+@dataclass
+class _NodeLatency:
+    count: int = 0
+    sum: float = 0.0
+    max: float = 0.0
+
+
+@dataclass
+class Metrics:
+    """Collects request metrics from ``Hashgrid`` event hooks.
+
+    Keeps a latency histogram per (operation, method), request counts by
+    status, byte counters and per-node latency. Export with
+    ``to_prometheus()`` (text exposition format) or ``to_otlp()`` (OTLP/JSON),
+    both of which work offline.
+    """
+
+    buckets: Sequence[float] = DEFAULT_BUCKETS
+    histograms: Dict[Tuple[str, str], Histogram] = field(default_factory=dict)
+    requests: Dict[Tuple[str, str, str], int] = field(default_factory=dict)
+    request_bytes: Dict[str, int] = field(default_factory=dict)
+    response_bytes: Dict[str, int] = field(default_factory=dict)
+    retries: Dict[str, int] = field(default_factory=dict)
+    nodes: Dict[str, _NodeLatency] = field(default_factory=dict)
+    started_at: float = field(default_factory=time.time)
+
+    def register(self, client) -> "Metrics":
+        """Attach to a ``Hashgrid`` client's event hooks."""
+        client.add_hook("request_end", self.record)
+        client.add_hook("retry", self.record_retry)
+        return self
+
+    def record(self, event: RequestEvent) -> None:
+        """Record a finished request attempt."""
+        operation = event.operation
+        key = (operation, event.method)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self.buckets)
+        histogram.observe(event.latency)
+
+        status = str(event.status_code) if event.status_code else "error"
+        count_key = (operation, event.method, status)
+        self.requests[count_key] = self.requests.get(count_key, 0) + 1
+        self.request_bytes[operation] = (
+            self.request_bytes.get(operation, 0) + event.request_bytes
+        )
+        self.response_bytes[operation] = (
+            self.response_bytes.get(operation, 0) + event.response_bytes
+        )
+
+        node_id = event.node_id
+        if node_id is not None:
+            node = self.nodes.get(node_id)
+            if node is None:
+                node = self.nodes[node_id] = _NodeLatency()
+            node.count += 1
+            node.sum += event.latency
+            node.max = max(node.max, event.latency)
+
+    def record_retry(self, event: RequestEvent) -> None:
+        """Record a retried request attempt."""
+        operation = event.operation
+        self.retries[operation] = self.retries.get(operation, 0) + 1
+
+    def quantile(
+        self, operation: str, q: float, method: Optional[str] = None
+    ) -> Optional[float]:
+        """Estimate a latency quantile for an operation (all methods merged)."""
+        merged = Histogram(self.buckets)
+        for (op, op_method), histogram in self.histograms.items():
+            if op == operation and method in (None, op_method):
+                merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+                merged.count += histogram.count
+                merged.sum += histogram.sum
+        return merged.quantile(q)
+
+    def slowest_nodes(self, n: int = 10) -> List[Tuple[str, float]]:
+        """Return the ``n`` nodes with the highest mean request latency."""
+        means = [
+            (node_id, node.sum / node.count)
+            for node_id, node in self.nodes.items()
+            if node.count
+        ]
+        return sorted(means, key=lambda item: item[1], reverse=True)[:n]
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP hashgrid_request_duration_seconds Request latency.",
+            "# TYPE hashgrid_request_duration_seconds histogram",
+        ]
+        for (operation, method), histogram in sorted(self.histograms.items()):
+            labels = f'operation="{operation}",method="{method}"'
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(
+                    f"hashgrid_request_duration_seconds_bucket"
+                    f'{{{labels},le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                f'hashgrid_request_duration_seconds_bucket{{{labels},le="+Inf"}} '
+                f"{histogram.count}"
+            )
+            lines.append(
+                f"hashgrid_request_duration_seconds_sum{{{labels}}} {histogram.sum}"
+            )
+            lines.append(
+                f"hashgrid_request_duration_seconds_count{{{labels}}} "
+                f"{histogram.count}"
+            )
+
+        lines += [
+            "# HELP hashgrid_requests_total Requests by status code.",
+            "# TYPE hashgrid_requests_total counter",
+        ]
+        for (operation, method, status), count in sorted(self.requests.items()):
+            lines.append(
+                f'hashgrid_requests_total{{operation="{operation}",'
+                f'method="{method}",status="{status}"}} {count}'
+            )
+
+        for name, help_text, values in (
+            ("hashgrid_request_bytes_total", "Request body bytes.", self.request_bytes),
+            (
+                "hashgrid_response_bytes_total",
+                "Response body bytes.",
+                self.response_bytes,
+            ),
+            ("hashgrid_retries_total", "Retried requests.", self.retries),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for operation, value in sorted(values.items()):
+                lines.append(f'{name}{{operation="{operation}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Write the metrics to a file, e.g. for node_exporter's textfile collector."""
+        with open(path, "w") as f:
+            f.write(self.to_prometheus())
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Render the latency histograms as an OTLP/JSON metrics payload."""
+        start = str(int(self.started_at * 1e9))
+        now = str(time.time_ns())
+        data_points = []
+        for (operation, method), histogram in sorted(self.histograms.items()):
+            data_points.append(
+                {
+                    "attributes": [
+                        {"key": "operation", "value": {"stringValue": operation}},
+                        {"key": "method", "value": {"stringValue": method}},
+                    ],
+                    "startTimeUnixNano": start,
+                    "timeUnixNano": now,
+                    "count": str(histogram.count),
+                    "sum": histogram.sum,
+                    "bucketCounts": [str(count) for count in histogram.counts],
+                    "explicitBounds": list(histogram.buckets),
+                }
+            )
+        return {
+            "resourceMetrics": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": {"stringValue": "hashgrid"}}
+                        ]
+                    },
+                    "scopeMetrics": [
+                        {
+                            "scope": {"name": "hashgrid"},
+                            "metrics": [
+                                {
+                                    "name": "hashgrid.request.duration",
+                                    "unit": "s",
+                                    "histogram": {
+                                        # AGGREGATION_TEMPORALITY_CUMULATIVE
+                                        "aggregationTemporality": 2,
+                                        "dataPoints": data_points,
+                                    },
+                                }
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
@@ -0,0 +1,258 @@
+"""Durable outbox for replies, keyed by (node_id, peer_id, round)."""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+
+from .resources import Message, Status
+
+if TYPE_CHECKING:
+    from .resources import Grid, Node
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+ACKED = "acked"
+REJECTED = "rejected"
+FAILED = "failed"
+
+
+class Outbox:
+    """Write-ahead log of replies in a SQLite database.
+
+    Replies are stored before they are sent and marked by the returned
+    ``Status``: ``acked`` when it succeeded, ``rejected`` when the server
+    refused it. Replies without a status, e.g. because the request timed
+    out, stay ``pending`` and are sent again by the next ``send()`` for the
+    node or by ``replay()``; after ``max_attempts`` they are marked
+    ``failed``. Only one reply is kept per (node_id, peer_id, round): the
+    first one recorded wins and acknowledged replies are never sent again.
+
+    Sends are retried by the client like any other send, so delivery is
+    at least once: a reply whose request timed out may already have been
+    applied by the server and is still sent again.
+
+    The async methods run the database work on a dedicated thread, so they
+    do not block the event loop. Call ``replay()`` on startup to send
+    replies left pending by a crash.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 5):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.path = path
+        self.max_attempts = max_attempts
+        # Used from the caller's thread and the outbox thread; ``_lock``
+        # keeps calls from overlapping.
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="hashgrid-outbox")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "node_id TEXT NOT NULL, "
+            "peer_id TEXT NOT NULL, "
+            "round INTEGER NOT NULL, "
+            "message TEXT NOT NULL, "
+            "score REAL, "
+            "state TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, "
+            "updated_at REAL NOT NULL, "
+            "PRIMARY KEY (node_id, peer_id, round))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS outbox_state ON outbox (state, node_id)"
+        )
+        self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """Close the database."""
+        self._executor.shutdown()
+        with self._lock:
+            self._conn.close()
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func`` on the outbox thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def record(self, node_id: str, replies: Iterable[Message]) -> List[Message]:
+        """Store new replies and return the ones that still need sending.
+
+        Replies whose key was already acknowledged, rejected or given up on
+        are dropped; for keys that are still pending the stored reply is
+        returned instead of the new one.
+        """
+        replies = list(replies)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO outbox "
+                "(node_id, peer_id, round, message, score, state, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (node_id, r.peer_id, r.round, r.message, r.score, PENDING, now)
+                    for r in replies
+                ],
+            )
+        keys = {(r.peer_id, r.round) for r in replies}
+        return [
+            msg
+            for msg in self.pending(node_id).get(node_id, [])
+            if (msg.peer_id, msg.round) in keys
+        ]
+
+    def pending(self, node_id: Optional[str] = None) -> Dict[str, List[Message]]:
+        """Return unacknowledged replies keyed by node ID."""
+        query = (
+            "SELECT node_id, peer_id, round, message, score FROM outbox "
+            "WHERE state = ?"
+        )
+        params: Tuple = (PENDING,)
+        if node_id is not None:
+            query += " AND node_id = ?"
+            params += (node_id,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY round, peer_id", params)
+            rows = rows.fetchall()
+        result: Dict[str, List[Message]] = {}
+        for row_node, peer_id, round, message, score in rows:
+            result.setdefault(row_node, []).append(
+                Message(peer_id=peer_id, round=round, message=message, score=score)
+            )
+        return result
+
+    def acknowledge(
+        self, node_id: str, replies: List[Message], statuses: List[Status]
+    ) -> None:
+        """Mark sent replies by their statuses; replies without one stay pending."""
+        by_key = {(s.peer_id, s.round): s.success for s in statuses}
+        now = time.time()
+        answered = []
+        unanswered = []
+        for reply in replies:
+            key = (reply.peer_id, reply.round)
+            if key in by_key:
+                state = ACKED if by_key[key] else REJECTED
+                answered.append((state, now, node_id) + key)
+            else:
+                unanswered.append((now, node_id) + key)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE outbox SET state = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE node_id = ? AND peer_id = ? AND round = ?",
+                answered,
+            )
+        self._failed(unanswered)
+
+    def fail(self, node_id: str, replies: List[Message]) -> None:
+        """Count a failed send attempt for ``replies``."""
+        now = time.time()
+        self._failed([(now, node_id, r.peer_id, r.round) for r in replies])
+
+    def _failed(self, rows: List[Tuple]) -> None:
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE outbox SET attempts = attempts + 1, updated_at = ? "
+                "WHERE node_id = ? AND peer_id = ? AND round = ?",
+                rows,
+            )
+            given_up = self._conn.execute(
+                "UPDATE outbox SET state = ? WHERE state = ? AND attempts >= ?",
+                (FAILED, PENDING, self.max_attempts),
+            ).rowcount
+        if given_up:
+            logger.warning(
+                f"Gave up on {given_up} reply/replies after "
+                f"{self.max_attempts} attempts"
+            )
+
+    def counts(self) -> Dict[str, int]:
+        """Number of replies per state."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM outbox GROUP BY state"
+            ).fetchall()
+        return dict(rows)
+
+    def prune(self, max_age: float) -> int:
+        """Delete settled replies older than ``max_age`` seconds."""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM outbox WHERE state != ? AND updated_at < ?",
+                (PENDING, time.time() - max_age),
+            ).rowcount
+
+    async def send(self, node: "Node", replies: List[Message]) -> List[Status]:
+        """Record ``replies`` and send the ones not acknowledged yet."""
+        replies = await self._run(self.record, node.node_id, replies)
+        if not replies:
+            return []
+        try:
+            statuses = await node.send(replies)
+        except Exception:
+            await self._run(self.fail, node.node_id, replies)
+            raise
+        await self._run(self.acknowledge, node.node_id, replies, statuses)
+        return statuses
+
+    async def send_all(
+        self, grid: "Grid", replies: Dict[str, List[Message]], concurrency: int = 10
+    ) -> Dict[str, List[Status]]:
+        """Record and send replies for many nodes, like ``Grid.send_all``."""
+        replies = await self._run(self._record_all, replies)
+        return await self._send_all(grid, replies, concurrency)
+
+    async def replay(
+        self, grid: "Grid", concurrency: int = 10
+    ) -> Dict[str, List[Status]]:
+        """Send every pending reply again, e.g. after a restart."""
+        replies = await self._run(self.pending)
+        if replies:
+            logger.info(
+                f"Replaying {sum(len(msgs) for msgs in replies.values())} pending "
+                f"reply/replies for {len(replies)} node(s)"
+            )
+        return await self._send_all(grid, replies, concurrency)
+
+    async def _send_all(
+        self, grid: "Grid", replies: Dict[str, List[Message]], concurrency: int
+    ) -> Dict[str, List[Status]]:
+        replies = {node_id: msgs for node_id, msgs in replies.items() if msgs}
+        try:
+            statuses = await grid.send_all(replies, concurrency)
+        except Exception:
+            await self._run(self._fail_all, replies)
+            raise
+        await self._run(self._acknowledge_all, replies, statuses)
+        return statuses
+
+    def _record_all(
+        self, replies: Dict[str, List[Message]]
+    ) -> Dict[str, List[Message]]:
+        return {
+            node_id: self.record(node_id, msgs) for node_id, msgs in replies.items()
+        }
+
+    def _fail_all(self, replies: Dict[str, List[Message]]) -> None:
+        for node_id, msgs in replies.items():
+            self.fail(node_id, msgs)
+
+    def _acknowledge_all(
+        self, replies: Dict[str, List[Message]], statuses: Dict[str, List[Status]]
+    ) -> None:
+        for node_id, msgs in replies.items():
+            self.acknowledge(node_id, msgs, statuses.get(node_id, []))
@@ -0,0 +1,287 @@
+"""Pipelined tick processing with bounded queues between stages."""
+
+from concurrent.futures import Executor
+from typing import List, Optional, Set, TYPE_CHECKING
+import asyncio
+import itertools
+import logging
+import math
+import time
+
+from .resources import (
+    Fallback,
+    Handler,
+    TickResult,
+    _run_handler,
+    executor_handler,
+)
+
+if TYPE_CHECKING:
+    from .resources import Grid
+    from .outbox import Outbox
+    from .sharding import Shard
+
+logger = logging.getLogger(__name__)
+
+
+class _TickJob:
+    """Collects the results of one submitted tick."""
+
+    def __init__(self, size: int):
+        self.results: List[TickResult] = []
+        self.remaining = size
+        self.started = time.perf_counter()
+        self.future: "asyncio.Future[List[TickResult]]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        if not size:
+            self.future.set_result([])
+
+    def finish(self, result: TickResult) -> None:
+        self.results.append(result)
+        self.remaining -= 1
+        if not self.remaining and not self.future.done():
+            failed = sum(1 for r in self.results if r.error is not None)
+            missed = sum(1 for r in self.results if r.deadline_missed)
+            logger.info(
+                f"Pipelined {len(self.results)} node(s) in "
+                f"{time.perf_counter() - self.started:.3f}s ({failed} failed, "
+                f"{missed} missed deadline)"
+            )
+            self.future.set_result(self.results)
+
+
+class TickPipeline:
+    """Runs recv, handler and send as separate stages.
+
+    ``recv_concurrency`` workers receive messages, ``handler_workers`` run the
+    handler and a sender groups replies into batches of up to
+    ``send_batch_size`` nodes (waiting at most ``batch_timeout`` seconds for a
+    batch to fill) sent with ``Grid.send_all``. Stages are connected by queues
+    holding at most ``queue_size`` nodes, so receiving pauses when handlers
+    fall behind. Network I/O for one node overlaps with handlers for others,
+    and a new tick can be submitted before the previous one finishes.
+
+    With ``deadline_margin`` each submitted tick fetches the current tick
+    (see ``Grid.process_tick``) and each node gets the deadline
+    ``grid.round_deadline(round, deadline_margin)`` of the earliest round of
+    its messages; handlers pick up the earliest deadline first, and late
+    handlers are cancelled or replaced by ``fallback`` as in
+    ``Grid.process_tick``. ``missed_deadlines`` counts nodes that missed their
+    deadline.
+
+    With ``executor`` the handler runs in an executor (e.g. a
+    ``ProcessPoolExecutor`` for CPU-bound replies), see ``executor_handler``.
+    With ``shard`` only the nodes the shard owns are submitted, and with
+    ``outbox`` replies are sent through the ``Outbox``.
+
+    Use as an async context manager::
+
+        async with grid.pipeline(handler) as pipeline:
+            async for tick in grid.listen():
+                results = await pipeline.run_tick()
+    """
+
+    def __init__(
+        self,
+        grid: "Grid",
+        handler: Handler,
+        recv_concurrency: int = 10,
+        handler_workers: int = 10,
+        send_batch_size: int = 50,
+        send_concurrency: int = 4,
+        queue_size: int = 100,
+        batch_timeout: float = 0.05,
+        deadline_margin: Optional[float] = None,
+        fallback: Optional[Fallback] = None,
+        executor: Optional[Executor] = None,
+        chunk_size: Optional[int] = None,
+        shard: Optional["Shard"] = None,
+        outbox: Optional["Outbox"] = None,
+    ):
+        if min(recv_concurrency, handler_workers, send_batch_size, send_concurrency) < 1:
+            raise ValueError("pipeline concurrency and batch sizes must be at least 1")
+        self.grid = grid
+        self.handler = handler
+        if executor is not None:
+            self.handler = executor_handler(handler, executor, chunk_size)
+        self.recv_concurrency = recv_concurrency
+        self.handler_workers = handler_workers
+        self.send_batch_size = send_batch_size
+        self.send_concurrency = send_concurrency
+        self.queue_size = queue_size
+        self.batch_timeout = batch_timeout
+        self.deadline_margin = deadline_margin
+        self.fallback = fallback
+        self.shard = shard
+        self.outbox = outbox
+        self.missed_deadlines = 0
+        self._sequence = itertools.count()
+        self._recv_queue: Optional[asyncio.Queue] = None
+        self._handler_queue: Optional[asyncio.PriorityQueue] = None
+        self._send_queue: Optional[asyncio.Queue] = None
+        self._send_slots: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._jobs: Set[_TickJob] = set()
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    @property
+    def running(self) -> bool:
+        """Whether the stage workers are running."""
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Start the stage workers."""
+        if self.running:
+            return
+        self._recv_queue = asyncio.Queue(self.queue_size)
+        self._handler_queue = asyncio.PriorityQueue(self.queue_size)
+        self._send_queue = asyncio.Queue(self.queue_size)
+        self._send_slots = asyncio.Semaphore(self.send_concurrency)
+        for _ in range(self.recv_concurrency):
+            self._spawn(self._recv_worker())
+        for _ in range(self.handler_workers):
+            self._spawn(self._handler_worker())
+        self._spawn(self._send_worker())
+
+    async def stop(self) -> None:
+        """Cancel the stage workers and any in-flight work.
+
+        Futures of ticks that did not finish are cancelled, so callers
+        waiting on ``run_tick()`` get a ``CancelledError``.
+        """
+        tasks, self._tasks = self._tasks, set()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        jobs, self._jobs = self._jobs, set()
+        for job in jobs:
+            job.future.cancel()
+        for queue in (self._recv_queue, self._handler_queue, self._send_queue):
+            while queue is not None and not queue.empty():
+                queue.get_nowait()
+
+    async def submit_tick(self) -> "asyncio.Future[List[TickResult]]":
+        """Queue every node for processing and return a future of the results.
+
+        Waits while the recv queue is full.
+        """
+        if not self.running:
+            raise RuntimeError("Pipeline is not running, call start() first")
+        if self.deadline_margin is not None:
+            await self.grid._observe_tick()
+        nodes = [
+            node
+            async for node in self.grid.nodes()
+            if self.shard is None or self.shard.owns(node.node_id)
+        ]
+        job = _TickJob(len(nodes))
+        self._jobs.add(job)
+        job.future.add_done_callback(lambda _: self._jobs.discard(job))
+        for node in nodes:
+            if job.future.done():
+                break  # cancelled by stop()
+            await self._recv_queue.put((job, TickResult(node=node)))
+        return job.future
+
+    async def run_tick(self) -> List[TickResult]:
+        """Process every node once and return the per-node results."""
+        return await (await self.submit_tick())
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _recv_worker(self) -> None:
+        while True:
+            job, result = await self._recv_queue.get()
+            try:
+                started = time.perf_counter()
+                result.messages = await result.node.recv()
+                result.recv_time = time.perf_counter() - started
+            except Exception as e:
+                self._fail(job, result, e)
+                continue
+            if result.messages:
+                result.deadline = self.grid._reply_deadline(
+                    result.messages, self.deadline_margin
+                )
+                # Earliest deadline first, then in arrival order.
+                priority = math.inf if result.deadline is None else result.deadline
+                await self._handler_queue.put(
+                    (priority, next(self._sequence), job, result)
+                )
+            else:
+                job.finish(result)
+
+    async def _handler_worker(self) -> None:
+        while True:
+            _, _, job, result = await self._handler_queue.get()
+            try:
+                await _run_handler(self.handler, result, self.fallback)
+            except Exception as e:
+                self._fail(job, result, e)
+                continue
+            if result.deadline_missed:
+                self.missed_deadlines += 1
+            if result.replies:
+                await self._send_queue.put((job, result))
+            else:
+                job.finish(result)
+
+    async def _send_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        carry = None
+        while True:
+            batch = [carry if carry is not None else await self._send_queue.get()]
+            carry = None
+            node_ids = {batch[0][1].node.node_id}
+            deadline = loop.time() + self.batch_timeout
+            while len(batch) < self.send_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._send_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item[1].node.node_id in node_ids:
+                    # Replies for the same node from a later tick go in the next batch.
+                    carry = item
+                    break
+                node_ids.add(item[1].node.node_id)
+                batch.append(item)
+            await self._send_slots.acquire()
+            self._spawn(self._send_batch(batch))
+
+    async def _send_batch(self, batch) -> None:
+        try:
+            started = time.perf_counter()
+            replies = {result.node.node_id: result.replies for _, result in batch}
+            if self.outbox is not None:
+                statuses = await self.outbox.send_all(self.grid, replies)
+            else:
+                statuses = await self.grid.send_all(replies)
+            send_time = time.perf_counter() - started
+            for job, result in batch:
+                result.statuses = statuses.get(result.node.node_id, [])
+                result.send_time = send_time
+                job.finish(result)
+        except Exception as e:
+            for job, result in batch:
+                self._fail(job, result, e)
+        finally:
+            self._send_slots.release()
+
+    def _fail(self, job: _TickJob, result: TickResult, error: Exception) -> None:
+        logger.warning(f"Error while processing node '{result.node.name}': {error}")
+        result.error = error
+        job.finish(result)
@@ -0,0 +1,224 @@
+"""Client-side rate limiting with fair scheduling across nodes."""
+
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, Mapping, Optional
+import asyncio
+import logging
+import time
+
+from .retry import parse_retry_after
+
+if TYPE_CHECKING:
+    from .resources import Node, Quota
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second up to ``burst``."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: Optional[float] = None) -> float:
+        """Seconds until a token is available."""
+        self._refill(time.monotonic() if now is None else now)
+        return max(0.0, (1.0 - self.tokens) / self.rate)
+
+    def take(self) -> None:
+        """Consume a token (the balance may go negative)."""
+        self.tokens -= 1.0
+
+
+class RateLimiter:
+    """Paces requests to stay within the server's limits.
+
+    A global token bucket allows ``rate`` requests per second (``None`` for
+    no global limit until the server announces one) and per-node buckets
+    allow ``node_rate`` requests per second for each node. Waiting requests
+    are released round-robin across nodes, so a node with many queued
+    requests cannot starve the others.
+
+    The limiter adapts from responses: a 429 halves the rate and pauses all
+    requests for the ``Retry-After`` delay, ``RateLimit-Remaining`` /
+    ``RateLimit-Reset`` headers (also with an ``X-`` prefix) spread the
+    remaining requests over the reset window, and every other successful
+    response raises the rate by ``increase`` back towards ``rate``.
+
+    Pass it to ``Hashgrid(rate_limiter=...)`` and seed it from the user's
+    quota and node capacities with ``seed()``.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        node_rate: Optional[float] = None,
+        min_rate: float = 0.5,
+        increase: float = 0.5,
+    ):
+        self.max_rate = rate
+        self.node_rate = node_rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.bucket = TokenBucket(rate, burst) if rate is not None else None
+        self.throttled = 0
+        self.paused_until = 0.0
+        self._node_buckets: Dict[str, TokenBucket] = {}
+        self._node_rates: Dict[str, float] = {}
+        self._queues: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._pump: Optional[asyncio.Task] = None
+
+    @property
+    def rate(self) -> Optional[float]:
+        """Current global rate in requests per second."""
+        return self.bucket.rate if self.bucket is not None else None
+
+    @property
+    def waiting(self) -> int:
+        """Number of requests waiting for a token."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def seed(
+        self, quota: "Quota", nodes: Iterable["Node"] = (), interval: float = 60.0
+    ) -> None:
+        """Set the global rate to ``quota.capacity`` and each node's rate to
+        its ``capacity`` requests per ``interval`` seconds."""
+        self.set_rate(quota.capacity / interval)
+        for node in nodes:
+            self.set_node_rate(node.node_id, node.capacity / interval)
+
+    def set_rate(self, rate: float, burst: Optional[float] = None) -> None:
+        """Set the global rate (and the ceiling it recovers to after a 429)."""
+        self.max_rate = rate
+        if self.bucket is None:
+            self.bucket = TokenBucket(rate, burst)
+        else:
+            self.bucket.rate = rate
+            self.bucket.burst = burst if burst is not None else max(rate, 1.0)
+
+    def set_node_rate(self, node_id: str, rate: float) -> None:
+        """Set the rate for one node's requests."""
+        self._node_rates[node_id] = rate
+        self._node_buckets.pop(node_id, None)
+
+    async def acquire(self, node_id: Optional[str] = None) -> None:
+        """Wait until a request for ``node_id`` (None for grid-wide) may be sent."""
+        key = node_id or ""
+        now = time.monotonic()
+        if not self._queues and self._ready(key, now) <= 0:
+            self._take(key)
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(key, deque()).append(future)
+        if self._pump is None or self._pump.done():
+            self._pump = asyncio.ensure_future(self._release())
+        await future
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Adapt the rate from a response's status code and headers."""
+        now = time.monotonic()
+        if status_code == 429:
+            self.throttled += 1
+            delay = parse_retry_after(headers.get("Retry-After"))
+            self.paused_until = max(self.paused_until, now + (delay or 1.0))
+            if self.bucket is not None:
+                self.bucket.rate = max(self.min_rate, self.bucket.rate / 2)
+                self.bucket.tokens = min(self.bucket.tokens, 0.0)
+                logger.info(f"Throttled, reducing rate to {self.bucket.rate:.2f}/s")
+            return
+
+        remaining = _header(headers, "Remaining")
+        reset = _header(headers, "Reset")
+        if remaining is not None and reset is not None:
+            if reset > 1e9:
+                # Epoch timestamp rather than seconds until reset.
+                reset = max(0.0, reset - time.time())
+            if remaining < 1:
+                self.paused_until = max(self.paused_until, now + reset)
+            elif reset > 0:
+                rate = max(self.min_rate, remaining / reset)
+                if self.max_rate is not None:
+                    rate = min(rate, self.max_rate)
+                if self.bucket is None:
+                    self.bucket = TokenBucket(rate)
+                self.bucket.rate = rate
+            return
+
+        if self.bucket is not None and self.max_rate is not None and status_code < 400:
+            self.bucket.rate = min(self.max_rate, self.bucket.rate + self.increase)
+
+    def _node_bucket(self, key: str) -> Optional[TokenBucket]:
+        bucket = self._node_buckets.get(key)
+        if bucket is None and key:
+            rate = self._node_rates.get(key, self.node_rate)
+            if rate is not None:
+                bucket = self._node_buckets[key] = TokenBucket(rate)
+        return bucket
+
+    def _ready(self, key: str, now: float) -> float:
+        """Seconds until a request for ``key`` may be sent."""
+        delay = self.paused_until - now
+        if self.bucket is not None:
+            delay = max(delay, self.bucket.delay(now))
+        node_bucket = self._node_bucket(key)
+        if node_bucket is not None:
+            delay = max(delay, node_bucket.delay(now))
+        return delay
+
+    def _take(self, key: str) -> None:
+        if self.bucket is not None:
+            self.bucket.take()
+        node_bucket = self._node_bucket(key)
+        if node_bucket is not None:
+            node_bucket.take()
+
+    async def _release(self) -> None:
+        """Hand out tokens to waiting requests, round-robin across nodes."""
+        while self._queues:
+            now = time.monotonic()
+            wait = None
+            for key in list(self._queues):
+                queue = self._queues[key]
+                while queue and queue[0].done():
+                    queue.popleft()  # cancelled while waiting
+                if not queue:
+                    del self._queues[key]
+                    continue
+                delay = self._ready(key, now)
+                if delay <= 0:
+                    self._take(key)
+                    queue.popleft().set_result(None)
+                    # Move the node to the back of the line.
+                    if queue:
+                        self._queues.move_to_end(key)
+                    else:
+                        del self._queues[key]
+                    wait = 0.0
+                    break
+                wait = delay if wait is None else min(wait, delay)
+            if wait:
+                await asyncio.sleep(wait)
+            elif wait == 0.0:
+                # Let the released request run before handing out the next token.
+                await asyncio.sleep(0)
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[float]:
+    for prefix in ("RateLimit-", "X-RateLimit-"):
+        value = headers.get(prefix + name)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
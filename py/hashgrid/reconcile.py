@@ -0,0 +1,148 @@
+"""Declarative node provisioning: diff a desired node list against the grid."""
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Tuple, Union
+import logging
+import time
+
+from .resources import Node, _gather_bounded
+
+if TYPE_CHECKING:
+    from .resources import Grid
+
+logger = logging.getLogger(__name__)
+
+_FIELDS = ("message", "capacity")
+
+
+@dataclass
+class NodeSpec:
+    """Desired state of a node, identified by its name."""
+
+    name: str
+    message: str = ""
+    capacity: int = 100
+
+
+@dataclass
+class ReconcilePlan:
+    """Changes needed to turn the grid's nodes into the desired ones."""
+
+    create: List[NodeSpec] = field(default_factory=list)
+    update: List[Tuple[Node, Dict[str, Any]]] = field(default_factory=list)
+    delete: List[Node] = field(default_factory=list)
+    unchanged: List[Node] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        """Whether the grid already matches the desired nodes."""
+        return not (self.create or self.update or self.delete)
+
+    def __str__(self) -> str:
+        lines = [
+            f"{len(self.create)} to create, {len(self.update)} to update, "
+            f"{len(self.delete)} to delete, {len(self.unchanged)} unchanged"
+        ]
+        lines += [f"+ {spec.name}" for spec in self.create]
+        lines += [
+            f"~ {node.name}: {', '.join(sorted(changes))}"
+            for node, changes in self.update
+        ]
+        lines += [f"- {node.name}" for node in self.delete]
+        return "\n".join(lines)
+
+
+@dataclass
+class ReconcileResult:
+    """Outcome of ``Grid.reconcile()``."""
+
+    plan: ReconcilePlan
+    created: List[Node] = field(default_factory=list)
+    updated: List[Node] = field(default_factory=list)
+    deleted: List[Node] = field(default_factory=list)
+    errors: List[Tuple[str, str, BaseException]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether every change was applied."""
+        return not self.errors
+
+
+def plan_nodes(
+    nodes: Iterable[Node],
+    desired: Iterable[Union[NodeSpec, Mapping[str, Any]]],
+    delete: bool = True,
+) -> ReconcilePlan:
+    """Diff ``nodes`` against ``desired``, matching nodes by name.
+
+    With ``delete`` nodes that are not desired, and duplicates of a desired
+    name, are deleted.
+    """
+    specs: Dict[str, NodeSpec] = {}
+    for spec in desired:
+        if not isinstance(spec, NodeSpec):
+            spec = NodeSpec(**spec)
+        if spec.name in specs:
+            raise ValueError(f"Duplicate desired node name '{spec.name}'")
+        specs[spec.name] = spec
+
+    result = ReconcilePlan()
+    seen = set()
+    for node in nodes:
+        spec = specs.get(node.name)
+        if spec is None or node.name in seen:
+            if delete:
+                result.delete.append(node)
+            continue
+        seen.add(node.name)
+        changes = {
+            name: getattr(spec, name)
+            for name in _FIELDS
+            if getattr(node, name) != getattr(spec, name)
+        }
+        if changes:
+            result.update.append((node, changes))
+        else:
+            result.unchanged.append(node)
+    result.create = [spec for name, spec in specs.items() if name not in seen]
+    return result
+
+
+async def apply_plan(
+    grid: "Grid", plan: ReconcilePlan, concurrency: int = 20
+) -> ReconcileResult:
+    """Apply ``plan`` with at most ``concurrency`` requests at once."""
+    result = ReconcileResult(plan=plan)
+    started = time.perf_counter()
+
+    async def create(spec: NodeSpec) -> None:
+        try:
+            node = await grid.create_node(spec.name, spec.message, spec.capacity)
+            result.created.append(node)
+        except Exception as e:
+            result.errors.append(("create", spec.name, e))
+
+    async def update(node: Node, changes: Dict[str, Any]) -> None:
+        try:
+            result.updated.append(await node.update(**changes))
+        except Exception as e:
+            result.errors.append(("update", node.name, e))
+
+    async def delete(node: Node) -> None:
+        try:
+            await node.delete()
+            result.deleted.append(node)
+        except Exception as e:
+            result.errors.append(("delete", node.name, e))
+
+    await _gather_bounded(
+        concurrency,
+        [delete(node) for node in plan.delete]
+        + [update(node, changes) for node, changes in plan.update]
+        + [create(spec) for spec in plan.create],
+    )
+    result.elapsed = time.perf_counter() - started
+    for action, name, error in result.errors:
+        logger.warning(f"Failed to {action} node '{name}': {error}")
+    return result
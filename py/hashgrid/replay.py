@@ -0,0 +1,394 @@
+"""Record grid traffic to a log file and replay it offline.
+
+``RecordingTransport`` wraps the transport of a live client and appends every
+request and response (tick updates, recv batches, send statuses, ...) to a
+JSON lines log, gzip-compressed if the path ends with ``.gz``:
+
+    recorder = RecordingTransport("traffic.jsonl.gz")
+    grid = await Hashgrid.connect(api_key, transport=recorder)
+
+``ReplayTransport`` serves such a log back, so ``Grid.listen()`` sees the
+recorded ticks and ``Node.recv()`` the recorded messages, at the recorded
+pace, faster, or one tick per poll:
+
+    replay = ReplayTransport("traffic.jsonl.gz", speed=None)
+    grid = await Hashgrid.connect(transport=replay)
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple
+import asyncio
+import gzip
+import json
+import time
+
+import httpx
+
+from .compression import get_compressor
+
+_GRID_PATH = "/api/v1"
+_DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def read_log(path: str) -> Iterator[Dict[str, Any]]:
+    """Iterate over the entries of a traffic log, oldest first.
+
+    Each entry has ``t`` (wall clock time), ``ms`` (latency), ``method``,
+    ``path``, ``query``, ``tick`` (the grid tick at the time, if known),
+    ``status``, ``etag`` and the decoded JSON ``request`` and ``response``
+    bodies. A log cut short, e.g. by a crash while recording, is read up to
+    its last complete entry.
+    """
+    with _open(path, "r") as f:
+        try:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                if line.strip():
+                    yield json.loads(line)
+        except EOFError:
+            pass
+
+
+def _decode(content: bytes) -> Any:
+    if not content:
+        return None
+    try:
+        return json.loads(content)
+    except ValueError:
+        return content.decode("utf-8", "replace")
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Transport that appends the traffic of ``inner`` to a log at ``path``.
+
+    ``inner`` defaults to a regular HTTP transport. Responses are recorded
+    decoded, and tick events of a server-sent event stream are recorded as
+    ``GET /api/v1`` responses. The log is only appended to, so several
+    sessions can be recorded into one file.
+    """
+
+    def __init__(self, path: str, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.path = path
+        self.inner = inner if inner is not None else httpx.AsyncHTTPTransport()
+        self.tick: Optional[int] = None
+        self.entries = 0
+        self._file = None
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        """Append one entry to the log."""
+        if self._file is None:
+            self._file = _open(self.path, "a")
+        if entry["path"] == _GRID_PATH and isinstance(entry["response"], dict):
+            self.tick = entry["response"].get("tick", self.tick)
+        entry["tick"] = self.tick
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._file.flush()
+        self.entries += 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        content = await request.aread()
+        encoding = request.headers.get("Content-Encoding")
+        if content and encoding:
+            content = get_compressor(encoding).decompress(content)
+        entry = {
+            "t": time.time(),
+            "method": request.method,
+            "path": request.url.path.rstrip("/"),
+            "query": request.url.query.decode(),
+            "request": _decode(content),
+        }
+        started = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        headers = [
+            (name, value)
+            for name, value in response.headers.items()
+            if name.lower() not in _DROPPED_HEADERS
+        ]
+        if response.headers.get("Content-Type", "").startswith("text/event-stream"):
+            return httpx.Response(
+                response.status_code,
+                headers=headers,
+                stream=_EventRecorder(self, response, entry),
+                extensions=response.extensions,
+            )
+
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        entry["ms"] = round((time.perf_counter() - started) * 1000, 3)
+        entry["status"] = response.status_code
+        entry["etag"] = response.headers.get("ETag")
+        entry["response"] = _decode(body)
+        self.record(entry)
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=body,
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _EventRecorder(httpx.AsyncByteStream):
+    """Passes an event stream through, recording each event's data."""
+
+    def __init__(
+        self,
+        recorder: RecordingTransport,
+        response: httpx.Response,
+        entry: Dict[str, Any],
+    ):
+        self.recorder = recorder
+        self.response = response
+        self.entry = entry
+
+    async def __aiter__(self):
+        buffer = b""
+        async for chunk in self.response.aiter_bytes():
+            buffer += chunk
+            *events, buffer = buffer.replace(b"\r\n", b"\n").split(b"\n\n")
+            for event in events:
+                data = b"\n".join(
+                    line[5:].lstrip()
+                    for line in event.split(b"\n")
+                    if line.startswith(b"data:")
+                )
+                if data:
+                    self.recorder.record(
+                        {
+                            **self.entry,
+                            "t": time.time(),
+                            "ms": 0.0,
+                            "status": self.response.status_code,
+                            "etag": None,
+                            "response": _decode(data),
+                        }
+                    )
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self.response.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Transport that serves a log written by ``RecordingTransport``.
+
+    ``GET /api/v1`` reports the recorded ticks. With ``speed`` ticks follow
+    the recorded timeline ``speed`` times as fast, and other responses wait
+    their recorded latency divided by ``speed``. With ``speed=None`` there
+    are no delays and every long-poll for the current tick (as made by
+    ``Grid.listen()``) moves to the next tick, or call ``advance()``.
+
+    Each recv (single or bulk) returns the next batch recorded for that node
+    in the current tick, then empty lists. Sends are answered with a success
+    status for every reply to a message handed out by recv, so handlers
+    whose replies differ from the recorded ones replay the same way. Other
+    requests get the latest recorded response for the same method and path.
+    Event streams are refused, so clients fall back to polling.
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive or None")
+        self.path = path
+        self.speed = speed
+        # (recorded time, tick, grid name) of every tick change.
+        self.ticks: List[Tuple[float, int, str]] = []
+        self.position = 0
+        self.requests: Dict[str, int] = {}
+        self.replies = 0
+        self.successful_replies = 0
+        self._recv: Dict[Tuple[str, Optional[int]], Deque[Tuple[list, float]]] = {}
+        self._responses: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._delivered: Dict[str, Set[Tuple[str, int]]] = {}
+        self._started: Optional[float] = None
+        self._tick_changed: Optional[asyncio.Event] = None
+        self._load()
+
+    @property
+    def tick(self) -> int:
+        """The tick currently reported to clients."""
+        return self.ticks[self.position][1]
+
+    @property
+    def finished(self) -> bool:
+        """Whether the last recorded tick has been reached."""
+        return self.position >= len(self.ticks) - 1
+
+    def advance(self) -> int:
+        """Move to the next recorded tick, if any, and return the tick."""
+        if not self.finished:
+            self.position += 1
+            if self._tick_changed is not None:
+                self._tick_changed.set()
+                self._tick_changed = None
+        return self.tick
+
+    def _load(self) -> None:
+        for entry in read_log(self.path):
+            path, response = entry["path"], entry.get("response")
+            if entry["method"] == "GET" and path == _GRID_PATH:
+                if entry["status"] == 200 and isinstance(response, dict):
+                    if not self.ticks or self.ticks[-1][1] != response["tick"]:
+                        self.ticks.append(
+                            (entry["t"], response["tick"], response["name"])
+                        )
+                continue
+            if not 200 <= entry["status"] < 300:
+                continue
+            latency = entry.get("ms", 0.0) / 1000
+            parts = path.strip("/").split("/")
+            if parts[-1] == "recv" and isinstance(response, (list, dict)):
+                if len(parts) == 4:
+                    batches = list(response.items())
+                else:
+                    batches = [(parts[3], response)]
+                for node_id, messages in batches:
+                    key = (node_id, entry.get("tick"))
+                    self._recv.setdefault(key, deque()).append((messages, latency))
+            elif parts[-1] != "send":
+                self._responses.setdefault((entry["method"], path), []).append(entry)
+        if not self.ticks:
+            self.ticks.append((0.0, 0, "replay"))
+        # Recv batches recorded before the first tick was known.
+        first = self.ticks[0][1]
+        for (node_id, tick), batches in list(self._recv.items()):
+            if tick is None:
+                self._recv.setdefault((node_id, first), deque()).extendleft(
+                    reversed(batches)
+                )
+                del self._recv[(node_id, tick)]
+
+    def _sync_clock(self) -> None:
+        """Advance ticks that elapsed on the scaled recorded timeline."""
+        if self.speed is None:
+            return
+        now = time.monotonic()
+        if self._started is None:
+            self._started = now
+        elapsed = (now - self._started) * self.speed
+        origin = self.ticks[0][0]
+        while not self.finished:
+            if self.ticks[self.position + 1][0] - origin > elapsed:
+                break
+            self.advance()
+
+    async def _delay(self, latency: float) -> None:
+        if self.speed is not None and latency > 0:
+            await asyncio.sleep(latency / self.speed)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        content = await request.aread()
+        encoding = request.headers.get("Content-Encoding")
+        if content and encoding:
+            content = get_compressor(encoding).decompress(content)
+        path = request.url.path.rstrip("/")
+        key = f"{request.method} {path}"
+        self.requests[key] = self.requests.get(key, 0) + 1
+        self._sync_clock()
+
+        if path == _GRID_PATH and request.method == "GET":
+            return await self._grid(request)
+        parts = path.strip("/").split("/")
+        body = json.loads(content) if content else None
+        if parts[-1] == "recv" and len(parts) in (4, 5):
+            if len(parts) == 4:
+                return httpx.Response(
+                    200, json={i: await self._next_recv(i) for i in body["node_ids"]}
+                )
+            return httpx.Response(200, json=await self._next_recv(parts[3]))
+        if parts[-1] == "send" and len(parts) in (4, 5):
+            if len(parts) == 4:
+                return httpx.Response(
+                    200, json={i: self._send(i, replies) for i, replies in body.items()}
+                )
+            return httpx.Response(200, json=self._send(parts[3], body))
+        return await self._recorded(request, path)
+
+    async def _grid(self, request: httpx.Request) -> httpx.Response:
+        if "text/event-stream" in request.headers.get("Accept", ""):
+            return httpx.Response(406, json={"message": "Replay has no event stream"})
+        since_tick = request.url.params.get("since_tick")
+        wait = request.url.params.get("wait")
+        if since_tick is not None and int(since_tick) >= self.tick:
+            if self.speed is None and not self.finished:
+                self.advance()
+            elif wait is not None:
+                await self._wait_for_tick(int(since_tick), float(wait))
+        _, tick, name = self.ticks[self.position]
+        return httpx.Response(200, json={"name": name, "tick": tick})
+
+    async def _wait_for_tick(self, since_tick: int, wait: float) -> None:
+        """Hold a long-poll until the tick passes ``since_tick`` or ``wait``."""
+        deadline = time.monotonic() + wait
+        while self.tick <= since_tick:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if self.speed is not None and not self.finished:
+                next_at = self._started + (
+                    self.ticks[self.position + 1][0] - self.ticks[0][0]
+                ) / self.speed
+                remaining = min(remaining, max(0.0, next_at - time.monotonic()))
+            if self._tick_changed is None:
+                self._tick_changed = asyncio.Event()
+            try:
+                await asyncio.wait_for(self._tick_changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+            self._sync_clock()
+
+    async def _next_recv(self, node_id: str) -> list:
+        batches = self._recv.get((node_id, self.tick))
+        if not batches:
+            return []
+        messages, latency = batches.popleft()
+        await self._delay(latency)
+        delivered = self._delivered.setdefault(node_id, set())
+        delivered.update((m["peer_id"], m["round"]) for m in messages)
+        return messages
+
+    def _send(self, node_id: str, replies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        delivered = self._delivered.get(node_id, set())
+        statuses = []
+        for reply in replies:
+            key = (reply["peer_id"], reply["round"])
+            success = key in delivered
+            delivered.discard(key)
+            self.replies += 1
+            self.successful_replies += success
+            statuses.append(
+                {"peer_id": reply["peer_id"], "round": reply["round"], "success": success}
+            )
+        return statuses
+
+    async def _recorded(self, request: httpx.Request, path: str) -> httpx.Response:
+        entries = self._responses.get((request.method, path))
+        if not entries:
+            return httpx.Response(404, json={"message": "Not in the recording"})
+        entry = entries[0]
+        for candidate in reversed(entries):
+            if candidate.get("tick") is None or candidate["tick"] <= self.tick:
+                entry = candidate
+                break
+        await self._delay(entry.get("ms", 0.0) / 1000)
+        etag = entry.get("etag")
+        if etag is not None and request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        headers = {"ETag": etag} if etag is not None else {}
+        if entry["response"] is None:
+            return httpx.Response(entry["status"], headers=headers)
+        return httpx.Response(entry["status"], json=entry["response"], headers=headers)
@@ -1,17 +1,52 @@
 """Hashgrid API resources."""
 
-from dataclasses import dataclass
-from typing import Optional, List, AsyncIterator, TYPE_CHECKING
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Optional,
+    List,
+    Dict,
+    Deque,
+    Iterable,
+    Iterator,
+    Tuple,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Union,
+    TYPE_CHECKING,
+)
 import asyncio
+import inspect
 import logging
+import math
+import sys
+import time
+
+from .exceptions import HashgridAPIError
+from .tracing import span, tick_span
 
 if TYPE_CHECKING:
     from .client import Hashgrid
+    from .pipeline import TickPipeline
+    from .outbox import Outbox
+    from .reconcile import NodeSpec, ReconcilePlan, ReconcileResult
+    from .sharding import Shard
 
 logger = logging.getLogger(__name__)
 
+# Slotted dataclasses need Python 3.10+; older versions fall back to __dict__.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _intern(value):
+    """Intern IDs so repeated peer and node IDs share one string object."""
+    return sys.intern(value) if type(value) is str else value
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class User:
     """User resource."""
 
@@ -21,7 +56,7 @@ class User:
     quota_id: str
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Quota:
     """Quota resource."""
 
@@ -30,7 +65,7 @@ class Quota:
     capacity: int
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Edge:
     """Edge resource."""
 
@@ -41,8 +76,12 @@ class Edge:
     score: Optional[float]
     round: int
 
+    def __post_init__(self):
+        self.node_id = _intern(self.node_id)
+        self.peer_id = _intern(self.peer_id)
+
 
-@dataclass
+@dataclass(**_SLOTS)
 class Message:
     """Message resource."""
 
@@ -51,8 +90,11 @@ class Message:
     message: str = ""
     score: Optional[float] = None
 
+    def __post_init__(self):
+        self.peer_id = _intern(self.peer_id)
+
 
-@dataclass
+@dataclass(**_SLOTS)
 class Status:
     """Status resource."""
 
@@ -60,43 +102,335 @@ class Status:
     round: int
     success: bool
 
+    def __post_init__(self):
+        self.peer_id = _intern(self.peer_id)
+
+
+@dataclass(**_SLOTS)
+class TickResult:
+    """Result of processing a single node during a tick."""
+
+    node: "Node"
+    messages: List[Message] = field(default_factory=list)
+    replies: List[Message] = field(default_factory=list)
+    statuses: List[Status] = field(default_factory=list)
+    error: Optional[BaseException] = None
+    recv_time: float = 0.0
+    handler_time: float = 0.0
+    send_time: float = 0.0
+    deadline: Optional[float] = None
+    deadline_missed: bool = False
+
+    @property
+    def total_time(self) -> float:
+        """Total wall time spent on this node, in seconds."""
+        return self.recv_time + self.handler_time + self.send_time
+
+
+Handler = Callable[
+    ["Node", List[Message]], Union[List[Message], Awaitable[List[Message]]]
+]
+# Replaces a handler's replies when it misses its deadline.
+Fallback = Handler
+
+
+class TickClock:
+    """Estimates the tick cadence from observed tick changes."""
+
+    def __init__(self, window: int = 8):
+        self._observations: Deque[Tuple[int, float]] = deque(maxlen=window + 1)
+
+    def observe(self, tick: int, at: Optional[float] = None) -> None:
+        """Record that ``tick`` started at monotonic time ``at`` (default now)."""
+        if self._observations and tick <= self._observations[-1][0]:
+            return
+        self._observations.append((tick, time.monotonic() if at is None else at))
+
+    @property
+    def interval(self) -> Optional[float]:
+        """Median seconds per tick, or None until two ticks were observed."""
+        obs = list(self._observations)
+        intervals = sorted(
+            (t2 - t1) / (k2 - k1) for (k1, t1), (k2, t2) in zip(obs, obs[1:])
+        )
+        if not intervals:
+            return None
+        return intervals[len(intervals) // 2]
+
+    @property
+    def last_tick_at(self) -> Optional[float]:
+        """Monotonic time at which the latest tick was observed."""
+        return self._observations[-1][1] if self._observations else None
+
+    def tick_start(self, tick: int) -> Optional[float]:
+        """Expected monotonic start time of ``tick``, from the observed cadence."""
+        interval = self.interval
+        if interval is None:
+            return None
+        last_tick, last_at = self._observations[-1]
+        return last_at + (tick - last_tick) * interval
+
+    @property
+    def next_tick_at(self) -> Optional[float]:
+        """Expected monotonic time of the next tick."""
+        interval = self.interval
+        if interval is None:
+            return None
+        return self._observations[-1][1] + interval
+
+    def time_until_next_tick(self) -> Optional[float]:
+        """Seconds until the expected next tick (negative when overdue)."""
+        next_tick_at = self.next_tick_at
+        if next_tick_at is None:
+            return None
+        return next_tick_at - time.monotonic()
+
+    def poll_delay(self, poll_interval: float, min_poll_interval: float) -> float:
+        """Return how long to wait before polling for the next tick.
+
+        Sleeps until the expected next tick, then polls every
+        ``min_poll_interval`` seconds, backing off towards ``poll_interval``
+        the longer the tick is overdue.
+        """
+        remaining = self.time_until_next_tick()
+        if remaining is None:
+            return poll_interval
+        if remaining > min_poll_interval:
+            return min(poll_interval, remaining)
+        return min(poll_interval, max(min_poll_interval, -remaining))
+
+
+class NodeRegistry:
+    """Cache of the user's nodes keyed by node ID.
+
+    The node list is revalidated with ``If-None-Match`` once it is older than
+    ``ttl`` seconds (``0`` revalidates on every access). Nodes are updated in
+    place, so ``Node`` objects stay valid across refreshes.
+    """
+
+    def __init__(self, client: "Hashgrid", ttl: float = 0.0):
+        self.ttl = ttl
+        self.etag: Optional[str] = None
+        self.fetched_at: Optional[float] = None
+        self._client = client
+        self._nodes: Dict[str, "Node"] = {}
+        self._names: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __iter__(self) -> Iterator["Node"]:
+        return iter(list(self._nodes.values()))
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._nodes
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the node list was fetched at least once."""
+        return self.fetched_at is not None
+
+    def is_fresh(self) -> bool:
+        """Whether the cached node list is younger than ``ttl``."""
+        return self.loaded and time.monotonic() - self.fetched_at < self.ttl
+
+    def get(self, node_id: str) -> Optional["Node"]:
+        """Return the cached node with ``node_id``, if any."""
+        return self._nodes.get(node_id)
+
+    def by_name(self, name: str) -> Optional["Node"]:
+        """Return the cached node named ``name``, if any."""
+        node_id = self._names.get(name)
+        return self._nodes.get(node_id) if node_id is not None else None
+
+    async def refresh(self, force: bool = False) -> None:
+        """Fetch the node list, skipping the download if it did not change."""
+        headers = {}
+        if self.etag and not force:
+            headers["If-None-Match"] = self.etag
+        response = await self._client._send("GET", "/api/v1/node", headers=headers)
+        if response.status_code == 304:
+            self.fetched_at = time.monotonic()
+            return
+        data = await self._client._handle_response(response)
+        self.etag = response.headers.get("ETag")
+        self.fetched_at = time.monotonic()
+
+        seen = set()
+        for item in data:
+            seen.add(self.upsert(item).node_id)
+        for node_id in list(self._nodes):
+            if node_id not in seen:
+                self.remove(node_id)
+
+    def upsert(self, item: dict) -> "Node":
+        """Add a node from an API payload, updating a cached one in place."""
+        node = self._nodes.get(item["node_id"])
+        if node is None:
+            node = Node(**item, client=self._client, registry=self)
+            self._nodes[node.node_id] = node
+        else:
+            old_name = node.name
+            for key in ("owner_id", "name", "message", "capacity"):
+                if key in item:
+                    setattr(node, key, item[key])
+            self.rename(node, old_name)
+        self._names[node.name] = node.node_id
+        return node
+
+    def rename(self, node: "Node", old_name: str) -> None:
+        """Update the name index after ``node`` was renamed."""
+        if old_name != node.name and self._names.get(old_name) == node.node_id:
+            del self._names[old_name]
+        if node.node_id in self._nodes:
+            self._names[node.name] = node.node_id
+
+    def remove(self, node_id: str) -> None:
+        """Drop a node from the cache."""
+        node = self._nodes.pop(node_id, None)
+        if node is not None and self._names.get(node.name) == node_id:
+            del self._names[node.name]
+
 
 class Grid:
     """Grid resource with methods."""
 
+    __slots__ = (
+        "name",
+        "tick",
+        "clock",
+        "registry",
+        "_client",
+        "_stream_supported",
+        "_long_poll_supported",
+        "_bulk_recv_supported",
+        "_bulk_send_supported",
+    )
+
     def __init__(self, name: str, tick: int, client: "Hashgrid"):
         self.name = name
         self.tick = tick
+        self.clock = TickClock()
+        self.registry = NodeRegistry(client)
         self._client = client
+        self._stream_supported: Optional[bool] = None
+        self._long_poll_supported: Optional[bool] = None
+        self._bulk_recv_supported: Optional[bool] = None
+        self._bulk_send_supported: Optional[bool] = None
+
+    async def listen(
+        self,
+        poll_interval: float = 30.0,
+        stream: bool = True,
+        long_poll: bool = True,
+        adaptive: bool = True,
+        min_poll_interval: float = 1.0,
+    ) -> AsyncIterator[int]:
+        """Listen for tick updates. Yields when the tick changes.
 
-    async def listen(self, poll_interval: float = 30.0) -> AsyncIterator[int]:
-        """Listen for tick updates. Yields when the tick changes."""
+        With ``stream`` the grid is asked for a server-sent event stream of
+        tick updates. If the server does not support it, the grid is polled
+        instead: with ``long_poll`` the request carries ``since_tick`` and
+        ``wait`` so a supporting server can hold it until the next tick, and
+        with ``adaptive`` the poll delay follows the observed tick cadence.
+        """
         logger.info(f"Starting to listen for ticks on grid '{self.name}'")
         last_tick = -1
+        errors = 0
         while True:
+            streaming = stream and self._stream_supported is not False
             try:
-                data = await self._client._request("GET", "/api/v1")
-                self.name = data["name"]
-                self.tick = data["tick"]
-                current_tick = self.tick
+                if streaming:
+                    async for data in self._client._stream("/api/v1"):
+                        self._stream_supported = True
+                        errors = 0
+                        current_tick = self._update_tick(data)
+                        if current_tick != last_tick:
+                            logger.info(f"Tick updated: {last_tick} -> {current_tick}")
+                            yield current_tick
+                            last_tick = current_tick
+                    await asyncio.sleep(min_poll_interval)
+                    continue
+
+                params = None
+                timeout = None
+                if long_poll and last_tick >= 0:
+                    params = {"since_tick": last_tick, "wait": poll_interval}
+                    timeout = self._client.timeout + poll_interval
+                started = time.monotonic()
+                data = await self._client._request(
+                    "GET", "/api/v1", params=params, timeout=timeout
+                )
+                elapsed = time.monotonic() - started
+                errors = 0
+                current_tick = self._update_tick(data)
+                if params is not None and current_tick == last_tick:
+                    # A long-polling server holds the request until the tick
+                    # changes or ``wait`` expires; others answer right away.
+                    self._long_poll_supported = elapsed >= poll_interval / 2
 
                 if current_tick != last_tick:
                     logger.info(f"Tick updated: {last_tick} -> {current_tick}")
                     yield current_tick
                     last_tick = current_tick
 
-                await asyncio.sleep(poll_interval)
+                if long_poll and self._long_poll_supported is not False:
+                    continue
+                delay = poll_interval
+                if adaptive:
+                    delay = self.clock.poll_delay(poll_interval, min_poll_interval)
+                await asyncio.sleep(max(0.0, delay - elapsed))
             except Exception as e:
+                if (
+                    streaming
+                    and not self._stream_supported
+                    and isinstance(e, HashgridAPIError)
+                    and e.status_code in (404, 405, 406, 501)
+                ):
+                    logger.info("Tick streaming not supported, falling back to polling")
+                    self._stream_supported = False
+                    continue
+                errors += 1
                 logger.warning(f"Error while listening for ticks: {e}")
-                await asyncio.sleep(poll_interval * 2)
+                await asyncio.sleep(
+                    min(poll_interval * 2, min_poll_interval * 2**errors)
+                )
 
-    async def nodes(self) -> AsyncIterator["Node"]:
-        """Iterate over all nodes owned by the authenticated user."""
-        data = await self._client._request("GET", "/api/v1/node")
-        for item in data:
-            node = Node(**item, client=self._client)
+    async def refresh(self) -> int:
+        """Fetch the grid's name and current tick, and return the tick."""
+        return self._update_tick(await self._client._request("GET", "/api/v1"))
+
+    def _update_tick(self, data: dict) -> int:
+        """Update name and tick from a grid payload and return the tick."""
+        self.name = data["name"]
+        self.tick = data["tick"]
+        self.clock.observe(self.tick)
+        return self.tick
+
+    async def nodes(self, refresh: bool = False) -> AsyncIterator["Node"]:
+        """Iterate over all nodes owned by the authenticated user.
+
+        Nodes come from ``registry``, which is revalidated first unless it is
+        younger than ``registry.ttl``. Pass ``refresh=True`` to force a full
+        download.
+        """
+        if refresh or not self.registry.is_fresh():
+            await self.registry.refresh(force=refresh)
+        for node in self.registry:
             yield node
 
+    async def get_node(self, node_id: str) -> Optional["Node"]:
+        """Return the node with ``node_id``, or None if it does not exist."""
+        if not self.registry.loaded:
+            await self.registry.refresh()
+        return self.registry.get(node_id)
+
+    async def get_node_by_name(self, name: str) -> Optional["Node"]:
+        """Return the node named ``name``, or None if it does not exist."""
+        if not self.registry.loaded:
+            await self.registry.refresh()
+        return self.registry.by_name(name)
+
     async def create_node(
         self, name: str, message: str = "", capacity: int = 100
     ) -> "Node":
@@ -104,12 +438,584 @@ class Grid:
         json_data = {"name": name, "message": message, "capacity": capacity}
         data = await self._client._request("POST", "/api/v1/node", json_data=json_data)
         logger.info(f"Created node '{name}' (ID: {data['node_id']})")
-        return Node(**data, client=self._client)
+        return self.registry.upsert(data)
+
+    async def plan(
+        self,
+        desired: Iterable[Union["NodeSpec", Dict[str, Any]]],
+        delete: bool = True,
+    ) -> "ReconcilePlan":
+        """Diff ``desired`` node specs against the grid's current nodes.
+
+        Nodes are matched by name; see ``reconcile()``.
+        """
+        from .reconcile import plan_nodes
+
+        nodes = [node async for node in self.nodes(refresh=True)]
+        return plan_nodes(nodes, desired, delete)
+
+    async def reconcile(
+        self,
+        desired: Iterable[Union["NodeSpec", Dict[str, Any]]],
+        concurrency: int = 20,
+        delete: bool = True,
+        dry_run: bool = False,
+    ) -> "ReconcileResult":
+        """Create, update and delete nodes until they match ``desired``.
+
+        ``desired`` holds ``NodeSpec`` objects or dicts with ``name``,
+        ``message`` and ``capacity``. Nodes are matched by name; only changed
+        fields are updated and unchanged nodes are left alone. With
+        ``delete`` nodes not in ``desired`` are deleted. Changes run with at
+        most ``concurrency`` requests at once, and failures are collected in
+        ``ReconcileResult.errors``. With ``dry_run`` only the plan is made.
+        """
+        from .reconcile import ReconcileResult, apply_plan
+
+        started = time.perf_counter()
+        plan = await self.plan(desired, delete)
+        logger.info(f"Reconcile plan: {str(plan).splitlines()[0]}")
+        if dry_run or plan.empty:
+            return ReconcileResult(plan=plan, elapsed=time.perf_counter() - started)
+        result = await apply_plan(self, plan, concurrency)
+        result.elapsed = time.perf_counter() - started
+        logger.info(
+            f"Reconciled {len(result.created)} created, {len(result.updated)} "
+            f"updated, {len(result.deleted)} deleted in {result.elapsed:.3f}s "
+            f"({len(result.errors)} failed)"
+        )
+        return result
+
+    async def recv_all(
+        self, node_ids: Iterable[str], concurrency: int = 10
+    ) -> Dict[str, List[Message]]:
+        """Receive messages for many nodes at once.
+
+        Uses the bulk recv endpoint when the server supports it, otherwise
+        falls back to concurrent per-node requests.
+        """
+        node_ids = list(node_ids)
+        if not node_ids:
+            return {}
+        with span("recv_all", "grid", nodes=len(node_ids)) as trace:
+            inbox = await self._recv_all(node_ids, concurrency)
+            trace.set(messages=sum(len(msgs) for msgs in inbox.values()))
+        return inbox
+
+    async def _recv_all(
+        self, node_ids: List[str], concurrency: int
+    ) -> Dict[str, List[Message]]:
+        if self._bulk_recv_supported is not False:
+            try:
+                data = await self._client._request(
+                    "POST",
+                    "/api/v1/node/recv",
+                    json_data={"node_ids": node_ids},
+                    idempotent=True,
+                    model=Message,
+                    keyed=True,
+                )
+                self._bulk_recv_supported = True
+                return {node_id: data.get(node_id, []) for node_id in node_ids}
+            except HashgridAPIError as e:
+                if not self._bulk_unsupported(e, "recv"):
+                    raise
+
+        async def recv(node_id: str) -> List[Message]:
+            return await self._client._request(
+                "GET", f"/api/v1/node/{node_id}/recv", model=Message
+            )
+
+        results = await _gather_bounded(concurrency, [recv(i) for i in node_ids])
+        return dict(zip(node_ids, results))
+
+    async def send_all(
+        self,
+        replies: Dict[str, List[Message]],
+        concurrency: int = 10,
+    ) -> Dict[str, List[Status]]:
+        """Send replies for many nodes at once, keyed by node ID.
+
+        Uses the bulk send endpoint when the server supports it, otherwise
+        falls back to concurrent per-node requests.
+        """
+        replies = {node_id: msgs for node_id, msgs in replies.items() if msgs}
+        if not replies:
+            return {}
+        total = sum(len(msgs) for msgs in replies.values())
+        with span("send_all", "grid", nodes=len(replies), replies=total) as trace:
+            statuses = await self._send_all(replies, concurrency)
+            trace.set(
+                successful=sum(s.success for ss in statuses.values() for s in ss)
+            )
+        return statuses
+
+    async def _send_all(
+        self, replies: Dict[str, List[Message]], concurrency: int
+    ) -> Dict[str, List[Status]]:
+        if self._bulk_send_supported is not False:
+            try:
+                return await self._send_bulk(replies)
+            except HashgridAPIError as e:
+                if not self._bulk_unsupported(e, "send"):
+                    raise
+
+        results = await _gather_bounded(
+            concurrency,
+            [
+                _send_replies(self._client, node_id, msgs)
+                for node_id, msgs in replies.items()
+            ],
+        )
+        return dict(zip(replies, results))
+
+    async def _send_bulk(
+        self, replies: Dict[str, List[Message]]
+    ) -> Dict[str, List[Status]]:
+        """Send replies with the bulk endpoint, in chunks within the size limits."""
+        client = self._client
+        chunks = _chunk_replies(
+            [(node_id, msg) for node_id, msgs in replies.items() for msg in msgs],
+            client.max_send_items,
+            client.max_send_bytes,
+        )
+
+        async def post(chunk: List[Tuple[str, Message]]) -> Dict[str, Any]:
+            json_data: Dict[str, List[dict]] = {}
+            for node_id, msg in chunk:
+                json_data.setdefault(node_id, []).append(_message_to_dict(msg))
+            return await client._request(
+                "POST", "/api/v1/node/send", json_data=json_data
+            )
+
+        results = []
+        if self._bulk_send_supported is None:
+            # Probe with one chunk so an unsupported endpoint fails only once.
+            results.append(await post(chunks.pop(0)))
+            self._bulk_send_supported = True
+        results += await _gather_bounded(
+            client.send_concurrency, [post(chunk) for chunk in chunks]
+        )
+        return {
+            node_id: _merge_statuses(
+                msgs,
+                [Status(**item) for data in results for item in data.get(node_id, [])],
+            )
+            for node_id, msgs in replies.items()
+        }
+
+    def _bulk_unsupported(self, error: HashgridAPIError, operation: str) -> bool:
+        """Remember that the bulk ``operation`` (``recv`` or ``send``) endpoint
+        is unavailable if ``error`` says so."""
+        flag = f"_bulk_{operation}_supported"
+        if getattr(self, flag) or error.status_code not in (404, 405, 501):
+            return False
+        logger.info(f"Bulk {operation} not supported, falling back to per-node calls")
+        setattr(self, flag, False)
+        return True
+
+    def tick_deadline(self, margin: float = 1.0) -> Optional[float]:
+        """Monotonic time by which replies for the current tick must be sent.
+
+        This is the expected start of the next tick (from ``clock``) minus
+        ``margin`` seconds, or None while the tick cadence is unknown.
+        """
+        next_tick_at = self.clock.next_tick_at
+        if next_tick_at is None:
+            return None
+        return next_tick_at - margin
+
+    def round_deadline(self, round: int, margin: float = 1.0) -> Optional[float]:
+        """Monotonic time by which replies for ``round`` must be sent.
+
+        A round closes when the next tick starts, so this is the expected
+        start of tick ``round + 1`` (from ``clock``) minus ``margin`` seconds,
+        or None while the tick cadence is unknown.
+        """
+        closes_at = self.clock.tick_start(round + 1)
+        if closes_at is None:
+            return None
+        return closes_at - margin
+
+    def _reply_deadline(
+        self, messages: List[Message], margin: Optional[float]
+    ) -> Optional[float]:
+        """Deadline for replying to ``messages``: that of their earliest round."""
+        if margin is None or not messages:
+            return None
+        return self.round_deadline(min(m.round for m in messages), margin)
+
+    async def _observe_tick(self) -> None:
+        """Fetch the current tick so ``clock`` learns the cadence."""
+        await self.refresh()
+        if self.clock.interval is None:
+            logger.warning("Tick cadence not known yet, processing without deadlines")
+
+    async def process_tick(
+        self,
+        handler: Handler,
+        concurrency: int = 10,
+        batch: bool = False,
+        deadline_margin: Optional[float] = None,
+        fallback: Optional[Fallback] = None,
+        executor: Optional[Executor] = None,
+        chunk_size: Optional[int] = None,
+        shard: Optional["Shard"] = None,
+        outbox: Optional["Outbox"] = None,
+    ) -> List[TickResult]:
+        """Run recv -> handler -> send for every node concurrently.
+
+        The node list is fetched once, then at most ``concurrency`` nodes are
+        processed at the same time. ``handler(node, messages)`` returns the
+        replies to send and may be a plain function or a coroutine function.
+        Errors are captured per node in ``TickResult.error``.
+
+        With ``batch`` all nodes are received with one ``recv_all`` call and
+        all replies are sent with one ``send_all`` call.
+
+        With ``deadline_margin`` the current tick is fetched first, so
+        ``clock`` learns the cadence even without ``listen()`` (there are no
+        deadlines until two ticks were seen). Each node's deadline is
+        ``round_deadline(round, deadline_margin)`` for the earliest round of
+        its messages. A handler still running at its deadline is cancelled,
+        and a handler that missed it has its replies replaced by
+        ``fallback(node, messages)`` (or dropped without a fallback). Such
+        nodes have ``TickResult.deadline_missed`` set. With ``batch`` the
+        handlers run earliest deadline first; otherwise each node's deadline
+        is only known after its own recv.
+
+        With ``executor`` (e.g. a ``ProcessPoolExecutor``) the handler runs in
+        the executor instead of on the event loop, see ``executor_handler``.
+
+        With ``shard`` (e.g. a ``ShardCoordinator``) only the nodes for which
+        ``shard.owns(node_id)`` is true are processed.
+
+        With ``outbox`` replies are sent through the ``Outbox``, which skips
+        replies that were already acknowledged and resends unacknowledged
+        ones.
+
+        If the client has a ``tracer``, the tick is traced (see ``Tracer``).
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if executor is not None:
+            handler = executor_handler(handler, executor, chunk_size)
+        if deadline_margin is not None:
+            await self._observe_tick()
+        with tick_span(self._client.tracer, self.tick) as tick:
+            with span("nodes", "grid") as trace:
+                nodes = [
+                    node
+                    async for node in self.nodes()
+                    if shard is None or shard.owns(node.node_id)
+                ]
+                trace.set(nodes=len(nodes))
+            started = time.perf_counter()
+            if batch:
+                results = await self._process_batch(
+                    nodes, handler, concurrency, deadline_margin, fallback, outbox
+                )
+            else:
+                results = await _gather_bounded(
+                    concurrency,
+                    [
+                        self._process_node(
+                            node, handler, deadline_margin, fallback, outbox
+                        )
+                        for node in nodes
+                    ],
+                )
+            failed = sum(1 for r in results if r.error is not None)
+            missed = sum(1 for r in results if r.deadline_missed)
+            logger.info(
+                f"Processed {len(results)} node(s) in "
+                f"{time.perf_counter() - started:.3f}s ({failed} failed, "
+                f"{missed} missed deadline)"
+            )
+            tick.set(nodes=len(results), failed=failed, missed=missed)
+        return list(results)
+
+    def pipeline(self, handler: Handler, **kwargs) -> "TickPipeline":
+        """Create a ``TickPipeline`` running ``handler`` on this grid's nodes."""
+        from .pipeline import TickPipeline
+
+        return TickPipeline(self, handler, **kwargs)
+
+    async def _process_node(
+        self,
+        node: "Node",
+        handler: Handler,
+        deadline_margin: Optional[float] = None,
+        fallback: Optional[Fallback] = None,
+        outbox: Optional["Outbox"] = None,
+    ) -> TickResult:
+        """Process a single node: recv, run the handler, send the replies."""
+        result = TickResult(node=node)
+        with span("node", node_id=node.node_id):
+            try:
+                started = time.perf_counter()
+                result.messages = await node.recv()
+                result.recv_time = time.perf_counter() - started
+                if not result.messages:
+                    return result
+
+                result.deadline = self._reply_deadline(result.messages, deadline_margin)
+                await _run_handler(handler, result, fallback)
+                if not result.replies:
+                    return result
+
+                started = time.perf_counter()
+                if outbox is not None:
+                    result.statuses = await outbox.send(node, result.replies)
+                else:
+                    result.statuses = await node.send(result.replies)
+                result.send_time = time.perf_counter() - started
+            except Exception as e:
+                logger.warning(f"Error while processing node '{node.name}': {e}")
+                result.error = e
+        return result
+
+    async def _process_batch(
+        self,
+        nodes: List["Node"],
+        handler: Handler,
+        concurrency: int,
+        deadline_margin: Optional[float] = None,
+        fallback: Optional[Fallback] = None,
+        outbox: Optional["Outbox"] = None,
+    ) -> List[TickResult]:
+        """Process all nodes with one bulk recv and one bulk send."""
+        results = [TickResult(node=node) for node in nodes]
+        try:
+            started = time.perf_counter()
+            inbox = await self.recv_all([n.node_id for n in nodes], concurrency)
+            recv_time = time.perf_counter() - started
+        except Exception as e:
+            logger.warning(f"Error while receiving messages: {e}")
+            for result in results:
+                result.error = e
+            return results
+
+        for result in results:
+            result.messages = inbox.get(result.node.node_id, [])
+            result.recv_time = recv_time
+            result.deadline = self._reply_deadline(result.messages, deadline_margin)
+
+        async def run(result: TickResult) -> None:
+            if not result.messages:
+                return
+            try:
+                await _run_handler(handler, result, fallback)
+            except Exception as e:
+                logger.warning(f"Error while processing node '{result.node.name}': {e}")
+                result.error = e
+
+        # Earliest deadline first; nodes without one go last.
+        by_deadline = sorted(results, key=_deadline_key)
+        await _gather_bounded(concurrency, [run(result) for result in by_deadline])
+
+        pending = [r for r in results if r.replies and r.error is None]
+        try:
+            started = time.perf_counter()
+            replies = {r.node.node_id: r.replies for r in pending}
+            if outbox is not None:
+                statuses = await outbox.send_all(self, replies, concurrency)
+            else:
+                statuses = await self.send_all(replies, concurrency)
+            send_time = time.perf_counter() - started
+        except Exception as e:
+            logger.warning(f"Error while sending replies: {e}")
+            for result in pending:
+                result.error = e
+            return results
+        for result in pending:
+            result.statuses = statuses.get(result.node.node_id, [])
+            result.send_time = send_time
+        return results
+
+
+def _run_chunk(handler: Handler, node: "Node", messages: List[Message]):
+    """Run a sync handler on one chunk of messages inside an executor."""
+    return list(handler(node, messages) or [])
+
+
+def executor_handler(
+    handler: Handler, executor: Executor, chunk_size: Optional[int] = None
+) -> Handler:
+    """Wrap a sync handler so it runs in ``executor``.
+
+    The handler, the node and the messages are pickled when ``executor`` is a
+    ``ProcessPoolExecutor``: the handler must be a module-level function and
+    receives a detached ``Node`` that cannot make requests. With
+    ``chunk_size`` a node's messages are split into chunks of at most that
+    many messages, processed in parallel, and the replies concatenated in
+    order.
+    """
+
+    async def run(node: "Node", messages: List[Message]) -> List[Message]:
+        loop = asyncio.get_running_loop()
+        size = chunk_size or len(messages) or 1
+        chunks = [messages[i : i + size] for i in range(0, len(messages), size)]
+        replies = await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, _run_chunk, handler, node, chunk)
+                for chunk in chunks
+            )
+        )
+        return [reply for chunk in replies for reply in chunk]
+
+    return run
+
+
+async def _call_handler(handler: Handler, node: "Node", messages: List[Message]):
+    """Call a sync or async handler and return its replies."""
+    replies = handler(node, messages)
+    if inspect.isawaitable(replies):
+        replies = await replies
+    return list(replies or [])
+
+
+async def _run_handler(
+    handler: Handler, result: TickResult, fallback: Optional[Fallback] = None
+) -> None:
+    """Call ``handler`` on the result's messages and store the replies.
+
+    If ``result.deadline`` is set, the handler is cancelled at the deadline
+    and replies produced after it are replaced by ``fallback``.
+    """
+    with span(
+        "handler", node_id=result.node.node_id, messages=len(result.messages)
+    ) as trace:
+        started = time.perf_counter()
+        deadline = result.deadline
+        if deadline is None:
+            result.replies = await _call_handler(handler, result.node, result.messages)
+        else:
+            try:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                result.replies = await asyncio.wait_for(
+                    _call_handler(handler, result.node, result.messages), remaining
+                )
+                # Sync handlers cannot be interrupted, so check after they return.
+                if time.monotonic() > deadline:
+                    raise asyncio.TimeoutError
+            except asyncio.TimeoutError:
+                result.deadline_missed = True
+                result.replies = []
+                if fallback is not None:
+                    result.replies = await _call_handler(
+                        fallback, result.node, result.messages
+                    )
+        result.handler_time = time.perf_counter() - started
+        trace.set(replies=len(result.replies), deadline_missed=result.deadline_missed)
+
+
+def _deadline_key(result: TickResult) -> float:
+    """Sort key putting results with earlier deadlines first."""
+    return math.inf if result.deadline is None else result.deadline
+
+
+async def _gather_bounded(concurrency: int, coros: List[Awaitable]) -> List:
+    """Await ``coros`` with at most ``concurrency`` running at once."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(coro: Awaitable):
+        async with semaphore:
+            return await coro
+
+    return list(await asyncio.gather(*(run(coro) for coro in coros)))
+
+
+# Approximate JSON bytes per reply on top of its message and peer ID.
+_REPLY_OVERHEAD = 64
+
+
+def _reply_size(msg: Message) -> int:
+    return len(msg.message.encode("utf-8")) + len(msg.peer_id) + _REPLY_OVERHEAD
+
+
+def _chunk_replies(
+    replies: List[Any], max_items: Optional[int], max_bytes: Optional[int]
+) -> List[List[Any]]:
+    """Split replies (or ``(node_id, reply)`` pairs) into request-sized chunks.
+
+    Sizes are estimated from the message text, so the encoded chunks may be
+    somewhat larger or smaller than ``max_bytes``. A single reply larger than
+    ``max_bytes`` gets a chunk of its own.
+    """
+    chunks: List[List[Any]] = []
+    chunk: List[Any] = []
+    size = 0
+    for item in replies:
+        item_size = _reply_size(item[1] if isinstance(item, tuple) else item)
+        if chunk and (
+            (max_items is not None and len(chunk) >= max_items)
+            or (max_bytes is not None and size + item_size > max_bytes)
+        ):
+            chunks.append(chunk)
+            chunk = []
+            size = 0
+        chunk.append(item)
+        size += item_size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _merge_statuses(replies: List[Message], statuses: List[Status]) -> List[Status]:
+    """Order statuses of chunked sends like the replies they answer."""
+    order = {(msg.peer_id, msg.round): i for i, msg in enumerate(replies)}
+    last = len(order)
+    return sorted(statuses, key=lambda s: order.get((s.peer_id, s.round), last))
+
+
+async def _send_replies(
+    client: "Hashgrid", node_id: str, replies: List[Message]
+) -> List[Status]:
+    """Send one node's replies in chunks within the client's size limits."""
+    chunks = _chunk_replies(replies, client.max_send_items, client.max_send_bytes)
+
+    async def post(chunk: List[Message]) -> List[Status]:
+        return await client._request(
+            "POST",
+            f"/api/v1/node/{node_id}/send",
+            json_data=[_message_to_dict(msg) for msg in chunk],
+            model=Status,
+        )
+
+    if len(chunks) <= 1:
+        return await post(chunks[0] if chunks else [])
+    results = await _gather_bounded(
+        client.send_concurrency, [post(chunk) for chunk in chunks]
+    )
+    return _merge_statuses(replies, [status for chunk in results for status in chunk])
+
+
+def _message_to_dict(msg: Message) -> dict:
+    """Serialize a reply for the send endpoints."""
+    return {
+        "peer_id": msg.peer_id,
+        "message": msg.message,
+        "round": msg.round,
+        **({"score": msg.score} if msg.score is not None else {}),
+    }
 
 
 class Node:
     """Node resource with recv/send methods."""
 
+    __slots__ = (
+        "node_id",
+        "owner_id",
+        "name",
+        "message",
+        "capacity",
+        "_client",
+        "_registry",
+    )
+
     def __init__(
         self,
         node_id: str,
@@ -118,18 +1024,39 @@ class Node:
         message: str,
         capacity: int,
         client: "Hashgrid",
+        registry: Optional[NodeRegistry] = None,
     ):
-        self.node_id = node_id
+        self.node_id = _intern(node_id)
         self.owner_id = owner_id
         self.name = name
         self.message = message
         self.capacity = capacity
         self._client = client
+        self._registry = registry
+
+    def __getstate__(self):
+        """Pickle the node's fields only, e.g. for process pool handlers."""
+        return {
+            "node_id": self.node_id,
+            "owner_id": self.owner_id,
+            "name": self.name,
+            "message": self.message,
+            "capacity": self.capacity,
+        }
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            setattr(self, key, value)
+        self._client = None
+        self._registry = None
 
     async def recv(self) -> List[Message]:
         """Get peers waiting for a response."""
-        data = await self._client._request("GET", f"/api/v1/node/{self.node_id}/recv")
-        messages = [Message(**item) for item in data]
+        with span("recv", node_id=self.node_id) as trace:
+            messages = await self._client._request(
+                "GET", f"/api/v1/node/{self.node_id}/recv", model=Message
+            )
+            trace.set(messages=len(messages))
         if messages:
             logger.info(
                 f"Node '{self.name}' received {len(messages)} message(s) from peers"
@@ -137,29 +1064,31 @@ class Node:
         return messages
 
     async def send(self, replies: List[Message]) -> List[Status]:
-        """Send replies to peers."""
+        """Send replies to peers.
+
+        Replies beyond the client's ``max_send_bytes``/``max_send_items`` are
+        sent in several concurrent requests and the statuses returned in the
+        order of ``replies``.
+        """
         logger.info(
             f"Node '{self.name}' sending {len(replies)} reply/replies to peer(s)"
         )
-        json_data = [
-            {
-                "peer_id": msg.peer_id,
-                "message": msg.message,
-                "round": msg.round,
-                **({"score": msg.score} if msg.score is not None else {}),
-            }
-            for msg in replies
-        ]
-        data = await self._client._request(
-            "POST", f"/api/v1/node/{self.node_id}/send", json_data=json_data
-        )
-        statuses = [Status(**item) for item in data]
-        successful = sum(1 for s in statuses if s.success)
+        with span("send", node_id=self.node_id, replies=len(replies)) as trace:
+            statuses = await _send_replies(self._client, self.node_id, replies)
+            successful = sum(1 for s in statuses if s.success)
+            trace.set(successful=successful)
         logger.info(
             f"Node '{self.name}' sent {successful}/{len(statuses)} reply/replies successfully"
         )
         return statuses
 
+    async def edges(self, after_round: Optional[int] = None) -> List[Edge]:
+        """Get this node's edges, optionally only those after ``after_round``."""
+        params = {"after_round": after_round} if after_round is not None else None
+        return await self._client._request(
+            "GET", f"/api/v1/node/{self.node_id}/edges", params=params, model=Edge
+        )
+
     async def update(
         self,
         name: Optional[str] = None,
@@ -184,12 +1113,15 @@ class Node:
             "PUT", f"/api/v1/node/{self.node_id}", json_data=json_data
         )
         # Update local attributes
+        old_name = self.name
         if "name" in data:
             self.name = data["name"]
         if "message" in data:
             self.message = data["message"]
         if "capacity" in data:
             self.capacity = data["capacity"]
+        if self._registry is not None:
+            self._registry.rename(self, old_name)
         logger.info(f"Node '{self.name}' updated successfully")
         return self
 
@@ -197,4 +1129,6 @@ class Node:
         """Delete this node."""
         logger.info(f"Deleting node '{self.name}' (ID: {self.node_id})")
         await self._client._request("DELETE", f"/api/v1/node/{self.node_id}")
+        if self._registry is not None:
+            self._registry.remove(self.node_id)
         logger.info(f"Node '{self.name}' deleted successfully")
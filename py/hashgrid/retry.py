@@ -0,0 +1,183 @@
+"""Retry policy and circuit breaker for Hashgrid requests."""
+
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional, Dict, FrozenSet, Tuple
+import logging
+import random
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Errors raised before the request reached the server, always safe to retry.
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with jitter.
+
+    Idempotent methods are retried on network errors and on
+    ``retry_statuses``. Other methods (e.g. the ``send`` POST) are only
+    retried when the server cannot have applied the request: connection
+    failures and 429 responses.
+    """
+
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    jitter: bool = True
+    retry_statuses: Tuple[int, ...] = (429, 502, 503, 504)
+    idempotent_methods: FrozenSet[str] = frozenset(
+        {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+    )
+    respect_retry_after: bool = True
+
+    def is_idempotent(self, method: str) -> bool:
+        """Return whether ``method`` can be repeated safely."""
+        return method.upper() in self.idempotent_methods
+
+    def should_retry(
+        self,
+        method: str,
+        attempt: int,
+        status_code: Optional[int] = None,
+        error: Optional[Exception] = None,
+        idempotent: Optional[bool] = None,
+    ) -> bool:
+        """Return whether a failed attempt (0-based) should be retried."""
+        if attempt >= self.max_retries:
+            return False
+        if idempotent is None:
+            idempotent = self.is_idempotent(method)
+        if error is not None:
+            return idempotent or isinstance(error, _UNSENT_ERRORS)
+        if status_code not in self.retry_statuses:
+            return False
+        return idempotent or status_code == 429
+
+    def get_delay(
+        self, attempt: int, response: Optional[httpx.Response] = None
+    ) -> float:
+        """Return the number of seconds to wait before the next attempt."""
+        if self.respect_retry_after and response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        delay = min(self.max_backoff, self.backoff_factor * (2**attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """Fail fast after repeated failures until the grid recovers.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests are rejected for ``recovery_timeout`` seconds. Then a single
+    trial request is let through (half-open): success closes the circuit,
+    failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.opened_count = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current state, one of ``closed``, ``open`` or ``half_open``."""
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the circuit lets a trial request through."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def release(self) -> None:
+        """Give up a request without a result, e.g. because it was cancelled.
+
+        A half-open circuit then lets the next request through as the trial.
+        """
+        if self._state == self.HALF_OPEN:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        """Record a successful request."""
+        if self._state != self.CLOSED:
+            logger.info("Circuit breaker closed")
+        self.failures = 0
+        self._state = self.CLOSED
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed request."""
+        self.failures += 1
+        if self._state == self.HALF_OPEN or (
+            self._state == self.CLOSED and self.failures >= self.failure_threshold
+        ):
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+            self.opened_count += 1
+            logger.warning(
+                f"Circuit breaker opened after {self.failures} failure(s), "
+                f"retrying in {self.recovery_timeout}s"
+            )
+
+
+@dataclass
+class RequestStats:
+    """Request counters for monitoring."""
+
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    rejected: int = 0
+    retries_by_reason: Dict[str, int] = field(default_factory=dict)
@@ -0,0 +1,265 @@
+"""Consistent-hash sharding of nodes across worker processes or hosts."""
+
+from bisect import bisect
+from typing import Dict, Iterable, List, Optional, Protocol
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class Shard(Protocol):
+    """Anything deciding which nodes this worker processes."""
+
+    def owns(self, node_id: str) -> bool:
+        ...
+
+
+class HashRing:
+    """Consistent hash ring mapping keys to members.
+
+    Every member is placed on the ring ``replicas`` times, so adding or
+    removing a member only moves about ``1 / len(members)`` of the keys.
+    """
+
+    def __init__(self, members: Iterable[str] = (), replicas: int = 100):
+        if replicas < 1:
+            raise ValueError("replicas must be at least 1")
+        self.replicas = replicas
+        self._members = set(members)
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self._rebuild()
+
+    @property
+    def members(self) -> List[str]:
+        """Members on the ring, sorted."""
+        return sorted(self._members)
+
+    def add(self, member: str) -> None:
+        """Add a member to the ring."""
+        if member not in self._members:
+            self._members.add(member)
+            self._rebuild()
+
+    def remove(self, member: str) -> None:
+        """Remove a member from the ring."""
+        if member in self._members:
+            self._members.discard(member)
+            self._rebuild()
+
+    def owner(self, key: str) -> Optional[str]:
+        """Return the member owning ``key``, or None if the ring is empty."""
+        if not self._points:
+            return None
+        index = bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[index]
+
+    def _rebuild(self) -> None:
+        points = sorted(
+            (_hash(f"{member}#{i}"), member)
+            for member in self._members
+            for i in range(self.replicas)
+        )
+        self._points = [point for point, _ in points]
+        self._owners = [member for _, member in points]
+
+
+class StaticShard:
+    """Fixed shard assignment, e.g. one process per entry in a config file.
+
+    ``owns(node_id)`` is true for the nodes ``worker_id`` owns among
+    ``workers``. Every worker must be started with the same ``workers``.
+    """
+
+    def __init__(self, worker_id: str, workers: Iterable[str], replicas: int = 100):
+        self.worker_id = worker_id
+        self.ring = HashRing(workers, replicas)
+        if worker_id not in self.ring.members:
+            raise ValueError(f"worker_id '{worker_id}' is not in workers")
+
+    def owns(self, node_id: str) -> bool:
+        """Whether this worker should process ``node_id``."""
+        return self.ring.owner(node_id) == self.worker_id
+
+
+class ShardCoordinator:
+    """Shard membership through heartbeat files in a shared directory.
+
+    Each worker writes ``<worker_id>.worker`` to ``directory`` and touches it
+    every ``heartbeat_interval`` seconds. Workers whose file has not been
+    touched for ``ttl`` seconds are considered gone, so their nodes move to
+    the remaining workers. A joining worker becomes a member at
+    ``joined_at + join_delay``: every worker sees it at a heartbeat before
+    then and switches to the new ring at that instant in ``owns()``, so no
+    node is owned by two workers. Use a local directory for processes on one
+    host or a shared filesystem for several hosts; across hosts this assumes
+    clocks are synchronized (e.g. NTP) to well within ``join_delay -
+    heartbeat_interval``.
+
+    Use as an async context manager to send heartbeats in the background::
+
+        async with ShardCoordinator("/var/run/hashgrid") as shard:
+            async for tick in grid.listen():
+                await grid.process_tick(handler, shard=shard)
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        worker_id: Optional[str] = None,
+        heartbeat_interval: float = 5.0,
+        ttl: float = 15.0,
+        join_delay: Optional[float] = None,
+        replicas: int = 100,
+    ):
+        if ttl <= heartbeat_interval:
+            raise ValueError("ttl must be longer than heartbeat_interval")
+        if join_delay is not None and join_delay <= heartbeat_interval:
+            raise ValueError("join_delay must be longer than heartbeat_interval")
+        self.directory = directory
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.heartbeat_interval = heartbeat_interval
+        self.ttl = ttl
+        self.join_delay = ttl if join_delay is None else join_delay
+        self.ring = HashRing(replicas=replicas)
+        self.joined_at: Optional[float] = None
+        # Live workers and the time they become members.
+        self._workers: Dict[str, float] = {}
+        self._next_change = float("inf")
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def path(self) -> str:
+        """Heartbeat file of this worker."""
+        return os.path.join(self.directory, f"{self.worker_id}.worker")
+
+    @property
+    def members(self) -> List[str]:
+        """Workers currently sharing the nodes."""
+        self._update_ring(time.time())
+        return self.ring.members
+
+    def join(self) -> None:
+        """Register this worker and load the current membership."""
+        os.makedirs(self.directory, exist_ok=True)
+        self.joined_at = time.time()
+        tmp = f"{self.path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(
+                {
+                    "worker_id": self.worker_id,
+                    "host": socket.gethostname(),
+                    "pid": os.getpid(),
+                    "joined_at": self.joined_at,
+                },
+                f,
+            )
+        os.replace(tmp, self.path)
+        self.refresh()
+
+    def leave(self) -> None:
+        """Unregister this worker. It owns no nodes afterwards."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.joined_at = None
+        self._workers = {}
+        self._next_change = float("inf")
+        self.ring = HashRing(replicas=self.ring.replicas)
+
+    def refresh(self) -> None:
+        """Touch this worker's heartbeat file and reload the membership."""
+        if self.joined_at is None:
+            raise RuntimeError("Worker has not joined, call join() first")
+        now = time.time()
+        try:
+            os.utime(self.path)
+        except FileNotFoundError:
+            # Removed by an operator or a cleanup job; register again.
+            self.join()
+            return
+        self._workers = self._scan(now)
+        self._next_change = 0.0
+        self._update_ring(now)
+
+    def owns(self, node_id: str) -> bool:
+        """Whether this worker should process ``node_id``."""
+        self._update_ring(time.time())
+        return self.ring.owner(node_id) == self.worker_id
+
+    def _update_ring(self, now: float) -> None:
+        """Switch to the ring of the workers that are members at ``now``."""
+        if now < self._next_change:
+            return
+        members = [w for w, active_at in self._workers.items() if active_at <= now]
+        self._next_change = min(
+            (t for t in self._workers.values() if t > now), default=float("inf")
+        )
+        if set(members) != set(self.ring.members):
+            logger.info(
+                f"Shard membership changed: {len(members)} worker(s) "
+                f"{sorted(members)}"
+            )
+            self.ring = HashRing(members, self.ring.replicas)
+
+    def _scan(self, now: float) -> Dict[str, float]:
+        workers = {}
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".worker"):
+                continue
+            try:
+                if now - entry.stat().st_mtime > self.ttl:
+                    continue
+                with open(entry.path) as f:
+                    info: Dict = json.load(f)
+                worker_id = str(info["worker_id"])
+                active_at = float(info.get("joined_at", 0)) + self.join_delay
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                # Partial writes or files from another version must not break
+                # rebalancing for everyone else.
+                logger.debug(f"Skipping heartbeat file {entry.name}: {e!r}")
+                continue
+            workers[worker_id] = active_at
+        return workers
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    def start(self) -> None:
+        """Join and send heartbeats in the background."""
+        if self._task is not None:
+            return
+        self.join()
+        self._task = asyncio.ensure_future(self._heartbeat())
+
+    async def stop(self) -> None:
+        """Stop sending heartbeats and leave."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self.leave()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                self.refresh()
+            except OSError as e:
+                logger.warning(f"Shard heartbeat failed: {e}")
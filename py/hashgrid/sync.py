@@ -0,0 +1,282 @@
+"""Synchronous facade over the async Hashgrid client."""
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+import asyncio
+import threading
+
+from .client import Hashgrid
+from .resources import Edge, Grid, Handler, Message, Node, Status, TickResult
+
+if TYPE_CHECKING:
+    from .reconcile import NodeSpec, ReconcilePlan, ReconcileResult
+
+
+async def _anext(iterator: AsyncIterator) -> Any:
+    return await iterator.__anext__()
+
+
+class _LoopThread:
+    """Event loop running forever in a daemon thread."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self.loop.run_forever, name="hashgrid-loop", daemon=True
+        )
+        self.thread.start()
+
+    def run(self, coro) -> Any:
+        """Run ``coro`` on the loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def iterate(self, iterator: AsyncIterator) -> Iterator:
+        """Iterate over an async iterator from the calling thread."""
+        try:
+            while True:
+                try:
+                    item = self.run(_anext(iterator))
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None and self.loop.is_running():
+                self.run(aclose())
+
+    def stop(self) -> None:
+        """Stop the loop and wait for the thread to exit."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+class SyncHashgrid:
+    """Synchronous client for non-async workloads.
+
+    All requests run on one background event loop thread sharing one
+    connection pool, so callers (including several threads at once) get
+    connection reuse without paying event loop startup per call. Accepts the
+    same arguments as ``Hashgrid``.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = "https://dna.hashgrid.ai",
+        timeout: int = 30,
+        **kwargs: Any,
+    ):
+        self._loop = _LoopThread()
+        self._client = Hashgrid(
+            api_key=api_key, base_url=base_url, timeout=timeout, **kwargs
+        )
+        self._loop.run(self._client.__aenter__())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection pool and stop the event loop thread."""
+        if self._loop.loop.is_closed():
+            return
+        self._loop.run(self._client.__aexit__(None, None, None))
+        self._loop.stop()
+
+    def grid(
+        self, name: Optional[str] = None, tick: Optional[int] = None
+    ) -> "SyncGrid":
+        """Fetch the grid and return a SyncGrid.
+
+        If the grid ``name`` is known, the request is skipped as in
+        ``Hashgrid.connect``.
+        """
+        if name is not None:
+            grid = Grid(name=name, tick=tick or 0, client=self._client)
+        else:
+            data = self._loop.run(self._client._request("GET", "/api/v1"))
+            grid = Grid(name=data["name"], tick=data["tick"], client=self._client)
+        return SyncGrid(grid, self)
+
+    @classmethod
+    def connect(
+        cls,
+        api_key: Optional[str] = None,
+        base_url: str = "https://dna.hashgrid.ai",
+        timeout: int = 30,
+        name: Optional[str] = None,
+        tick: Optional[int] = None,
+        **kwargs: Any,
+    ) -> "SyncGrid":
+        """Connect to a Hashgrid grid and return a SyncGrid."""
+        client = cls(api_key=api_key, base_url=base_url, timeout=timeout, **kwargs)
+        return client.grid(name, tick)
+
+
+class SyncGrid:
+    """Synchronous mirror of ``Grid``."""
+
+    def __init__(self, grid: Grid, hashgrid: SyncHashgrid):
+        self._grid = grid
+        self._hashgrid = hashgrid
+        self._loop = hashgrid._loop
+
+    @property
+    def name(self) -> str:
+        return self._grid.name
+
+    @property
+    def tick(self) -> int:
+        return self._grid.tick
+
+    @property
+    def clock(self):
+        return self._grid.clock
+
+    @property
+    def registry(self):
+        return self._grid.registry
+
+    def close(self) -> None:
+        """Close the underlying client."""
+        self._hashgrid.close()
+
+    def refresh(self) -> int:
+        """Fetch the grid's name and current tick, and return the tick."""
+        return self._loop.run(self._grid.refresh())
+
+    def listen(self, poll_interval: float = 30.0, **kwargs: Any) -> Iterator[int]:
+        """Listen for tick updates. Yields when the tick changes."""
+        return self._loop.iterate(self._grid.listen(poll_interval, **kwargs))
+
+    def nodes(self, refresh: bool = False) -> Iterator["SyncNode"]:
+        """Iterate over all nodes owned by the authenticated user."""
+        for node in self._loop.iterate(self._grid.nodes(refresh=refresh)):
+            yield SyncNode(node, self._loop)
+
+    def get_node(self, node_id: str) -> Optional["SyncNode"]:
+        """Return the node with ``node_id``, or None if it does not exist."""
+        node = self._loop.run(self._grid.get_node(node_id))
+        return SyncNode(node, self._loop) if node is not None else None
+
+    def get_node_by_name(self, name: str) -> Optional["SyncNode"]:
+        """Return the node named ``name``, or None if it does not exist."""
+        node = self._loop.run(self._grid.get_node_by_name(name))
+        return SyncNode(node, self._loop) if node is not None else None
+
+    def create_node(
+        self, name: str, message: str = "", capacity: int = 100
+    ) -> "SyncNode":
+        """Create a new node."""
+        node = self._loop.run(self._grid.create_node(name, message, capacity))
+        return SyncNode(node, self._loop)
+
+    def plan(
+        self,
+        desired: Iterable[Union["NodeSpec", Dict[str, Any]]],
+        delete: bool = True,
+    ) -> "ReconcilePlan":
+        """Diff ``desired`` node specs against the grid's current nodes."""
+        return self._loop.run(self._grid.plan(desired, delete))
+
+    def reconcile(
+        self,
+        desired: Iterable[Union["NodeSpec", Dict[str, Any]]],
+        concurrency: int = 20,
+        delete: bool = True,
+        dry_run: bool = False,
+    ) -> "ReconcileResult":
+        """Create, update and delete nodes until they match ``desired``."""
+        return self._loop.run(
+            self._grid.reconcile(desired, concurrency, delete, dry_run)
+        )
+
+    def recv_all(
+        self, node_ids: Iterable[str], concurrency: int = 10
+    ) -> Dict[str, List[Message]]:
+        """Receive messages for many nodes at once."""
+        return self._loop.run(self._grid.recv_all(node_ids, concurrency))
+
+    def send_all(
+        self, replies: Dict[str, List[Message]], concurrency: int = 10
+    ) -> Dict[str, List[Status]]:
+        """Send replies for many nodes at once, keyed by node ID."""
+        return self._loop.run(self._grid.send_all(replies, concurrency))
+
+    def process_tick(
+        self, handler: Handler, concurrency: int = 10, **kwargs: Any
+    ) -> List[TickResult]:
+        """Run recv -> handler -> send for every node concurrently.
+
+        The handler runs on the event loop thread and receives the async
+        ``Node``; it must not call ``SyncNode`` methods.
+        """
+        return self._loop.run(
+            self._grid.process_tick(handler, concurrency=concurrency, **kwargs)
+        )
+
+
+class SyncNode:
+    """Synchronous mirror of ``Node``."""
+
+    def __init__(self, node: Node, loop: _LoopThread):
+        self._node = node
+        self._loop = loop
+
+    @property
+    def node_id(self) -> str:
+        return self._node.node_id
+
+    @property
+    def owner_id(self) -> str:
+        return self._node.owner_id
+
+    @property
+    def name(self) -> str:
+        return self._node.name
+
+    @property
+    def message(self) -> str:
+        return self._node.message
+
+    @property
+    def capacity(self) -> int:
+        return self._node.capacity
+
+    def recv(self) -> List[Message]:
+        """Get peers waiting for a response."""
+        return self._loop.run(self._node.recv())
+
+    def send(self, replies: List[Message]) -> List[Status]:
+        """Send replies to peers."""
+        return self._loop.run(self._node.send(replies))
+
+    def edges(self, after_round: Optional[int] = None) -> List[Edge]:
+        """Get this node's edges, optionally only those after ``after_round``."""
+        return self._loop.run(self._node.edges(after_round))
+
+    def update(
+        self,
+        name: Optional[str] = None,
+        message: Optional[str] = None,
+        capacity: Optional[int] = None,
+    ) -> "SyncNode":
+        """Update this node's name, message, and/or capacity."""
+        self._loop.run(self._node.update(name, message, capacity))
+        return self
+
+    def delete(self) -> None:
+        """Delete this node."""
+        self._loop.run(self._node.delete())
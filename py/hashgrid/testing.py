@@ -0,0 +1,429 @@
+"""In-process fake Hashgrid server and load-testing harness.
+
+``FakeGrid`` implements the Hashgrid API on top of ``httpx.MockTransport``,
+so clients run against it without a network:
+
+    fake = FakeGrid(latency=0.005)
+    fake.add_nodes(100)
+    grid = await Hashgrid.connect(transport=fake.transport())
+
+``run_load()`` drives ``Grid.process_tick`` over many ticks and nodes and
+reports throughput and per-tick latency. Run ``python -m hashgrid.testing``
+for a command line load test.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+import httpx
+
+from .client import Hashgrid
+from .compression import get_compressor
+from .resources import Handler, Message
+
+
+def _default_message(node_id: str, peer_id: str, tick: int) -> str:
+    return f"Hello from {peer_id} at tick {tick}"
+
+
+class FakeGrid:
+    """Fake Hashgrid server with simulated ticks, peers and rounds.
+
+    Each tick opens a new round: every node gets messages from
+    ``peers_per_node`` peers (capped by its capacity), which stay pending
+    until replied to or until the next tick. Ticks advance on ``advance()``
+    or every ``tick_interval`` seconds. Every request waits ``latency``
+    seconds (plus up to ``jitter``) and fails with a 503 with probability
+    ``error_rate``. ``bulk`` and ``stream`` enable the bulk recv/send
+    endpoints and server-sent tick events, and ``compression`` accepts
+    gzip/zstd request bodies (otherwise they are rejected with a 415).
+    With ``record_edges`` successful replies are kept as edges, served by
+    ``GET /api/v1/node/{id}/edges``. With ``rate_limit`` at most that many
+    requests are accepted per ``rate_window`` seconds, others get a 429, and
+    responses carry ``RateLimit-*`` headers.
+    """
+
+    def __init__(
+        self,
+        name: str = "fake",
+        peers_per_node: int = 5,
+        tick_interval: Optional[float] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        bulk: bool = True,
+        stream: bool = False,
+        compression: bool = True,
+        record_edges: bool = False,
+        rate_limit: Optional[int] = None,
+        rate_window: float = 1.0,
+        message_factory: Callable[[str, str, int], str] = _default_message,
+        seed: Optional[int] = None,
+    ):
+        self.name = name
+        self.tick = 0
+        self.peers_per_node = peers_per_node
+        self.tick_interval = tick_interval
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.bulk = bulk
+        self.stream = stream
+        self.compression = compression
+        self.record_edges = record_edges
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.throttled = 0
+        self._window_ends = 0.0
+        self._window_used = 0
+        self.message_factory = message_factory
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.pending: Dict[str, Dict[Tuple[str, int], str]] = {}
+        self.edges: Dict[str, List[Dict[str, Any]]] = {}
+        self.requests: Dict[str, int] = {}
+        self.replies = 0
+        self.successful_replies = 0
+        self._version = 0
+        self._random = random.Random(seed)
+        self._started = time.monotonic()
+        self._tick_changed: Optional[asyncio.Event] = None
+
+    def add_node(self, name: str, message: str = "", capacity: int = 100) -> str:
+        """Add a node and return its ID."""
+        node_id = str(uuid.UUID(int=self._random.getrandbits(128)))
+        self.nodes[node_id] = {
+            "node_id": node_id,
+            "owner_id": "fake-user",
+            "name": name,
+            "message": message,
+            "capacity": capacity,
+        }
+        self.pending[node_id] = {}
+        self._version += 1
+        return node_id
+
+    def add_nodes(self, count: int, capacity: int = 100) -> List[str]:
+        """Add ``count`` nodes and return their IDs."""
+        return [self.add_node(f"node-{i}", capacity=capacity) for i in range(count)]
+
+    def advance(self) -> int:
+        """Start the next tick, opening a new round for every node."""
+        self.tick += 1
+        for node_id, node in self.nodes.items():
+            count = min(self.peers_per_node, node["capacity"])
+            self.pending[node_id] = {
+                (f"peer-{node_id[:8]}-{i}", self.tick): self.message_factory(
+                    node_id, f"peer-{node_id[:8]}-{i}", self.tick
+                )
+                for i in range(count)
+            }
+        if self._tick_changed is not None:
+            self._tick_changed.set()
+            self._tick_changed = None
+        return self.tick
+
+    def transport(self) -> httpx.MockTransport:
+        """Return a transport that routes client requests to this grid."""
+        return httpx.MockTransport(self.handle)
+
+    def _sync_clock(self) -> None:
+        """Advance ticks that elapsed since the last request."""
+        if self.tick_interval is None:
+            return
+        expected = int((time.monotonic() - self._started) / self.tick_interval)
+        while self.tick < expected:
+            self.advance()
+
+    async def _wait_for_tick(self, since_tick: int, wait: float) -> None:
+        """Hold a long-poll request until the tick passes ``since_tick``."""
+        deadline = time.monotonic() + wait
+        while self.tick <= since_tick:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if self.tick_interval is not None:
+                next_tick = self._started + (self.tick + 1) * self.tick_interval
+                remaining = min(remaining, max(0.0, next_tick - time.monotonic()))
+            if self._tick_changed is None:
+                self._tick_changed = asyncio.Event()
+            try:
+                await asyncio.wait_for(self._tick_changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+            self._sync_clock()
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        """Handle one API request."""
+        path = request.url.path.rstrip("/")
+        key = f"{request.method} {path}"
+        self.requests[key] = self.requests.get(key, 0) + 1
+
+        if self.rate_limit is None:
+            return await self._route(request, path)
+        now = time.monotonic()
+        if now >= self._window_ends:
+            self._window_ends = now + self.rate_window
+            self._window_used = 0
+        reset = f"{self._window_ends - now:.3f}"
+        if self._window_used >= self.rate_limit:
+            self.throttled += 1
+            return httpx.Response(429, headers={"Retry-After": reset})
+        self._window_used += 1
+        response = await self._route(request, path)
+        response.headers["RateLimit-Limit"] = str(self.rate_limit)
+        response.headers["RateLimit-Remaining"] = str(
+            self.rate_limit - self._window_used
+        )
+        response.headers["RateLimit-Reset"] = reset
+        return response
+
+    async def _route(self, request: httpx.Request, path: str) -> httpx.Response:
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return httpx.Response(503, json={"message": "Injected failure"})
+        self._sync_clock()
+
+        parts = path.strip("/").split("/")
+        if parts[:2] != ["api", "v1"]:
+            return httpx.Response(404)
+        parts = parts[2:]
+        content = request.content
+        encoding = request.headers.get("Content-Encoding")
+        if encoding:
+            if not self.compression:
+                return httpx.Response(415)
+            content = get_compressor(encoding).decompress(content)
+        body = json.loads(content) if content else None
+
+        if not parts:
+            return await self._grid(request)
+        if parts[0] != "node":
+            return httpx.Response(404)
+        if len(parts) == 1:
+            if request.method == "GET":
+                return self._list_nodes(request)
+            if request.method == "POST":
+                node_id = self.add_node(
+                    body["name"], body.get("message", ""), body.get("capacity", 100)
+                )
+                return httpx.Response(200, json=self.nodes[node_id])
+        if len(parts) == 2 and parts[1] in ("recv", "send") and request.method == "POST":
+            if not self.bulk:
+                return httpx.Response(404)
+            if parts[1] == "recv":
+                return httpx.Response(
+                    200, json={i: self._recv(i) for i in body["node_ids"]}
+                )
+            return httpx.Response(
+                200, json={i: self._send(i, replies) for i, replies in body.items()}
+            )
+
+        node_id = parts[1]
+        if node_id not in self.nodes:
+            return httpx.Response(404)
+        if len(parts) == 2:
+            if request.method == "GET":
+                return httpx.Response(200, json=self.nodes[node_id])
+            if request.method == "PUT":
+                self.nodes[node_id].update(
+                    {k: v for k, v in body.items() if k in ("name", "message", "capacity")}
+                )
+                self._version += 1
+                return httpx.Response(200, json=self.nodes[node_id])
+            if request.method == "DELETE":
+                del self.nodes[node_id]
+                del self.pending[node_id]
+                self.edges.pop(node_id, None)
+                self._version += 1
+                return httpx.Response(204)
+        if len(parts) == 3 and parts[2] == "recv" and request.method == "GET":
+            return httpx.Response(200, json=self._recv(node_id))
+        if len(parts) == 3 and parts[2] == "send" and request.method == "POST":
+            return httpx.Response(200, json=self._send(node_id, body))
+        if len(parts) == 3 and parts[2] == "edges" and request.method == "GET":
+            after_round = int(request.url.params.get("after_round", -1))
+            return httpx.Response(
+                200,
+                json=[e for e in self.edges.get(node_id, []) if e["round"] > after_round],
+            )
+        return httpx.Response(405)
+
+    async def _grid(self, request: httpx.Request) -> httpx.Response:
+        if self.stream and "text/event-stream" in request.headers.get("Accept", ""):
+            return httpx.Response(
+                200,
+                headers={"Content-Type": "text/event-stream"},
+                content=self._events(),
+            )
+        since_tick = request.url.params.get("since_tick")
+        wait = request.url.params.get("wait")
+        if since_tick is not None and wait is not None:
+            await self._wait_for_tick(int(since_tick), float(wait))
+        return httpx.Response(200, json={"name": self.name, "tick": self.tick})
+
+    async def _events(self):
+        last_tick = -1
+        while True:
+            if self.tick != last_tick:
+                last_tick = self.tick
+                data = json.dumps({"name": self.name, "tick": self.tick})
+                yield f"data: {data}\n\n".encode()
+            await self._wait_for_tick(last_tick, 60.0)
+
+    def _list_nodes(self, request: httpx.Request) -> httpx.Response:
+        etag = f'"{self._version}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, json=list(self.nodes.values()), headers={"ETag": etag})
+
+    def _recv(self, node_id: str) -> List[Dict[str, Any]]:
+        return [
+            {"peer_id": peer_id, "round": round, "message": message}
+            for (peer_id, round), message in self.pending.get(node_id, {}).items()
+        ]
+
+    def _send(self, node_id: str, replies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        pending = self.pending.get(node_id, {})
+        statuses = []
+        for reply in replies:
+            message = pending.pop((reply["peer_id"], reply["round"]), None)
+            success = message is not None
+            if success and self.record_edges:
+                self.edges.setdefault(node_id, []).append(
+                    {
+                        "node_id": node_id,
+                        "peer_id": reply["peer_id"],
+                        "recv_message": message,
+                        "send_message": reply["message"],
+                        "score": reply.get("score"),
+                        "round": reply["round"],
+                    }
+                )
+            self.replies += 1
+            self.successful_replies += success
+            statuses.append(
+                {"peer_id": reply["peer_id"], "round": reply["round"], "success": success}
+            )
+        return statuses
+
+
+@dataclass
+class LoadReport:
+    """Result of a ``run_load()`` run."""
+
+    nodes: int
+    ticks: int
+    messages: int = 0
+    replies: int = 0
+    successful_replies: int = 0
+    failed_nodes: int = 0
+    requests: int = 0
+    duration: float = 0.0
+    tick_latencies: List[float] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        """Messages processed per second."""
+        return self.messages / self.duration if self.duration else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Per-tick latency percentile (0..100), in seconds."""
+        if not self.tick_latencies:
+            return 0.0
+        ordered = sorted(self.tick_latencies)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+    def __str__(self) -> str:
+        return (
+            f"{self.nodes} nodes x {self.ticks} ticks: "
+            f"{self.messages} messages, {self.successful_replies}/{self.replies} "
+            f"replies ok, {self.failed_nodes} node failures, {self.requests} requests, "
+            f"{self.throughput:.0f} msg/s, tick p50={self.percentile(50) * 1000:.1f}ms "
+            f"p99={self.percentile(99) * 1000:.1f}ms"
+        )
+
+
+def echo_handler(node, messages: List[Message]) -> List[Message]:
+    """Reply to every message with its reversed text."""
+    return [
+        Message(peer_id=msg.peer_id, round=msg.round, message=msg.message[::-1])
+        for msg in messages
+    ]
+
+
+async def run_load(
+    handler: Handler = echo_handler,
+    nodes: int = 1000,
+    ticks: int = 10,
+    concurrency: int = 100,
+    batch: bool = False,
+    fake: Optional[FakeGrid] = None,
+    **client_kwargs: Any,
+) -> LoadReport:
+    """Process ``ticks`` ticks over ``nodes`` fake nodes and report timings.
+
+    Pass a configured ``fake`` to control latency and error rates; extra
+    keyword arguments go to ``Hashgrid.connect``.
+    """
+    if fake is None:
+        fake = FakeGrid()
+    if len(fake.nodes) < nodes:
+        fake.add_nodes(nodes - len(fake.nodes))
+    grid = await Hashgrid.connect(
+        base_url="http://hashgrid.test", transport=fake.transport(), **client_kwargs
+    )
+    report = LoadReport(nodes=len(fake.nodes), ticks=ticks)
+    try:
+        started = time.perf_counter()
+        for _ in range(ticks):
+            fake.advance()
+            tick_started = time.perf_counter()
+            results = await grid.process_tick(handler, concurrency=concurrency, batch=batch)
+            report.tick_latencies.append(time.perf_counter() - tick_started)
+            report.messages += sum(len(r.messages) for r in results)
+            report.failed_nodes += sum(1 for r in results if r.error is not None)
+        report.duration = time.perf_counter() - started
+    finally:
+        await grid._client.__aexit__(None, None, None)
+    report.replies = fake.replies
+    report.successful_replies = fake.successful_replies
+    report.requests = sum(fake.requests.values())
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test against a fake grid.")
+    parser.add_argument("--nodes", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--peers", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.001)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--batch", action="store_true")
+    args = parser.parse_args()
+
+    fake = FakeGrid(
+        peers_per_node=args.peers, latency=args.latency, error_rate=args.error_rate
+    )
+    report = asyncio.run(
+        run_load(
+            nodes=args.nodes,
+            ticks=args.ticks,
+            concurrency=args.concurrency,
+            batch=args.batch,
+            fake=fake,
+        )
+    )
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""Per-tick timeline tracing in the Chrome trace event format.
+
+A ``Tracer`` records spans for the node listing, every ``Node.recv``,
+handler call and ``Node.send`` of a tick, plus every HTTP request they make,
+and writes them as Chrome trace JSON files that open in ``chrome://tracing``
+or https://ui.perfetto.dev. Each asyncio task is shown as its own track.
+"""
+
+from collections import deque
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterator, List, Optional
+import asyncio
+import itertools
+import json
+import os
+import random
+import time
+
+if TYPE_CHECKING:
+    from .metrics import RequestEvent
+
+
+class _TickTrace:
+    """Events recorded during one tick."""
+
+    def __init__(self, tick: int, origin: float, tids: Iterator[int]):
+        self.tick = tick
+        self.origin = origin
+        self.events: List[Dict[str, Any]] = []
+        # Track numbers are unique across ticks, so files covering several
+        # ticks do not mix up tasks.
+        self._next_tid = tids
+        self._tids: Dict[Any, int] = {}
+
+    def add(
+        self, name: str, cat: str, started: float, duration: float, args: dict
+    ) -> None:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        tid = self._tids.get(task)
+        if tid is None:
+            tid = self._tids[task] = next(self._next_tid)
+            self.events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "tid": tid,
+                    "args": {"name": task.get_name() if task else "main"},
+                }
+            )
+        self.events.append(
+            {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": round((started - self.origin) * 1e6, 1),
+                "dur": round(duration * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": tid,
+                "args": args,
+            }
+        )
+
+
+_current: ContextVar[Optional[_TickTrace]] = ContextVar("hashgrid_trace", default=None)
+
+
+class Span:
+    """A timed span, recorded when it exits. Add arguments with ``set()``."""
+
+    __slots__ = ("trace", "name", "cat", "args", "started")
+
+    def __init__(self, trace: _TickTrace, name: str, cat: str, args: dict):
+        self.trace = trace
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.started = 0.0
+
+    def set(self, **args: Any) -> None:
+        """Add arguments shown with the span."""
+        self.args.update(args)
+
+    def __enter__(self) -> "Span":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_val is not None:
+            self.args["error"] = repr(exc_val)
+        self.trace.add(
+            self.name,
+            self.cat,
+            self.started,
+            time.perf_counter() - self.started,
+            self.args,
+        )
+
+
+class _NullSpan:
+    """Span used outside a traced tick; records nothing."""
+
+    __slots__ = ()
+
+    def set(self, **args: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, cat: str = "node", **args: Any):
+    """Return a span for the traced tick of the current task, if any.
+
+    Outside a tick traced by a ``Tracer`` this returns a shared no-op span,
+    so instrumented code costs a context variable lookup.
+    """
+    trace = _current.get()
+    if trace is None:
+        return _NULL_SPAN
+    return Span(trace, name, cat, args)
+
+
+def tick_span(tracer: Optional["Tracer"], tick: int):
+    """``tracer.tick(tick)``, or a no-op span without a tracer."""
+    return tracer.tick(tick) if tracer is not None else _NULL_SPAN
+
+
+class _TickScope:
+    """Context manager tracing one tick; see ``Tracer.tick()``."""
+
+    def __init__(self, tracer: "Tracer", tick: int):
+        self.tracer = tracer
+        self.tick = tick
+        self.root: Optional[Span] = None
+        self._token = None
+
+    def __enter__(self):
+        tracer = self.tracer
+        if _current.get() is not None:
+            return _NULL_SPAN  # already inside a traced tick
+        tracer.ticks += 1
+        if tracer._random.random() >= tracer.sample_rate:
+            return _NULL_SPAN
+        trace = _TickTrace(self.tick, tracer._origin, tracer._tids)
+        self._token = _current.set(trace)
+        self.root = Span(trace, "tick", "tick", {"tick": self.tick})
+        return self.root.__enter__()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self.root is None:
+            return
+        _current.reset(self._token)
+        self.root.__exit__(exc_type, exc_val, exc_tb)
+        self.tracer._finish(self.root.trace, time.perf_counter() - self.root.started)
+
+
+class Tracer:
+    """Records per-tick timelines and writes them as Chrome trace files.
+
+    Pass it to ``Hashgrid(tracer=...)``: ``Grid.process_tick()`` then traces
+    each tick, and ``with tracer.tick(grid.tick):`` traces a custom loop.
+    Spans carry the node ID, message counts and, for HTTP requests, the
+    status and payload bytes.
+
+    Files are written to ``directory``: one per tick, or with ``window`` one
+    per ``window`` seconds of ticks (call ``flush()`` to write the current
+    window early, e.g. on shutdown). They are named
+    ``tick-<tick>-<time>-<pid>-<n>.json`` (``ticks-<first>-<last>-...`` for
+    several ticks). With ``keep`` only the newest ``keep`` files are kept.
+
+    For production use, ``sample_rate`` traces only that share of ticks and
+    ``min_duration`` only writes ticks that took at least that many seconds;
+    untraced ticks cost almost nothing.
+    """
+
+    def __init__(
+        self,
+        directory: str = "traces",
+        sample_rate: float = 1.0,
+        min_duration: Optional[float] = None,
+        window: Optional[float] = None,
+        keep: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.min_duration = min_duration
+        self.window = window
+        self.keep = keep
+        self.ticks = 0
+        self.traced = 0
+        self.files: Deque[str] = deque()
+        self._random = random.Random(seed)
+        self._origin = time.perf_counter()
+        self._tids = itertools.count(1)
+        self._sequence = itertools.count(1)
+        self._pending: List[_TickTrace] = []
+        self._window_started: Optional[float] = None
+
+    def register(self, client) -> "Tracer":
+        """Attach to a ``Hashgrid`` client's event hooks."""
+        client.add_hook("request_end", self.record_request)
+        return self
+
+    def tick(self, tick: int) -> _TickScope:
+        """Context manager tracing one tick; yields the tick's root span."""
+        return _TickScope(self, tick)
+
+    def record_request(self, event: "RequestEvent") -> None:
+        """Record a finished request attempt as a span of the traced tick."""
+        trace = _current.get()
+        if trace is None:
+            return
+        args = {
+            "path": event.path,
+            "node_id": event.node_id,
+            "status": event.status_code,
+            "request_bytes": event.request_bytes,
+            "response_bytes": event.response_bytes,
+            "attempt": event.attempt,
+        }
+        if event.error is not None:
+            args["error"] = repr(event.error)
+        trace.add(
+            f"{event.method} {event.operation}",
+            "http",
+            time.perf_counter() - event.latency,
+            event.latency,
+            args,
+        )
+
+    def flush(self) -> Optional[str]:
+        """Write the pending ticks to a trace file and return its path."""
+        self._window_started = None
+        if not self._pending:
+            return None
+        traces, self._pending = self._pending, []
+        first, last = traces[0].tick, traces[-1].tick
+        name = f"tick-{first}" if first == last else f"ticks-{first}-{last}"
+        # The tick alone is not unique: it repeats when a tick is processed
+        # twice and stays put when nothing updates grid.tick.
+        name += f"-{int(time.time())}-{os.getpid()}-{next(self._sequence)}"
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{name}.json")
+        events = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "args": {"name": "hashgrid"},
+            }
+        ]
+        for trace in traces:
+            events.extend(trace.events)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        os.replace(tmp, path)
+        if path not in self.files:
+            self.files.append(path)
+        while self.keep is not None and len(self.files) > self.keep:
+            old = self.files.popleft()
+            if old != path and os.path.exists(old):
+                os.remove(old)
+        return path
+
+    def _finish(self, trace: _TickTrace, duration: float) -> None:
+        if self.min_duration is not None and duration < self.min_duration:
+            return
+        self.traced += 1
+        self._pending.append(trace)
+        now = time.monotonic()
+        if self._window_started is None:
+            self._window_started = now
+        if self.window is None or now - self._window_started >= self.window:
+            self.flush()
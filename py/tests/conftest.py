@@ -0,0 +1,35 @@
+"""Shared fixtures: an in-process ``FakeGrid`` and clients connected to it.
+
+Tests are plain functions that drive coroutines with ``asyncio.run`` so the
+suite only needs pytest.
+"""
+
+import pytest
+
+from hashgrid import Hashgrid, RetryPolicy
+from hashgrid.testing import FakeGrid
+
+
+@pytest.fixture
+def fake() -> FakeGrid:
+    """A fake grid with deterministic node IDs and three nodes."""
+    fake = FakeGrid(seed=0, peers_per_node=3)
+    fake.add_nodes(3)
+    return fake
+
+
+@pytest.fixture
+def connect():
+    """Return a coroutine function connecting a ``Grid`` to a fake grid.
+
+    Retries back off for zero seconds so failing requests do not slow the
+    suite down.
+    """
+
+    async def connect(fake, transport=None, **kwargs):
+        kwargs.setdefault("retry_policy", RetryPolicy(backoff_factor=0.0))
+        return await Hashgrid.connect(
+            base_url="http://fake", transport=transport or fake.transport(), **kwargs
+        )
+
+    return connect
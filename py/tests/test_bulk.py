@@ -0,0 +1,78 @@
+import asyncio
+
+import httpx
+
+from hashgrid.testing import FakeGrid, echo_handler
+
+
+def without(fake: FakeGrid, method: str, path: str, status: int = 404):
+    """Transport to ``fake`` that answers ``method path`` with ``status``."""
+    calls = []
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        if request.method == method and request.url.path == path:
+            calls.append(request)
+            return httpx.Response(status, json={"message": "Not found"})
+        return await fake.handle(request)
+
+    return httpx.MockTransport(handle), calls
+
+
+def test_bulk_recv_and_send(fake, connect):
+    fake.advance()
+
+    async def main():
+        grid = await connect(fake)
+        inbox = await grid.recv_all(list(fake.nodes))
+        replies = {node_id: echo_handler(None, msgs) for node_id, msgs in inbox.items()}
+        return grid, inbox, await grid.send_all(replies)
+
+    grid, inbox, statuses = asyncio.run(main())
+    assert {node_id: len(msgs) for node_id, msgs in inbox.items()} == dict.fromkeys(
+        fake.nodes, 3
+    )
+    assert all(s.success for ss in statuses.values() for s in ss)
+    assert grid._bulk_recv_supported and grid._bulk_send_supported
+    assert fake.successful_replies == 9
+
+
+def test_falls_back_to_per_node_calls(connect):
+    fake = FakeGrid(seed=0, bulk=False)
+    fake.add_nodes(3)
+    fake.advance()
+
+    async def main():
+        grid = await connect(fake)
+        results = await grid.process_tick(echo_handler, batch=True)
+        # Later ticks go straight to the per-node endpoints.
+        fake.advance()
+        requests = dict(fake.requests)
+        await grid.process_tick(echo_handler, batch=True)
+        return grid, results, requests
+
+    grid, results, requests = asyncio.run(main())
+    assert all(r.error is None and r.statuses for r in results)
+    assert grid._bulk_recv_supported is False
+    assert grid._bulk_send_supported is False
+    assert fake.successful_replies == 30
+    for key in ("POST /api/v1/node/recv", "POST /api/v1/node/send"):
+        assert fake.requests[key] == requests[key] == 1
+
+
+def test_bulk_send_unsupported_keeps_bulk_recv(fake, connect):
+    fake.advance()
+    transport, calls = without(fake, "POST", "/api/v1/node/send")
+
+    async def main():
+        grid = await connect(fake, transport=transport)
+        results = await grid.process_tick(echo_handler, batch=True)
+        fake.advance()
+        results += await grid.process_tick(echo_handler, batch=True)
+        return grid, results
+
+    grid, results = asyncio.run(main())
+    assert all(r.error is None for r in results)
+    assert all(s.success for r in results for s in r.statuses)
+    assert grid._bulk_recv_supported is True
+    assert grid._bulk_send_supported is False
+    assert len(calls) == 1
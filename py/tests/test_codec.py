@@ -0,0 +1,79 @@
+import asyncio
+
+import httpx
+import pytest
+
+from hashgrid import Hashgrid, HashgridAPIError, Message
+from hashgrid.codec import get_codec
+
+
+@pytest.fixture(params=["json", "orjson", "msgspec"])
+def codec(request):
+    try:
+        return get_codec(request.param)
+    except ImportError:
+        pytest.skip(f"{request.param} is not installed")
+
+
+def test_round_trip(codec):
+    data = {"a": [1, 2.5, None, "x"], "b": {"c": True}}
+    assert codec.loads(codec.dumps(data)) == data
+    with pytest.raises(ValueError):
+        codec.loads(b"{")
+
+
+def test_unknown_fields_are_ignored(codec):
+    data = b'[{"peer_id": "p", "round": 2, "message": "hi", "extra": {"x": 1}}]'
+    assert codec.loads_list(data, Message) == [
+        Message(peer_id="p", round=2, message="hi")
+    ]
+    keyed = b'{"n": [{"peer_id": "p", "round": 2, "message": "hi", "extra": 1}]}'
+    assert codec.loads_lists(keyed, Message) == {
+        "n": [Message(peer_id="p", round=2, message="hi")]
+    }
+
+
+@pytest.mark.parametrize(
+    "data", [b'{"peer_id": "p"}', b"[1]", b'[{"peer_id": "p"}]', b"not json"]
+)
+def test_invalid_lists_are_rejected(codec, data):
+    with pytest.raises((ValueError, TypeError)):
+        codec.loads_list(data, Message)
+
+
+def test_client_reports_invalid_lists(codec):
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, json={"message": "not a list"})
+    )
+
+    async def main():
+        async with Hashgrid(base_url="http://fake", transport=transport) as hg:
+            hg.codec = codec
+            await hg._request("GET", "/api/v1/node/n/recv", model=Message)
+
+    with pytest.raises(HashgridAPIError, match="Invalid Message list"):
+        asyncio.run(main())
+
+
+def test_recv_all_ignores_unknown_fields(fake, connect):
+    fake.advance()
+    inner = fake.transport()
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        response = await inner.handle_async_request(request)
+        await response.aread()
+        if request.url.path != "/api/v1/node/recv":
+            return response
+        data = response.json()
+        for messages in data.values():
+            for message in messages:
+                message["added_later"] = True
+        return httpx.Response(200, json=data)
+
+    async def main():
+        grid = await connect(fake, transport=httpx.MockTransport(handle))
+        return await grid.recv_all(list(fake.nodes))
+
+    inbox = asyncio.run(main())
+    assert sum(len(messages) for messages in inbox.values()) == 9
+    assert all(isinstance(m, Message) for ms in inbox.values() for m in ms)
@@ -0,0 +1,131 @@
+import asyncio
+import time
+
+from hashgrid import Message
+from hashgrid.resources import TickClock
+from hashgrid.testing import echo_handler
+
+
+def busy(node, messages):
+    return [Message(peer_id=m.peer_id, round=m.round, message="busy") for m in messages]
+
+
+def learn_cadence(grid, interval: float = 10.0) -> None:
+    """Pretend the two ticks before the current one were seen ``interval`` apart.
+
+    ``process_tick`` then observes the current tick itself, now.
+    """
+    now = time.monotonic()
+    grid.clock.observe(grid.tick - 2, at=now - 2 * interval)
+    grid.clock.observe(grid.tick - 1, at=now - interval)
+
+
+def test_tick_clock_estimates_cadence():
+    clock = TickClock()
+    assert clock.interval is None
+    clock.observe(1, at=100.0)
+    clock.observe(2, at=110.0)
+    clock.observe(4, at=130.0)
+    clock.observe(4, at=135.0)  # repeated ticks are ignored
+    assert clock.interval == 10.0
+    assert clock.tick_start(5) == 140.0
+    assert clock.next_tick_at == 140.0
+
+
+def test_no_deadline_until_cadence_is_known(fake, connect):
+    fake.advance()
+
+    async def main():
+        grid = await connect(fake)
+        return await grid.process_tick(echo_handler, deadline_margin=1.0)
+
+    results = asyncio.run(main())
+    assert all(r.deadline is None and not r.deadline_missed for r in results)
+    assert sum(len(r.statuses) for r in results) == 9
+
+
+def test_cadence_is_learned_without_listen(fake, connect):
+    fake.tick_interval = 0.05
+
+    async def main():
+        grid = await connect(fake)
+        for _ in range(3):
+            await asyncio.sleep(0.06)
+            results = await grid.process_tick(echo_handler, deadline_margin=0.0)
+        return grid, results
+
+    grid, results = asyncio.run(main())
+    assert grid.tick == fake.tick
+    assert grid.clock.interval is not None
+    assert all(r.deadline is not None for r in results)
+
+
+def test_deadline_comes_from_the_round(fake, connect):
+    fake.advance()
+    fake.advance()
+
+    async def main():
+        grid = await connect(fake)
+        learn_cadence(grid)
+        results = await grid.process_tick(echo_handler, deadline_margin=2.0)
+        return grid, results
+
+    grid, results = asyncio.run(main())
+    for result in results:
+        assert result.deadline == grid.round_deadline(2, 2.0)
+        assert result.deadline == grid.clock.tick_start(3) - 2.0
+
+
+def test_late_handler_is_cancelled_and_replaced(fake, connect):
+    fake.advance()
+    fake.advance()
+    slow = next(iter(fake.nodes.values()))["name"]
+    finished = []
+
+    async def handler(node, messages):
+        if node.name == slow:
+            await asyncio.sleep(5)
+            finished.append(node.name)
+        return echo_handler(node, messages)
+
+    async def main():
+        grid = await connect(fake)
+        learn_cadence(grid)
+        # The round closes about 10s from now; leave 0.2s for handlers.
+        return await grid.process_tick(handler, deadline_margin=9.8, fallback=busy)
+
+    results = asyncio.run(main())
+    late = [r for r in results if r.deadline_missed]
+    assert [r.node.name for r in late] == [slow]
+    assert not finished
+    assert {m.message for m in late[0].replies} == {"busy"}
+    assert all(s.success for r in results for s in r.statuses)
+
+
+def test_batch_runs_earliest_deadline_first(fake, connect):
+    fake.advance()
+    fake.advance()
+    first, second, third = fake.nodes
+    # Messages still pending from the previous round are due first.
+    pending = fake.pending[third]
+    fake.pending[third] = {(peer, r - 1): msg for (peer, r), msg in pending.items()}
+    order = []
+
+    def handler(node, messages):
+        order.append(node.node_id)
+        return []
+
+    def fallback(node, messages):
+        order.append(node.node_id)
+        return []
+
+    async def main():
+        grid = await connect(fake)
+        learn_cadence(grid)
+        return await grid.process_tick(
+            handler, concurrency=1, batch=True, deadline_margin=1.0, fallback=fallback
+        )
+
+    results = asyncio.run(main())
+    assert order == [third, first, second]
+    assert [r.deadline_missed for r in results] == [False, False, True]
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from hashgrid import EdgeStore, Message
+from hashgrid.testing import FakeGrid
+
+pytest.importorskip("numpy")
+
+
+def scored(node, messages):
+    return [
+        Message(peer_id=m.peer_id, round=m.round, message="ok", score=float(m.round))
+        for m in messages
+    ]
+
+
+@pytest.fixture
+def fake() -> FakeGrid:
+    fake = FakeGrid(seed=0, peers_per_node=3, record_edges=True)
+    fake.add_nodes(3)
+    return fake
+
+
+def play(fake: FakeGrid, grid, rounds: int) -> None:
+    async def main():
+        for _ in range(rounds):
+            fake.advance()
+            await grid.process_tick(scored)
+
+    asyncio.run(main())
+
+
+def test_sync_is_incremental(fake, connect):
+    grid = asyncio.run(connect(fake))
+    store = EdgeStore(capacity=4)
+    play(fake, grid, 2)
+    assert asyncio.run(store.sync(grid)) == 18
+    assert asyncio.run(store.sync(grid)) == 0
+    play(fake, grid, 1)
+    assert asyncio.run(store.sync(grid)) == 9
+    assert len(store) == 27
+    assert store.last_rounds == dict.fromkeys(fake.nodes, 3)
+
+
+def test_sync_picks_up_late_edges_and_scores(fake, connect):
+    grid = asyncio.run(connect(fake))
+    store = EdgeStore()
+    play(fake, grid, 3)
+    asyncio.run(store.sync(grid))
+    node_id = next(iter(fake.nodes))
+    edges = fake.edges[node_id]
+    # A score filled in after the first sync, an edge of an already synced
+    # round that arrived late, and one older than the overlap.
+    edges[-1]["score"] = 10.0
+    edges.append(dict(edges[-1], peer_id="late", round=2, score=5.0))
+    edges.append(dict(edges[-1], peer_id="ancient", round=0, score=5.0))
+
+    assert asyncio.run(store.sync(grid, overlap=2)) == 1
+    assert len(store) == 28
+    means = store.mean_scores(node_id)
+    assert means["late"] == 5.0
+    assert "ancient" not in means
+    assert means[edges[-3]["peer_id"]] == pytest.approx((1 + 2 + 10) / 3)
+
+
+def test_store_is_reopened_from_disk(fake, connect, tmp_path):
+    grid = asyncio.run(connect(fake))
+    play(fake, grid, 2)
+    with EdgeStore(str(tmp_path), capacity=4) as store:
+        asyncio.run(store.sync(grid))
+        top = store.top_peers(k=2)
+
+    reopened = EdgeStore(str(tmp_path))
+    assert len(reopened) == 18
+    assert reopened.top_peers(k=2) == top
+    play(fake, grid, 1)
+    assert asyncio.run(reopened.sync(grid)) == 9
+    assert reopened.last_rounds == dict.fromkeys(fake.nodes, 3)
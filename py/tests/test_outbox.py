@@ -0,0 +1,127 @@
+import asyncio
+
+import httpx
+import pytest
+
+from hashgrid import HashgridAPIError, Message, Outbox
+from hashgrid.testing import FakeGrid, echo_handler
+
+
+class FlakySends:
+    """Transport to ``fake`` answering sends with 503 while ``failing`` is set."""
+
+    def __init__(self, fake: FakeGrid):
+        self.fake = fake
+        self.failing = True
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        if self.failing and request.url.path.endswith("/send"):
+            return httpx.Response(503, json={"message": "Unavailable"})
+        return await self.fake.handle(request)
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+
+def sends(fake: FakeGrid) -> int:
+    return sum(n for key, n in fake.requests.items() if key.endswith("/send"))
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    with Outbox(str(tmp_path / "outbox.db"), max_attempts=2) as outbox:
+        yield outbox
+
+
+def test_acked_replies_are_not_resent(fake, connect, outbox):
+    fake.advance()
+
+    async def main():
+        grid = await connect(fake)
+        node = await grid.get_node(next(iter(fake.nodes)))
+        replies = echo_handler(node, await node.recv())
+        first = await outbox.send(node, replies)
+        sent = sends(fake)
+        second = await outbox.send(node, replies)
+        return first, second, sent
+
+    first, second, sent = asyncio.run(main())
+    assert len(first) == 3 and all(s.success for s in first)
+    assert second == []
+    assert sends(fake) == sent
+    assert outbox.counts() == {"acked": 3}
+
+
+def test_failed_replies_are_replayed(fake, connect, outbox):
+    fake.advance()
+    flaky = FlakySends(fake)
+
+    async def main():
+        grid = await connect(fake, transport=flaky.transport())
+        results = await grid.process_tick(echo_handler, outbox=outbox)
+        assert all(r.error is not None for r in results)
+        assert outbox.counts() == {"pending": 9}
+
+        flaky.failing = False
+        return await outbox.replay(grid)
+
+    statuses = asyncio.run(main())
+    assert sum(s.success for ss in statuses.values() for s in ss) == 9
+    assert outbox.counts() == {"acked": 9}
+    assert fake.successful_replies == 9
+
+
+def test_redelivered_messages_get_the_recorded_reply(connect, outbox):
+    fake = FakeGrid(seed=0, peers_per_node=3, record_edges=True)
+    fake.add_nodes(3)
+    fake.advance()
+    flaky = FlakySends(fake)
+    answer = "first"
+
+    def handler(node, messages):
+        return [
+            Message(peer_id=m.peer_id, round=m.round, message=answer)
+            for m in messages
+        ]
+
+    async def main():
+        nonlocal answer
+        grid = await connect(fake, transport=flaky.transport())
+        await grid.process_tick(handler, batch=True, outbox=outbox)
+        flaky.failing = False
+        answer = "second"
+        # The server delivers the unanswered messages again.
+        return await grid.process_tick(handler, batch=True, outbox=outbox)
+
+    results = asyncio.run(main())
+    assert {m.message for r in results for m in r.replies} == {"second"}
+    sent = [edge["send_message"] for edges in fake.edges.values() for edge in edges]
+    assert sent == ["first"] * 9
+    assert outbox.counts() == {"acked": 9}
+
+
+def test_gives_up_after_max_attempts(fake, connect, outbox):
+    fake.advance()
+    flaky = FlakySends(fake)
+
+    async def main():
+        grid = await connect(fake, transport=flaky.transport())
+        await grid.process_tick(echo_handler, outbox=outbox)
+        with pytest.raises(HashgridAPIError):
+            await outbox.replay(grid)
+        return await outbox.replay(grid)
+
+    assert asyncio.run(main()) == {}
+    assert outbox.counts() == {"failed": 9}
+
+
+def test_record_keeps_the_first_reply(outbox):
+    first = Message(peer_id="p", round=1, message="first")
+    second = Message(peer_id="p", round=1, message="second")
+    assert outbox.record("n", [first]) == [first]
+    assert outbox.record("n", [second]) == [first]
+    outbox.acknowledge("n", [first], [])
+    assert outbox.pending() == {"n": [first]}
+    outbox.acknowledge("n", [first], [])
+    assert outbox.pending() == {}
+    assert outbox.counts() == {"failed": 1}
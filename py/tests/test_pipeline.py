@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from hashgrid.testing import echo_handler
+
+
+def test_pipeline_processes_every_node(fake, connect):
+    fake.advance()
+
+    async def main():
+        grid = await connect(fake)
+        async with grid.pipeline(echo_handler, send_batch_size=2) as pipeline:
+            first = await pipeline.run_tick()
+            fake.advance()
+            second = await pipeline.run_tick()
+        return first, second
+
+    first, second = asyncio.run(main())
+    for results in (first, second):
+        assert len(results) == 3
+        assert all(r.error is None and len(r.statuses) == 3 for r in results)
+    assert fake.successful_replies == 18
+
+
+def test_stop_cancels_unfinished_ticks(fake, connect):
+    fake.advance()
+    started = []
+
+    async def handler(node, messages):
+        started.append(node.node_id)
+        await asyncio.sleep(10)
+        return echo_handler(node, messages)
+
+    async def main():
+        grid = await connect(fake)
+        pipeline = grid.pipeline(handler)
+        pipeline.start()
+        future = await pipeline.submit_tick()
+        while len(started) < 3:
+            await asyncio.sleep(0.01)
+        await pipeline.stop()
+        assert not pipeline.running
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(future, 1.0)
+
+    asyncio.run(main())
+    assert fake.replies == 0
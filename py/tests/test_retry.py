@@ -0,0 +1,152 @@
+import asyncio
+
+import httpx
+import pytest
+
+from hashgrid import (
+    CircuitBreaker,
+    Hashgrid,
+    HashgridAPIError,
+    HashgridCircuitOpenError,
+    RetryPolicy,
+)
+from hashgrid.retry import parse_retry_after
+
+GRID = {"name": "fake", "tick": 1}
+
+
+def scripted(*responses):
+    """Transport answering with ``responses`` in order, then the last one."""
+    calls = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        status, body = responses[min(len(calls), len(responses)) - 1]
+        return httpx.Response(status, json=body)
+
+    return httpx.MockTransport(handle), calls
+
+
+def client(transport, **kwargs) -> Hashgrid:
+    kwargs.setdefault("retry_policy", RetryPolicy(backoff_factor=0.0))
+    return Hashgrid(base_url="http://fake", transport=transport, **kwargs)
+
+
+def test_get_is_retried_on_503():
+    transport, calls = scripted((503, {}), (503, {}), (200, GRID))
+
+    async def main():
+        async with client(transport) as hg:
+            return hg, await hg._request("GET", "/api/v1")
+
+    hg, data = asyncio.run(main())
+    assert data == GRID
+    assert len(calls) == 3
+    assert hg.stats.retries == 2
+
+
+def test_send_is_not_retried_on_503():
+    transport, calls = scripted((503, {}), (200, []))
+
+    async def main():
+        async with client(transport) as hg:
+            await hg._request("POST", "/api/v1/node/n/send", json_data=[])
+
+    with pytest.raises(HashgridAPIError):
+        asyncio.run(main())
+    assert len(calls) == 1
+
+
+def test_send_is_retried_on_429():
+    transport, calls = scripted((429, {}), (200, []))
+
+    async def main():
+        async with client(transport) as hg:
+            return await hg._request("POST", "/api/v1/node/n/send", json_data=[])
+
+    assert asyncio.run(main()) == []
+    assert len(calls) == 2
+
+
+def test_gives_up_after_max_retries():
+    transport, calls = scripted((503, {}))
+    policy = RetryPolicy(max_retries=2, backoff_factor=0.0)
+
+    async def main():
+        async with client(transport, retry_policy=policy) as hg:
+            await hg._request("GET", "/api/v1")
+
+    with pytest.raises(HashgridAPIError):
+        asyncio.run(main())
+    assert len(calls) == 3
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_breaker_opens_and_rejects_requests():
+    transport, calls = scripted((503, {}))
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60.0)
+    policy = RetryPolicy(max_retries=0)
+
+    async def main():
+        hg = client(transport, retry_policy=policy, circuit_breaker=breaker)
+        async with hg:
+            for _ in range(2):
+                with pytest.raises(HashgridAPIError):
+                    await hg._request("GET", "/api/v1")
+            with pytest.raises(HashgridCircuitOpenError):
+                await hg._request("GET", "/api/v1")
+            return hg
+
+    hg = asyncio.run(main())
+    assert breaker.state == CircuitBreaker.OPEN
+    assert len(calls) == 2
+    assert hg.stats.rejected == 1
+
+
+def test_breaker_half_open_trial_closes_circuit():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # one trial at a time
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_failed_trial_reopens_circuit():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60.0)
+    breaker.record_failure()
+    breaker._opened_at -= 60.0
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opened_count == 2
+
+
+def test_cancelled_trial_releases_breaker():
+    async def handle(request: httpx.Request) -> httpx.Response:
+        if request.url.params.get("hang"):
+            await asyncio.sleep(10)
+        return httpx.Response(200, json=GRID)
+
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.0)
+    breaker.record_failure()
+
+    async def main():
+        hg = client(httpx.MockTransport(handle), circuit_breaker=breaker)
+        async with hg:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    hg._request("GET", "/api/v1", params={"hang": 1}), 0.05
+                )
+            return await hg._request("GET", "/api/v1")
+
+    assert asyncio.run(main()) == GRID
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+import pytest
+
+from hashgrid import HashRing, ShardCoordinator, StaticShard
+from hashgrid.testing import echo_handler
+
+KEYS = [f"node-{i}" for i in range(200)]
+
+
+def coordinator(directory, worker_id: str) -> ShardCoordinator:
+    return ShardCoordinator(
+        str(directory), worker_id, heartbeat_interval=0.01, ttl=5.0, join_delay=0.05
+    )
+
+
+def owners(shards, keys=KEYS):
+    return {key: [s.worker_id for s in shards if s.owns(key)] for key in keys}
+
+
+def test_hash_ring_moves_few_keys():
+    ring = HashRing(["a", "b", "c"])
+    before = {key: ring.owner(key) for key in KEYS}
+    ring.add("d")
+    moved = [key for key in KEYS if ring.owner(key) != before[key]]
+    assert all(ring.owner(key) == "d" for key in moved)
+    assert 0 < len(moved) < len(KEYS) / 2
+    assert HashRing().owner("x") is None
+
+
+def test_static_shards_partition_nodes():
+    workers = ["a", "b", "c"]
+    shards = [StaticShard(w, workers) for w in workers]
+    assert all(len(ws) == 1 for ws in owners(shards).values())
+    with pytest.raises(ValueError):
+        StaticShard("d", workers)
+
+
+def test_coordinators_partition_nodes(tmp_path):
+    shards = [coordinator(tmp_path, w) for w in ("a", "b", "c")]
+    for shard in shards:
+        shard.join()
+    time.sleep(0.06)
+    for shard in shards:
+        shard.refresh()
+    assert all(shard.members == ["a", "b", "c"] for shard in shards)
+    assert all(len(ws) == 1 for ws in owners(shards).values())
+
+
+def test_joiner_waits_for_activation(tmp_path):
+    first = coordinator(tmp_path, "a")
+    first.join()
+    time.sleep(0.06)
+    assert all(first.owns(key) for key in KEYS)
+
+    second = coordinator(tmp_path, "b")
+    second.join()
+    first.refresh()
+    # Neither switches before the joiner's activation time, so no node is
+    # owned twice in the meantime.
+    assert first.members == ["a"] and second.members == ["a"]
+    assert not any(second.owns(key) for key in KEYS)
+
+    time.sleep(0.06)
+    assert first.members == second.members == ["a", "b"]
+    assert all(len(ws) == 1 for ws in owners([first, second]).values())
+
+
+def test_leaver_hands_over_its_nodes(tmp_path):
+    first, second = coordinator(tmp_path, "a"), coordinator(tmp_path, "b")
+    first.join()
+    second.join()
+    time.sleep(0.06)
+    first.refresh()
+    assert first.members == ["a", "b"]
+
+    second.leave()
+    assert not any(second.owns(key) for key in KEYS)
+    first.refresh()
+    assert first.members == ["a"]
+    assert all(first.owns(key) for key in KEYS)
+
+
+def test_malformed_heartbeat_files_are_skipped(tmp_path):
+    (tmp_path / "partial.worker").write_text('{"worker_')
+    (tmp_path / "old.worker").write_text('{"id": "old"}')
+    (tmp_path / "list.worker").write_text("[]")
+    shard = coordinator(tmp_path, "a")
+    shard.join()
+    time.sleep(0.06)
+    shard.refresh()
+    assert shard.members == ["a"]
+
+
+def test_process_tick_only_handles_owned_nodes(fake, connect, tmp_path):
+    fake.advance()
+
+    async def main():
+        grid = await connect(fake)
+        shards = [coordinator(tmp_path, w) for w in ("a", "b")]
+        for shard in shards:
+            shard.start()
+        await asyncio.sleep(0.1)
+        try:
+            return [await grid.process_tick(echo_handler, shard=s) for s in shards]
+        finally:
+            for shard in shards:
+                await shard.stop()
+
+    handled = [{r.node.node_id for r in results} for results in asyncio.run(main())]
+    assert not handled[0] & handled[1]
+    assert handled[0] | handled[1] == set(fake.nodes)
+    assert fake.successful_replies == 9
@@ -0,0 +1,60 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from hashgrid import Tracer
+from hashgrid.testing import echo_handler
+
+
+def test_process_tick_writes_a_trace(fake, connect, tmp_path):
+    fake.advance()
+    tracer = Tracer(str(tmp_path))
+
+    async def main():
+        grid = await connect(fake, tracer=tracer)
+        await grid.process_tick(echo_handler)
+
+    asyncio.run(main())
+    assert tracer.traced == 1 and len(tracer.files) == 1
+    with open(tracer.files[0]) as f:
+        events = json.load(f)["traceEvents"]
+    names = {e["name"] for e in events if e["ph"] == "X"}
+    assert {"tick", "node", "recv", "handler", "send", "GET /recv"} <= names
+
+
+def test_rotation_keeps_the_newest_files(tmp_path):
+    tracer = Tracer(str(tmp_path), keep=2)
+    for tick in range(4):
+        with tracer.tick(tick):
+            pass
+    assert len(tracer.files) == 2
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        os.path.basename(path) for path in tracer.files
+    )
+    assert os.path.basename(tracer.files[-1]).startswith("tick-3-")
+
+
+def test_window_groups_ticks(tmp_path):
+    tracer = Tracer(str(tmp_path), window=60.0)
+    for tick in (1, 2):
+        with tracer.tick(tick):
+            pass
+    assert not tracer.files
+    path = tracer.flush()
+    assert os.path.basename(path).startswith("ticks-1-2-")
+    assert tracer.flush() is None
+
+
+def test_sampling_and_min_duration(tmp_path):
+    with pytest.raises(ValueError):
+        Tracer(str(tmp_path), sample_rate=2.0)
+    tracer = Tracer(str(tmp_path), sample_rate=0.0)
+    with tracer.tick(1) as root:
+        root.set(ignored=True)
+    tracer = Tracer(str(tmp_path), min_duration=60.0)
+    with tracer.tick(1):
+        pass
+    assert tracer.ticks == 1 and tracer.traced == 0
+    assert not os.listdir(tmp_path)